@@ -0,0 +1,165 @@
+import threading
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+WEEKDAY_LABELS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+UNTAGGED = "미분류"
+
+
+def _to_day(values):
+    # 'YYYY-MM-DD' / ISO datetime 문자열 -> 자정 기준 datetime64 배열
+    return pd.to_datetime(pd.Series(values), errors="coerce").dt.normalize().to_numpy()
+
+
+def _accumulate(total, new):
+    if total is None or total.empty:
+        return new
+    return total.add(new, fill_value=0).astype("int64")
+
+
+def daily_counts_from_entries(entries):
+    """/dashboard 의 heatmap [{date, count}] -> 날짜별 학습 수 Series"""
+    if not entries:
+        return pd.Series(dtype="int64")
+    frame = pd.DataFrame(entries)
+    days = _to_day(frame["date"])
+    counts = pd.to_numeric(frame["count"], errors="coerce").fillna(0).astype("int64")
+    return pd.Series(counts.to_numpy(), index=pd.DatetimeIndex(days)).groupby(level=0).sum()
+
+
+def calendar_heatmap(daily, days=14, end=None):
+    """최근 days 일을 실제 요일에 맞춘 주 x 요일 행렬로 변환
+
+    창 밖의 칸은 None. 반환값은 chart_cache.render_heatmap 입력 형식.
+    """
+    end = pd.Timestamp(end or date.today()).normalize()
+    start = end - pd.Timedelta(days=days - 1)
+    first_monday = start - pd.Timedelta(days=start.weekday())
+    n_weeks = (end - first_monday).days // 7 + 1
+
+    window = pd.date_range(start, end, freq="D")
+    values = daily.reindex(window, fill_value=0).to_numpy() if len(daily) else np.zeros(len(window))
+    cells = np.full(n_weeks * 7, np.nan)
+    offset = (start - first_monday).days
+    cells[offset:offset + len(window)] = values
+    matrix = cells.reshape(n_weeks, 7)
+
+    ylabels = [(first_monday + pd.Timedelta(weeks=w)).strftime('%m/%d~') for w in range(n_weeks)]
+    return {
+        'matrix': [[None if np.isnan(v) else int(v) for v in row] for row in matrix],
+        'xlabels': WEEKDAY_LABELS,
+        'ylabels': ylabels,
+    }
+
+
+class ReviewAnalytics:
+    """복습 기록(/history)에서 대시보드 지표를 계산
+
+    집계 테이블(날짜별, 유형x날짜별, 복습 간격별)만 보관하고,
+    같은 기록에 새 제출이 덧붙은 경우 추가된 부분만 집계에 더한다.
+    모든 세션이 공유하므로 update 는 lock 안에서 한다 (조회는 교체된 집계 객체를 그대로 읽음).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.source = None
+        self.count = 0              # 집계에 반영된 복습 기록 수
+        self._head = None           # 기록이 이어지는지 확인용 (첫 기록)
+        self.skills = {}            # question_id -> 유형
+        self.daily = pd.Series(dtype="int64")   # 날짜 -> 복습 수
+        self.skill_daily = None     # (유형, 날짜) -> total, correct
+        self.retention = None       # 직전 복습과의 간격(일) -> total, correct
+        self.last_seen = {}         # question_id -> 마지막 복습일
+
+    def update(self, history):
+        """/history 응답을 반영. 새로 반영한 기록 수를 반환"""
+        if history is None or history is self.source:
+            return 0
+        with self.lock:
+            # 기다리는 동안 다른 세션이 같은 응답을 이미 반영했을 수 있음
+            if history is self.source:
+                return 0
+            reviews = history.get('reviews', [])
+            head = reviews[0] if reviews else None
+            if len(reviews) < self.count or head != self._head:
+                # 기록이 줄었거나 앞부분이 달라졌으면 처음부터 다시 집계
+                self._reset()
+            for q in history.get('questions', []):
+                if q.get('skill'):
+                    self.skills[q['question_id']] = q['skill']
+            new = reviews[self.count:]
+            if new:
+                self._fold(pd.DataFrame(new))
+            self.count = len(reviews)
+            self._head = head
+            self.source = history
+            return len(new)
+
+    def _fold(self, frame):
+        frame = frame.assign(day=_to_day(frame['reviewed_at']),
+                             correct=frame['correct'].astype(bool))
+        frame = frame[~pd.isna(frame['day'])].sort_values('day', kind='stable')
+        frame['skill'] = frame['question_id'].map(self.skills).fillna(UNTAGGED)
+
+        daily = frame.groupby('day').size()
+        self.daily = _accumulate(self.daily, daily)
+
+        skill_daily = frame.groupby(['skill', 'day'])['correct'].agg(total='size', correct='sum')
+        self.skill_daily = _accumulate(self.skill_daily, skill_daily)
+
+        # 같은 문항의 직전 복습과의 간격 (이전 배치의 마지막 복습일 포함)
+        previous = frame.groupby('question_id')['day'].shift()
+        carried = pd.to_datetime(frame['question_id'].map(self.last_seen))
+        gap = (frame['day'] - previous.fillna(carried)).dt.days
+        has_gap = gap.notna()
+        retention = (frame.loc[has_gap, 'correct']
+                     .groupby(gap[has_gap].astype("int64"))
+                     .agg(total='size', correct='sum'))
+        self.retention = _accumulate(self.retention, retention)
+
+        self.last_seen.update(frame.groupby('question_id')['day'].max().to_dict())
+
+    def heatmap(self, days=14, end=None):
+        return calendar_heatmap(self.daily, days, end)
+
+    def weak_skills(self, top=3, days=None, end=None):
+        """오답이 많은 유형 [{skill, wrong_count, accuracy}] (days 를 주면 최근 기간만)"""
+        table = self.skill_daily
+        if table is None or table.empty:
+            return []
+        if days:
+            end = pd.Timestamp(end or date.today()).normalize()
+            day_index = table.index.get_level_values('day')
+            table = table[day_index > end - pd.Timedelta(days=days)]
+        per_skill = table.groupby(level='skill').sum()
+        per_skill = per_skill.assign(wrong=per_skill['total'] - per_skill['correct'])
+        per_skill = per_skill[per_skill['wrong'] > 0].sort_values('wrong', ascending=False).head(top)
+        return [{'skill': skill, 'wrong_count': int(row.wrong),
+                 'accuracy': float(row.correct / row.total)}
+                for skill, row in per_skill.iterrows()]
+
+    def skill_trend(self, freq="W-SUN", min_reviews=1):
+        """기간(기본: 주) x 유형 정답률 DataFrame"""
+        table = self.skill_daily
+        if table is None or table.empty:
+            return pd.DataFrame()
+        frame = table.reset_index()
+        frame['period'] = pd.to_datetime(frame['day']).dt.to_period(freq).dt.start_time
+        grouped = frame.groupby(['period', 'skill'])[['total', 'correct']].sum()
+        grouped = grouped[grouped['total'] >= min_reviews]
+        return (grouped['correct'] / grouped['total']).unstack('skill').sort_index()
+
+    def retention_curve(self, max_gap=60):
+        """직전 복습 후 경과 일수별 정답률 (기억 유지 곡선)"""
+        table = self.retention
+        if table is None or table.empty:
+            return pd.DataFrame(columns=["accuracy", "reviews"])
+        table = table[table.index <= max_gap].sort_index()
+        return pd.DataFrame({"accuracy": table['correct'] / table['total'],
+                             "reviews": table['total']})
+
@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import OrderedDict
+
+from api_client import endpoint_path
+
+# 엔드포인트별 캐시 유효 시간(초). 목록에 없는 엔드포인트는 캐시하지 않음
+DEFAULT_TTLS = {
+    "/skill-tags": 600,
+    "/dashboard": 60,
+    "/wrongnotes": 120,
+    "/due": 300,
+    "/history": 300,
+}
+
+# 쓰기 엔드포인트 -> 무효화할 읽기 엔드포인트
+INVALIDATIONS = {
+    "/skill-tags": ("/skill-tags",),
+    "/skill-tags/batch": ("/skill-tags", "/wrongnotes", "/dashboard"),
+    "/submit": ("/dashboard", "/wrongnotes", "/due", "/history"),
+    "/wrongnote": ("/dashboard", "/wrongnotes"),
+    "/wrongnote/batch": ("/dashboard", "/wrongnotes"),
+    "/wrongnote/delete": ("/dashboard", "/wrongnotes"),
+    "/settings": ("/dashboard", "/due", "/history"),
+}
+
+
+class ResponseCache:
+    """GET 응답용 read-through TTL 캐시 (LRU 로 크기 제한, 쓰기 시 무효화)"""
+
+    def __init__(self, ttls=None, invalidations=None, max_entries=256, clock=time.monotonic):
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.invalidations = dict(INVALIDATIONS, **(invalidations or {}))
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # endpoint -> (expires_at, data)
+        self._lock = threading.Lock()
+
+    def ttl_for(self, endpoint):
+        return self.ttls.get(endpoint_path(endpoint))
+
+    def get(self, endpoint):
+        with self._lock:
+            entry = self._entries.get(endpoint)
+            if entry is None:
+                return None
+            expires_at, data = entry
+            if expires_at <= self.clock():
+                del self._entries[endpoint]
+                return None
+            self._entries.move_to_end(endpoint)
+            return entry
+
+    def put(self, endpoint, data):
+        ttl = self.ttl_for(endpoint)
+        if not ttl:
+            return
+        with self._lock:
+            self._entries[endpoint] = (self.clock() + ttl, data)
+            self._entries.move_to_end(endpoint)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_fetch(self, endpoint, fetch):
+        # fetch() 는 ApiResult 를 반환. 실패한 응답은 캐시하지 않음
+        entry = self.get(endpoint)
+        if entry is not None:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        result = fetch()
+        if not result.ok:
+            return None
+        self.put(endpoint, result.data)
+        return result.data
+
+    def invalidate(self, *paths):
+        paths = set(paths)
+        with self._lock:
+            for key in [k for k in self._entries if endpoint_path(k) in paths]:
+                del self._entries[key]
+
+    def paths_for_write(self, endpoint):
+        return self.invalidations.get(endpoint_path(endpoint), ())
+
+    def invalidate_for_write(self, endpoint):
+        self.invalidate(*self.paths_for_write(endpoint))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
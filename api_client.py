@@ -0,0 +1,190 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# 엔드포인트별 (connect, read) 타임아웃 - Apps Script 는 콜드 스타트가 느리므로 read 를 넉넉히
+DEFAULT_TIMEOUT = (5, 20)
+ENDPOINT_TIMEOUTS = {
+    "/dashboard": (5, 20),
+    "/due": (5, 30),
+    "/history": (5, 30),
+    "/wrongnotes": (5, 30),
+    "/skill-tags": (5, 10),
+    "/skill-tags/batch": (5, 60),
+    "/submit": (5, 30),
+    "/wrongnote": (5, 20),
+    "/wrongnote/batch": (5, 60),
+    "/wrongnote/delete": (5, 20),
+    "/settings": (5, 10),
+}
+
+# 오류 종류
+ERROR_TIMEOUT = "timeout"
+ERROR_CONNECTION = "connection"
+ERROR_HTTP = "http"
+ERROR_DECODE = "decode"
+ERROR_ENCODE = "encode"
+
+
+@dataclass
+class ApiResult:
+    data: Any = None
+    error: Optional[str] = None
+    status: Optional[int] = None
+    message: str = ""
+    elapsed: float = 0.0
+    size: int = 0
+    etag: Optional[str] = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def endpoint_path(endpoint):
+    # "/due?date=..." -> "/due"
+    return endpoint.split("?", 1)[0]
+
+
+# Apps Script 는 처리하지 못한 요청도 200 + {"success": false, "error": "..."} 로 응답한다
+UNSUPPORTED_MARKERS = ("unknown", "unsupported", "not found", "invalid action", "알 수 없는")
+
+
+def backend_error(result):
+    """200 응답 본문에 담긴 실패 메시지 (성공이면 None)"""
+    data = result.data
+    if result.ok and isinstance(data, dict) and (data.get("success") is False or data.get("error")):
+        return str(data.get("error") or "success=false")
+    return None
+
+
+def confirmed(result):
+    """백엔드가 반영을 확인한 응답 (200 + success: true)"""
+    return result.ok and isinstance(result.data, dict) and result.data.get("success") is True
+
+
+def unsupported(result):
+    """백엔드가 이 endpoint/action 을 지원하지 않음 (404, 또는 200 + 알 수 없는 action 오류)"""
+    if result.status == 404:
+        return True
+    error = backend_error(result)
+    return error is not None and any(marker in error.lower() for marker in UNSUPPORTED_MARKERS)
+
+
+class ApiClient:
+    """Apps Script 백엔드용 HTTP 클라이언트 (프로세스당 하나의 keep-alive 커넥션 풀)"""
+
+    def __init__(self, base_url, pool_size=10, max_retries=3, backoff_factor=0.5,
+                 timeouts=None, observers=(), max_etags=64):
+        self.base_url = base_url.rstrip("/")
+        self.timeouts = dict(ENDPOINT_TIMEOUTS, **(timeouts or {}))
+        # observer(method, endpoint, ApiResult) - 요청이 끝날 때마다 호출 (계측용)
+        self.observers = list(observers)
+        # ETag 를 준 GET 응답 (endpoint -> (etag, data)). 다음 GET 은 If-None-Match 로 보내고
+        # 304 면 본문 없이 이 data 를 그대로 돌려준다 (같은 객체이므로 색인도 다시 만들지 않음)
+        self.max_etags = max_etags
+        self._etags = OrderedDict()
+        self._etag_lock = threading.Lock()
+
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json"})
+
+        # GET 만 재시도 (POST 는 멱등이 아니므로 재시도하지 않음)
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                              max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def timeout_for(self, endpoint):
+        return self.timeouts.get(endpoint_path(endpoint), DEFAULT_TIMEOUT)
+
+    def request(self, method, endpoint, data=None, headers=None):
+        result = self._request(method, endpoint, data, headers)
+        for observer in self.observers:
+            observer(method, endpoint, result)
+        return result
+
+    def _request(self, method, endpoint, data=None, headers=None):
+        url = f"{self.base_url}{endpoint}"
+        start = time.perf_counter()
+        body = None
+        if data is not None:
+            # 직렬화할 수 없는 값(객체, NaN 등)은 보내지 않고 실패로 돌려줌
+            try:
+                body = json.dumps(data, allow_nan=False).encode("utf-8")
+            except (TypeError, ValueError) as e:
+                return self._failure(method, endpoint, ERROR_ENCODE, str(e), start)
+            headers = dict(headers or {}, **{"Content-Type": "application/json"})
+        try:
+            response = self.session.request(method, url, data=body, headers=headers,
+                                            timeout=self.timeout_for(endpoint))
+        except requests.Timeout as e:
+            return self._failure(method, endpoint, ERROR_TIMEOUT, str(e), start)
+        except requests.RequestException as e:
+            return self._failure(method, endpoint, ERROR_CONNECTION, str(e), start)
+
+        if response.status_code == 304:
+            return ApiResult(status=304, elapsed=time.perf_counter() - start,
+                             etag=response.headers.get("ETag"))
+        if response.status_code != 200:
+            return self._failure(method, endpoint, ERROR_HTTP,
+                                 response.reason or "", start, response.status_code,
+                                 len(response.content))
+        try:
+            payload = response.json()
+        except ValueError as e:
+            return self._failure(method, endpoint, ERROR_DECODE, str(e), start,
+                                 response.status_code, len(response.content))
+        return ApiResult(data=payload, status=response.status_code,
+                         elapsed=time.perf_counter() - start, size=len(response.content),
+                         etag=response.headers.get("ETag"))
+
+    def get(self, endpoint, headers=None, conditional=True):
+        with self._etag_lock:
+            cached = self._etags.get(endpoint) if conditional else None
+        if cached is not None:
+            headers = dict(headers or {}, **{"If-None-Match": cached[0]})
+        result = self.request("GET", endpoint, headers=headers)
+        if result.status == 304:
+            if cached is None:
+                return ApiResult(error=ERROR_HTTP, status=304, message="304 without cached response",
+                                 elapsed=result.elapsed)
+            result.data = cached[1]
+        elif conditional and result.ok and result.etag and self.max_etags:
+            with self._etag_lock:
+                self._etags[endpoint] = (result.etag, result.data)
+                self._etags.move_to_end(endpoint)
+                while len(self._etags) > self.max_etags:
+                    self._etags.popitem(last=False)
+        return result
+
+    def post(self, endpoint, data, headers=None):
+        return self.request("POST", endpoint, data=data, headers=headers)
+
+    def close(self):
+        self.session.close()
+
+    def _failure(self, method, endpoint, error, message, start, status=None, size=0):
+        logger.warning("%s %s failed (%s): %s", method, endpoint, error, message)
+        return ApiResult(error=error, status=status, message=message,
+                         elapsed=time.perf_counter() - start, size=size)
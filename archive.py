@@ -0,0 +1,279 @@
+"""복습 기록 / 오답 노트를 월별 파티션 Arrow IPC(또는 Parquet) 파일로 보관
+
+    python archive.py --api-base-url http://127.0.0.1:8765 --out archive/
+    python archive.py --api-base-url URL --out backup/ --format parquet
+
+    # crontab: 매일 03:00 스냅샷
+    0 3 * * * cd /srv/toefl && python archive.py --api-base-url URL --out /srv/toefl/archive
+
+파일 배치: <out>/reviews/month=2026-09/data.arrow, <out>/wrongnotes/month=2026-09/data.arrow
+(reviews 는 reviewed_at, wrongnotes 는 date_added 기준 월. 날짜가 없으면 month=unknown)
+arrow 는 압축하지 않은 IPC 파일이라 memory map 으로 열면 열 데이터를 복사 없이 읽는다.
+parquet 는 zstd 압축 백업용 (읽을 때 디코딩이 필요).
+내용이 같은 달은 다시 쓰지 않으므로, 지난 달들은 한 번 쓰이면 그대로 남는다.
+복습 기록은 지우지 않는다: 응답에 없는 달은 그대로 두고, 이미 있는 달은 복습 한 건 단위로
+합친다(/history 가 짧은 기간만 줘도 그 전 기록은 남음). 오답 노트의 빈 달 정리는 --prune 으로
+명시할 때만 한다.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from api_client import ApiClient
+
+KINDS = {"reviews": "reviewed_at", "wrongnotes": "date_added"}
+FORMATS = ("arrow", "parquet")
+UNKNOWN_MONTH = "unknown"
+HASH_KEY = b"content_sha1"
+# 복습 한 건을 가리키는 열. 없으면 (question_id, reviewed_at, 같은 값 중 몇 번째) 로 구분
+REVIEW_ID = "review_id"
+REVIEW_KEY_COLUMNS = ("question_id", "reviewed_at")
+
+
+def _column(values):
+    # 타입이 섞인 열(숫자/문자 등)은 문자열로 (dict/list 는 JSON)
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.array([v if v is None or isinstance(v, str) else json.dumps(v, ensure_ascii=False)
+                         for v in values], type=pa.string())
+
+
+def to_table(rows):
+    """dict 목록 -> pa.Table (모든 행의 키를 합친 열, 없는 값은 null)"""
+    columns = {}
+    for row in rows:
+        for name in row:
+            columns.setdefault(name, None)
+    return pa.table({name: _column([row.get(name) for row in rows]) for name in columns})
+
+
+def month_of(column):
+    """날짜 열(ISO 문자열/날짜) -> 'YYYY-MM' numpy 배열 (알 수 없으면 UNKNOWN_MONTH)"""
+    text = column if pa.types.is_string(column.type) else pc.cast(column, pa.string())
+    months = pc.utf8_slice_codeunits(text, 0, 7)
+    valid = pc.fill_null(pc.match_substring_regex(months, r"^\d{4}-(0[1-9]|1[0-2])$"), False)
+    return pc.if_else(valid, months, UNKNOWN_MONTH).to_numpy(zero_copy_only=False).astype(str)
+
+
+def _digest(table):
+    sink = pa.BufferOutputStream()
+    with ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return hashlib.sha1(sink.getvalue()).hexdigest()
+
+
+def _read_schema(path):
+    if path.endswith(".parquet"):
+        return pq.read_schema(path)
+    with pa.memory_map(path) as source:
+        return ipc.open_file(source).schema
+
+
+def _review_keys(table):
+    names = [REVIEW_ID] if REVIEW_ID in table.column_names else \
+        [name for name in REVIEW_KEY_COLUMNS if name in table.column_names]
+    frame = pd.DataFrame({name: table.column(name).to_pandas().astype(str) for name in names},
+                         index=pd.RangeIndex(table.num_rows))
+    # 같은 날 같은 문항을 두 번 복습한 기록도 서로 다른 건으로 남도록 순번을 붙임
+    frame["occurrence"] = frame.groupby(names, sort=False).cumcount() if names else frame.index
+    return pd.MultiIndex.from_frame(frame)
+
+
+def merge_reviews(old, new):
+    """보관된 달과 새 조각을 복습 키로 합침. 반환: (합친 테이블, 새 조각에 없던 기존 행 수)
+
+    같은 키는 새 행으로 바꾸고, 새 조각에 없는 기존 행은 앞에 그대로 둔다.
+    """
+    only_old = ~_review_keys(old).isin(_review_keys(new))
+    kept = int(only_old.sum())
+    if not kept:
+        return new, 0
+    old = old.replace_schema_metadata(None).filter(pa.array(only_old))
+    return pa.concat_tables([old, new], promote_options="default"), kept
+
+
+def _open(path):
+    # arrow: 파일을 memory map 한 버퍼를 그대로 가리키는 테이블 (복사 없음)
+    if path.endswith(".parquet"):
+        return pq.read_table(path, memory_map=True)
+    return ipc.open_file(pa.memory_map(path)).read_all()
+
+
+class Archive:
+    """월별 파티션 보관소. 읽은 파티션은 파일이 바뀌기 전까지 열어 둔 채 재사용한다."""
+
+    def __init__(self, root, fmt="arrow"):
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown archive format: {fmt}")
+        self.root = root
+        self.fmt = fmt
+        self.lock = threading.Lock()
+        self._tables = {}   # 파일 경로 -> (mtime_ns, pa.Table)
+
+    def _dir(self, kind, month):
+        return os.path.join(self.root, kind, f"month={month}")
+
+    def _file(self, kind, month):
+        # 형식이 다른 파일만 있으면 그것을 읽음 (예: parquet 로 받은 백업)
+        directory = self._dir(kind, month)
+        for fmt in (self.fmt,) + tuple(f for f in FORMATS if f != self.fmt):
+            path = os.path.join(directory, f"data.{fmt}")
+            if os.path.exists(path):
+                return path
+        return None
+
+    def months(self, kind):
+        directory = os.path.join(self.root, kind)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name.split("=", 1)[1] for name in os.listdir(directory)
+                      if name.startswith("month=") and self._file(kind, name.split("=", 1)[1]))
+
+    def partitions(self, kind, months=None):
+        """[(월, pa.Table)] - 고른 달의 파일만 연다"""
+        wanted = self.months(kind) if months is None else months
+        result = []
+        with self.lock:
+            for month in wanted:
+                path = self._file(kind, month)
+                if path is None:
+                    continue
+                mtime = os.stat(path).st_mtime_ns
+                cached = self._tables.get(path)
+                if cached is None or cached[0] != mtime:
+                    cached = self._tables[path] = (mtime, _open(path))
+                result.append((month, cached[1]))
+        return result
+
+    def table(self, kind, months=None):
+        """고른 달들을 하나의 pa.Table 로 (파티션을 chunk 로 이어 붙일 뿐 복사하지 않음)"""
+        tables = [table for _, table in self.partitions(kind, months)]
+        if not tables:
+            return None
+        return pa.concat_tables(tables, promote_options="default")
+
+    def write(self, kind, rows, prune=False):
+        """rows 를 월별로 나눠 저장. 반환: {rows, written, skipped, kept, removed}
+
+        reviews 는 추가만 되는 기록이므로 이미 있는 달은 merge_reviews 로 합쳐 쓴다.
+        kept 는 새 rows 에 없던 기존 행을 남긴 달 수.
+        prune=True 이면 rows 에 없는 달의 파일을 지운다 (reviews 나 빈 rows 에는 적용하지 않음).
+        """
+        stats = {"rows": len(rows), "written": 0, "skipped": 0, "kept": 0, "removed": 0}
+        table = to_table(rows)
+        date_column = KINDS[kind]
+        if date_column in table.column_names:
+            months = month_of(table.column(date_column))
+        else:
+            months = np.full(table.num_rows, UNKNOWN_MONTH)
+        # 월 순으로 정렬한 뒤 구간을 잘라 파티션마다 같은 스키마를 쓰게 함
+        order = np.argsort(months, kind="stable")
+        table = table.take(pa.array(order))
+        names, starts = np.unique(months[order], return_index=True)
+        bounds = dict(zip(names, zip(starts, list(starts[1:]) + [table.num_rows])))
+
+        with self.lock:
+            for month, (start, end) in bounds.items():
+                part = table.slice(start, end - start)
+                digest = _digest(part).encode()
+                path = os.path.join(self._dir(kind, month), f"data.{self.fmt}")
+                if os.path.exists(path):
+                    if (_read_schema(path).metadata or {}).get(HASH_KEY) == digest:
+                        stats["skipped"] += 1
+                        continue
+                    if kind == "reviews":
+                        part, kept = merge_reviews(_open(path), part)
+                        if kept:
+                            stats["kept"] += 1
+                            digest = _digest(part).encode()
+                            if (_read_schema(path).metadata or {}).get(HASH_KEY) == digest:
+                                stats["skipped"] += 1
+                                continue
+                self._write_file(path, part.replace_schema_metadata({HASH_KEY: digest}))
+                stats["written"] += 1
+            if not (prune and kind != "reviews" and bounds):
+                return stats
+            for month in set(self.months(kind)) - set(bounds):
+                # 이번 스냅샷에 행이 없는 달 (예: 그 달 노트가 모두 삭제됨)
+                for fmt in FORMATS:
+                    path = os.path.join(self._dir(kind, month), f"data.{fmt}")
+                    if os.path.exists(path):
+                        os.remove(path)
+                        self._tables.pop(path, None)
+                stats["removed"] += 1
+        return stats
+
+    def _write_file(self, path, table):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        if self.fmt == "parquet":
+            pq.write_table(table, tmp, compression="zstd")
+        else:
+            with pa.OSFile(tmp, "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        # 읽는 쪽은 교체 전 파일을 계속 map 하고 있어도 안전
+        os.replace(tmp, path)
+
+    def snapshot(self, history, notes, prune=False):
+        """/history 응답과 오답 노트 목록을 저장. 반환: {종류: write() 통계}
+
+        prune=True 는 notes 가 전체 목록일 때만: 노트가 모두 지워진 달의 파일을 정리한다.
+        """
+        return {"reviews": self.write("reviews", (history or {}).get("reviews", [])),
+                "wrongnotes": self.write("wrongnotes", notes or [], prune=prune)}
+
+    def review_summary(self):
+        """월별 복습 수/정답률/문항 수 DataFrame (파티션마다 Arrow 연산으로 바로 집계)"""
+        rows = []
+        for month, table in self.partitions("reviews"):
+            if not table.num_rows:
+                continue
+            correct = table.column("correct") if "correct" in table.column_names else None
+            if correct is not None and correct.type != pa.bool_():
+                correct = pc.cast(correct, pa.bool_(), safe=False)
+            questions = table.column("question_id") if "question_id" in table.column_names else None
+            rows.append({
+                "month": month,
+                "reviews": table.num_rows,
+                "accuracy": None if correct is None else pc.mean(correct.cast(pa.int8())).as_py(),
+                "questions": None if questions is None else pc.count_distinct(questions).as_py(),
+            })
+        return pd.DataFrame(rows, columns=["month", "reviews", "accuracy", "questions"]).set_index("month")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--api-base-url", required=True)
+    parser.add_argument("--out", required=True, help="보관 디렉터리")
+    parser.add_argument("--format", choices=FORMATS, default="arrow")
+    parser.add_argument("--prune", action="store_true",
+                        help="노트가 모두 삭제된 달의 오답 노트 파일 정리 (복습 기록은 지우지 않음)")
+    args = parser.parse_args()
+
+    client = ApiClient(args.api_base_url)
+    history = client.get("/history")
+    notes = client.get("/wrongnotes")
+    for name, result in (("/history", history), ("/wrongnotes", notes)):
+        if not result.ok:
+            print(f"{name}: {result.error}", file=sys.stderr)
+            sys.exit(1)
+    stats = Archive(args.out, args.format).snapshot(history.data, notes.data.get("notes", []),
+                                                    prune=args.prune)
+    for kind, s in stats.items():
+        print(f"{kind}: rows={s['rows']} written={s['written']} skipped={s['skipped']} "
+              f"kept={s['kept']} removed={s['removed']}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
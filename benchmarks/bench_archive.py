@@ -0,0 +1,77 @@
+"""보관본 읽기 시간: JSON -> DataFrame / Arrow IPC memory map / Parquet
+
+    python benchmarks/bench_archive.py
+    python benchmarks/bench_archive.py --reviews 100000 1000000 --notes 5000
+
+같은 복습 기록을 JSON 문자열, 월별 arrow, 월별 parquet 로 저장해 두고
+전체를 읽어 월별 복습 수/정답률을 구하는 시간과 디스크 크기를 비교한다.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from archive import Archive  # noqa: E402
+from mock_backend import MockConfig, MockState  # noqa: E402
+
+
+def dir_size(path):
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(path) for name in names)
+
+
+def timed(func, runs=5):
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def json_summary(text):
+    frame = pd.DataFrame(json.loads(text)["reviews"])
+    month = frame["reviewed_at"].str.slice(0, 7)
+    return frame.groupby(month)["correct"].agg(reviews="size", accuracy="mean")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reviews", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--notes", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'reviews':>9} {'json(ms)':>9} {'arrow(ms)':>10} {'parquet(ms)':>12} "
+          f"{'json(MB)':>9} {'arrow(MB)':>10} {'parquet(MB)':>12} {'write(s)':>9} {'rewrite(s)':>11}")
+    for n in args.reviews:
+        state = MockState(MockConfig(notes=args.notes, reviews=n))
+        history = {"reviews": state.reviews}
+        notes = list(state.notes.values())
+        with tempfile.TemporaryDirectory() as tmp:
+            text = json.dumps(history)
+            json_ms, _ = timed(lambda: json_summary(text))
+            row = {}
+            for fmt in ("arrow", "parquet"):
+                root = os.path.join(tmp, fmt)
+                start = time.perf_counter()
+                Archive(root, fmt).snapshot(history, notes)
+                row[f"{fmt}_write"] = time.perf_counter() - start
+                start = time.perf_counter()
+                Archive(root, fmt).snapshot(history, notes)     # 변경 없음 -> 전부 건너뜀
+                row[f"{fmt}_rewrite"] = time.perf_counter() - start
+                # 매번 새로 열어 파일 열기/디코딩까지 포함
+                row[fmt], _ = timed(lambda: Archive(root, fmt).review_summary())
+                row[f"{fmt}_mb"] = dir_size(os.path.join(root, "reviews")) / 1e6
+        print(f"{n:>9} {json_ms * 1000:>9.1f} {row['arrow'] * 1000:>10.1f} {row['parquet'] * 1000:>12.1f} "
+              f"{len(text) / 1e6:>9.1f} {row['arrow_mb']:>10.1f} {row['parquet_mb']:>12.1f} "
+              f"{row['arrow_write']:>9.2f} {row['arrow_rewrite']:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
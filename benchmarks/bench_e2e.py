@@ -0,0 +1,164 @@
+"""모의 백엔드 + AppTest 로 페이지를 headless 로 조작하는 부하/지연 벤치마크
+
+    python benchmarks/bench_e2e.py
+    python benchmarks/bench_e2e.py --sizes 100 5000 --users 1 8 --latency 0.2 --fail-rate 0.02
+
+데이터셋 크기와 동시 사용자 수를 늘려가며 상호작용별 rerun 지연(p50/p95),
+상호작용당 백엔드 요청 수, 세션당 session_state 크기와 프로세스 최대 RSS 를 출력한다.
+
+AppTest 는 한 프로세스에서 동시에 여러 개를 돌릴 수 없으므로 사용자마다 별도 프로세스를
+띄운다. 따라서 프로세스 단위 캐시(cache_resource)는 사용자 간에 공유되지 않는다.
+요청 수는 다른 사용자의 요청과 섞이지 않도록 사용자 1명일 때만 상호작용별로 잰다.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import urllib.request
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from instrumentation import deep_sizeof  # noqa: E402
+from mock_backend import MockConfig, start_mock_server  # noqa: E402
+
+APP = os.path.join(ROOT, "toefl_app.py")
+
+
+def by_label(elements, label):
+    return next(e for e in elements if e.label == label)
+
+
+# (이름, AppTest 를 한 단계 조작하는 함수)
+INTERACTIONS = [
+    ("dashboard: open", lambda at: at.run()),
+    ("dashboard: rerun", lambda at: at.run()),
+    ("study: open", lambda at: at.selectbox(key="page").set_value("오늘 학습").run()),
+    ("study: answer", lambda at: at.radio[0].set_value(at.radio[0].options[1]).run()),
+    ("study: flag", lambda at: at.checkbox[0].check().run()),
+    ("study: next", lambda at: by_label(at.button, "다음 ▶").click().run()),
+    ("wrongnotes: open", lambda at: at.selectbox(key="page").set_value("오답 노트").run()),
+    ("wrongnotes: sort", lambda at: by_label(at.selectbox, "정렬 기준").set_value("오답 횟수순").run()),
+    ("wrongnotes: filter", lambda at: by_label(at.multiselect, "유형 필터")
+        .select(by_label(at.multiselect, "유형 필터").options[0]).run()),
+]
+
+
+def session_state_size(at):
+    return sum(deep_sizeof(at.session_state[k]) for k in at.session_state._state._keys())
+
+
+def request_total(base_url):
+    with urllib.request.urlopen(f"{base_url}/__stats") as response:
+        return sum(json.load(response).values())
+
+
+def run_user(base_url, db_path, track_requests):
+    timings, errors, request_counts = defaultdict(list), defaultdict(list), defaultdict(list)
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.secrets["API_BASE_URL"] = base_url
+    at.secrets["LOCAL_DB_PATH"] = db_path
+    for name, step in INTERACTIONS:
+        before = request_total(base_url) if track_requests else 0
+        start = time.perf_counter()
+        try:
+            step(at)
+        except Exception as e:  # 데이터에 따라 위젯이 없을 수 있음
+            errors[name].append(repr(e))
+            continue
+        timings[name].append(time.perf_counter() - start)
+        if track_requests:
+            request_counts[name].append(request_total(base_url) - before)
+        if at.exception:
+            errors[name].append(at.exception[0].value)
+    max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return dict(timings), dict(errors), dict(request_counts), session_state_size(at), max_rss_kb
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def run_scenario(size, users, args):
+    config = MockConfig(notes=size, questions=max(100, size // 2), reviews=size * 4,
+                        latency=args.latency, jitter=args.latency / 4,
+                        fail_rate=args.fail_rate, seed=size)
+    server, base_url = start_mock_server(config)
+    timings, errors, request_counts = defaultdict(list), defaultdict(list), defaultdict(list)
+    sizes, rss = [], []
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs = [(base_url, os.path.join(tmp, f"user{i}.db"), users == 1) for i in range(users)]
+        start = time.perf_counter()
+        with multiprocessing.get_context("spawn").Pool(users) as pool:
+            outputs = pool.starmap(run_user, jobs)
+        wall = time.perf_counter() - start
+        total_requests = request_total(base_url)
+    server.shutdown()
+    for user_timings, user_errors, user_requests, size_bytes, max_rss_kb in outputs:
+        for name, values in user_timings.items():
+            timings[name].extend(values)
+        for name, values in user_errors.items():
+            errors[name].extend(values)
+        for name, values in user_requests.items():
+            request_counts[name].extend(values)
+        sizes.append(size_bytes)
+        rss.append(max_rss_kb)
+    return {
+        "size": size, "users": users, "wall_s": wall,
+        "requests_per_user": total_requests / users,
+        "session_state_kb": statistics.median(sizes) / 1024 if sizes else None,
+        "max_rss_mb": statistics.median(rss) / 1024 if rss else None,
+        "interactions": {
+            name: {"p50_ms": percentile(timings[name], 0.5) * 1000 if timings[name] else None,
+                   "p95_ms": percentile(timings[name], 0.95) * 1000 if timings[name] else None,
+                   "requests": statistics.mean(request_counts[name]) if request_counts[name] else None,
+                   "errors": errors[name][:3]}
+            for name, _ in INTERACTIONS
+        },
+    }
+
+
+def print_report(result):
+    print(f"\n== notes={result['size']} users={result['users']} "
+          f"wall={result['wall_s']:.2f}s requests/user={result['requests_per_user']:.1f} "
+          f"session_state={result['session_state_kb'] or 0:.1f}KB "
+          f"max_rss={result['max_rss_mb'] or 0:.0f}MB")
+    print(f"  {'interaction':<20} {'p50(ms)':>9} {'p95(ms)':>9} {'requests':>9}")
+    for name, row in result["interactions"].items():
+        def fmt(v, spec):
+            return format(v, spec) if v is not None else "-"
+        print(f"  {name:<20} {fmt(row['p50_ms'], '9.1f'):>9} {fmt(row['p95_ms'], '9.1f'):>9} "
+              f"{fmt(row['requests'], '9.1f'):>9}" + (f"  ! {row['errors'][0]}" if row["errors"] else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 2000])
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--latency", type=float, default=0.05, help="모의 백엔드 평균 지연(초)")
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--json", help="결과를 JSON 으로 저장할 경로")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        for users in args.users:
+            result = run_scenario(size, users, args)
+            print_report(result)
+            results.append(result)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""페이지 첫 로드 시간: 섹션별 순차 요청 / 선언한 데이터 동시 요청 (PARALLEL_LOAD)
+
+    python benchmarks/bench_page_load.py
+    python benchmarks/bench_page_load.py --latency 1.0 --runs 5
+    python benchmarks/bench_page_load.py --slow /history=4 --deadline 1.5
+
+모의 백엔드에 요청당 지연을 주고, 캐시가 빈 상태에서 각 페이지를 AppTest 로 한 번 실행한다.
+--slow 로 한 경로만 느리게 하면 마감(PAGE_DEADLINE) 시점의 부분 렌더링까지의 시간(partial)과
+모든 데이터가 그려지기까지의 시간(parallel)을 따로 볼 수 있다.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from mock_backend import MockConfig, start_mock_server  # noqa: E402
+
+APP = os.path.join(ROOT, "toefl_app.py")
+# (페이지, 추가 설정)
+PAGES = [
+    ("Dashboard", {"LOCAL_ANALYTICS": True}),
+    ("오답 노트", {}),
+    ("오늘 학습", {"RECOMMEND_TOP_UP": True}),
+]
+
+
+def first_load(url, page, secrets, tmp):
+    at = AppTest.from_file(APP, default_timeout=300)
+    at.secrets["API_BASE_URL"] = url
+    at.secrets["LOCAL_DB_PATH"] = os.path.join(tmp, f"bench-{time.monotonic_ns()}.db")
+    for name, value in secrets.items():
+        at.secrets[name] = value
+    at.session_state["page"] = page
+    start = time.perf_counter()
+    at.run()
+    first = time.perf_counter() - start
+    # 늦은 데이터는 앱에서는 PAGE_LATE_POLL 마다 확인해 다시 그림 -> 모두 그려질 때까지 다시 실행
+    while any(caption.value.startswith("⏳ 응답이 늦은 데이터") for caption in at.caption):
+        at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return first, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.5, help="요청당 지연(초)")
+    parser.add_argument("--slow", action="append", default=[], metavar="PATH=SECONDS")
+    parser.add_argument("--deadline", type=float, default=5.0, help="PAGE_DEADLINE")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    slow = {path: float(seconds) for path, seconds in (item.rsplit("=", 1) for item in args.slow)}
+
+    print(f"{'page':<12} {'serial(s)':>10} {'parallel(s)':>12} {'partial(s)':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for page, extra in PAGES:
+            row = {}
+            for mode, secrets in (("serial", {"PARALLEL_LOAD": False}),
+                                  ("parallel", {"PARALLEL_LOAD": True, "PAGE_DEADLINE": args.deadline})):
+                times = []
+                for _ in range(args.runs):
+                    # 매번 새 서버/새 캐시 (프로세스 캐시는 URL 별이라 포트가 바뀌면 새로 만들어짐)
+                    server, url = start_mock_server(MockConfig(latency=args.latency, slow_paths=slow))
+                    try:
+                        times.append(first_load(url, page, dict(extra, **secrets), tmp))
+                    finally:
+                        server.shutdown()
+                row[mode] = statistics.median(t for _, t in times)
+                # 마감 시점에 그린 부분 페이지까지 (늦은 데이터를 기다리지 않음)
+                row["partial"] = statistics.median(t for t, _ in times)
+            print(f"{page:<12} {row['serial']:>10.2f} {row['parallel']:>12.2f} {row['partial']:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
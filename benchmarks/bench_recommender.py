@@ -0,0 +1,73 @@
+"""비슷한 오답 추천 색인: 벡터화(sync) / 질의 시간
+
+    python benchmarks/bench_recommender.py
+    python benchmarks/bench_recommender.py --notes 10000 100000 --queries 200
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_backend import SKILLS, WORDS, MockConfig, MockState  # noqa: E402
+from recommender import SimilarNotes  # noqa: E402
+
+
+def synthetic_notes(n, seed=0):
+    # 모의 백엔드 노트는 같은 문항을 여러 번 쓰므로 문항 문장을 조금씩 바꿔 서로 다르게 만든다
+    rng = random.Random(seed)
+    state = MockState(MockConfig(notes=0, questions=min(n, 5000), reviews=0, seed=seed))
+    questions = list(state.questions.values())
+    notes = []
+    for note_id in range(n):
+        q = rng.choice(questions)
+        notes.append({"note_id": note_id,
+                      "passage_text": state.passages[q["passage_id"]]["passage_text"],
+                      "question_text": f"{q['question_text']} {' '.join(rng.sample(WORDS, 4))}",
+                      "skill_tags": [q["skill"] or rng.choice(SKILLS)]})
+    return notes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{'notes':>8} {'sync(s)':>8} {'merge(ms)':>10} {'p50(ms)':>8} {'p95(ms)':>8} "
+          f"{'add+query(ms)':>14}")
+    for n in args.notes:
+        notes = synthetic_notes(n)
+        index = SimilarNotes()
+        start = time.perf_counter()
+        index.sync(notes)
+        sync_s = time.perf_counter() - start
+
+        # 첫 질의에서 delta 가 본 구간으로 합쳐짐
+        start = time.perf_counter()
+        index.similar(0)
+        merge_ms = (time.perf_counter() - start) * 1000
+
+        rng = random.Random(1)
+        timings = []
+        for note in rng.choices(notes, k=args.queries):
+            start = time.perf_counter()
+            index.similar(note["note_id"])
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+
+        # 새 노트 하나를 추가한 직후 질의 (delta 구간 포함)
+        start = time.perf_counter()
+        index.add(n, dict(notes[0], note_id=n, question_text=notes[1]["question_text"] + " new"))
+        index.similar(n)
+        add_ms = (time.perf_counter() - start) * 1000
+
+        print(f"{n:>8} {sync_s:>8.2f} {merge_ms:>10.1f} {statistics.median(timings):>8.1f} "
+              f"{timings[int(len(timings) * 0.95) - 1]:>8.1f} {add_ms:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
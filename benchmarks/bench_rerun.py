@@ -0,0 +1,202 @@
+"""위젯 조작 한 번당 rerun 시간 비교 (st.fragment 적용 전/후)
+
+    python benchmarks/bench_rerun.py
+    python benchmarks/bench_rerun.py --runs 10 --latency 0.1 --notes 2000
+
+실제 `streamlit run` 서버를 띄우고 브라우저 대신 웹소켓으로 위젯 값을 보내,
+요청을 보낸 뒤 script_finished 를 받을 때까지의 시간과 받은 메시지 크기를 잰다.
+AppTest 는 fragment 단위 rerun 을 지원하지 않아 이 방식으로 측정한다.
+FRAGMENTS=false (매번 전체 스크립트 실행) 와 FRAGMENTS=true 를 같은 시나리오로 비교한다.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.proto.BackMsg_pb2 import BackMsg  # noqa: E402
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg  # noqa: E402
+from tornado.websocket import websocket_connect  # noqa: E402
+
+from mock_backend import MockConfig, start_mock_server  # noqa: E402
+
+APP = os.path.join(ROOT, "toefl_app.py")
+DONE = (ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY)
+WIDGETS = ("radio", "selectbox", "checkbox", "button", "multiselect", "text_input")
+
+# (이름, [(위젯 라벨, 값)]) - 값: 선택지 번호 / bool / 버튼은 True
+SCENARIO = [
+    ("dashboard: open", []),
+    ("dashboard: settings edit", [("휴무일 선택", 1)]),
+    ("study: open", [("페이지 선택", 1)]),
+    ("study: answer", [("답안 선택:", 1)]),
+    ("study: flag", [("🚩 플래그 표시", True)]),
+    ("study: next", [("다음 ▶", True)]),
+    ("study: answer 2", [("답안 선택:", 2)]),
+    ("wrongnotes: open", [("페이지 선택", 2)]),
+    ("wrongnotes: sort", [("정렬 기준", 2)]),
+    ("wrongnotes: detail", [("문항 선택", 1)]),
+]
+
+
+class Client:
+    """브라우저 대신 위젯 상태를 보내는 최소 웹소켓 클라이언트"""
+
+    def __init__(self, url):
+        self.url = url
+        self.widgets = {}   # 라벨 -> (종류, id, fragment_id)
+        self.values = {}    # 라벨 -> 값 (다음 rerun 때 계속 보냄)
+
+    async def connect(self):
+        self.ws = await websocket_connect(self.url, max_message_size=1 << 30)
+
+    async def rerun(self, changes=()):
+        triggers = set()
+        fragment_id = ""
+        for label, value in changes:
+            kind, _, fragment = self.widgets[label]
+            if kind == "button":
+                triggers.add(label)
+            else:
+                self.values[label] = value
+            fragment_id = fragment
+
+        msg = BackMsg()
+        state = msg.rerun_script
+        state.fragment_id = fragment_id
+        for label in list(self.values) + list(triggers):
+            if label not in self.widgets:
+                continue
+            kind, widget_id, _ = self.widgets[label]
+            widget = state.widget_states.widgets.add()
+            widget.id = widget_id
+            if kind == "button":
+                widget.trigger_value = True
+            elif kind == "checkbox":
+                widget.bool_value = bool(self.values[label])
+            else:
+                widget.int_value = int(self.values[label])
+
+        start = time.perf_counter()
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+        received = 0
+        while True:
+            raw = await self.ws.read_message()
+            if raw is None:
+                raise ConnectionError("웹소켓이 닫힘")
+            received += len(raw)
+            fwd = ForwardMsg.FromString(raw)
+            kind = fwd.WhichOneof("type")
+            if kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                name = element.WhichOneof("type")
+                if name in WIDGETS:
+                    widget = getattr(element, name)
+                    self.widgets[widget.label] = (name, widget.id, fwd.delta.fragment_id)
+            elif kind == "script_finished" and fwd.script_finished in DONE:
+                return time.perf_counter() - start, received
+
+    def close(self):
+        self.ws.close()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_app(workdir, port):
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP, "--server.headless", "true",
+         "--server.port", str(port), "--server.fileWatcherType", "none",
+         "--browser.gatherUsageStats", "false"],
+        cwd=workdir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("streamlit 서버가 시작되지 않음")
+
+
+async def run_session(port):
+    client = Client(f"ws://127.0.0.1:{port}/_stcore/stream")
+    await client.connect()
+    results = []
+    for name, changes in SCENARIO:
+        try:
+            elapsed, size = await client.rerun(changes)
+        except KeyError as e:   # 데이터에 따라 위젯이 없을 수 있음
+            results.append((name, None, None, f"widget not found: {e}"))
+            continue
+        results.append((name, elapsed, size, None))
+    client.close()
+    return results
+
+
+def run_mode(fragments, base_url, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, ".streamlit"))
+        with open(os.path.join(tmp, ".streamlit", "secrets.toml"), "w", encoding="utf-8") as f:
+            f.write(f'API_BASE_URL = "{base_url}"\n'
+                    f'LOCAL_DB_PATH = "{os.path.join(tmp, "bench.db")}"\n'
+                    f'FRAGMENTS = {"true" if fragments else "false"}\n')
+        port = free_port()
+        process = start_app(tmp, port)
+        try:
+            # 첫 세션은 import/캐시 워밍업용으로 버림
+            asyncio.run(run_session(port))
+            sessions = [asyncio.run(run_session(port)) for _ in range(args.runs)]
+        finally:
+            process.terminate()
+            process.wait()
+    table = {}
+    for results in sessions:
+        for name, elapsed, size, error in results:
+            row = table.setdefault(name, {"ms": [], "kb": [], "error": None})
+            if error:
+                row["error"] = error
+            else:
+                row["ms"].append(elapsed * 1000)
+                row["kb"].append(size / 1024)
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="모드별 세션 수")
+    parser.add_argument("--notes", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05, help="모의 백엔드 평균 지연(초)")
+    args = parser.parse_args()
+
+    server, base_url = start_mock_server(MockConfig(notes=args.notes, latency=args.latency,
+                                                    jitter=args.latency / 4))
+    before = run_mode(False, base_url, args)
+    after = run_mode(True, base_url, args)
+    server.shutdown()
+
+    def med(values):
+        return f"{statistics.median(values):9.1f}" if values else f"{'-':>9}"
+
+    print(f"{'interaction':<26} {'full(ms)':>9} {'frag(ms)':>9} {'full(KB)':>9} {'frag(KB)':>9}")
+    for name, _ in SCENARIO:
+        b, a = before[name], after[name]
+        note = b["error"] or a["error"]
+        print(f"{name:<26} {med(b['ms'])} {med(a['ms'])} {med(b['kb'])} {med(a['kb'])}"
+              + (f"  ! {note}" if note else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""로컬 스케줄러 vs 원격 /due 호출 시간 비교
+
+    python benchmarks/bench_scheduler.py --records 10000 50000
+    python benchmarks/bench_scheduler.py --users 100 1000 --records-per-user 500
+    python benchmarks/bench_scheduler.py --api-base-url https://script.google.com/macros/s/.../exec
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scheduler  # noqa: E402
+from api_client import ApiClient  # noqa: E402
+
+
+def synthetic_history(n_records, n_questions=None, days=180, seed=0):
+    rng = np.random.default_rng(seed)
+    n_questions = n_questions or max(1, n_records // 8)
+    end = pd.Timestamp(date.today())
+    return pd.DataFrame({
+        "question_id": rng.integers(0, n_questions, n_records).astype(str),
+        "reviewed_at": end - pd.to_timedelta(rng.integers(0, days, n_records), unit="D"),
+        "correct": rng.random(n_records) < 0.7,
+    })
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--users", type=int, nargs="*", default=[],
+                        help="일일 배치: 사용자 수별 batch_due_queues vs 사용자별 due_questions")
+    parser.add_argument("--records-per-user", type=int, default=500)
+    parser.add_argument("--api-base-url", default=os.environ.get("API_BASE_URL"))
+    args = parser.parse_args()
+
+    today = date.today().isoformat()
+    policies = {"ladder": scheduler.IntervalLadder(), "sm2": scheduler.SM2()}
+
+    print(f"{'records':>8} {'policy':>7} {'schedule(ms)':>13} {'queue(ms)':>10}")
+    for n in args.records:
+        history = synthetic_history(n)
+        for name, policy in policies.items():
+            schedule_s = best_of(lambda: scheduler.compute_schedule(history, policy, "일요일"),
+                                 args.repeat)
+            schedule = scheduler.compute_schedule(history, policy, "일요일")
+            queue_s = best_of(lambda: scheduler.due_queue(schedule, today, 10, "일요일"),
+                              args.repeat)
+            print(f"{n:>8} {name:>7} {schedule_s * 1000:>13.2f} {queue_s * 1000:>10.2f}")
+
+    if args.users:
+        print(f"\n{'users':>8} {'batch(ms)':>10} {'per-user(ms)':>13}")
+    for n_users in args.users:
+        payloads = {}
+        for u in range(n_users):
+            history = synthetic_history(args.records_per_user, seed=u)
+            history["reviewed_at"] = history["reviewed_at"].dt.strftime("%Y-%m-%d")
+            payloads[u] = {"reviews": history.to_dict("records"),
+                           "questions": [{"question_id": q}
+                                         for q in history["question_id"].unique()],
+                           "settings": {"daily_target": 10, "rest_day": ("토요일", "일요일", None)[u % 3]}}
+        batch_s = best_of(lambda: scheduler.batch_due_queues(payloads, today), args.repeat)
+        loop_s = best_of(lambda: [scheduler.due_questions(p, today) for p in payloads.values()],
+                         args.repeat)
+        print(f"{n_users:>8} {batch_s * 1000:>10.1f} {loop_s * 1000:>13.1f}")
+
+    if args.api_base_url:
+        client = ApiClient(args.api_base_url)
+        remote_s = best_of(lambda: client.get(f"/due?date={today}"), args.repeat)
+        print(f"remote /due: {remote_s * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""페이지별 콜드 스타트 / 첫 렌더링 / warm rerun 시간 측정
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --pages "오늘 학습" --runs 5
+
+각 측정은 새 프로세스에서 실행한다. warm rerun 은 모듈과 cache_resource 가 이미
+올라온 같은 프로세스에서 새 세션으로 스크립트를 다시 실행한 시간이다.
+앱이 import 한 모듈 목록도 함께 출력하므로 "오늘 학습" 페이지에서 matplotlib 이
+로드되는 식의 import 회귀를 잡을 수 있다.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from mock_backend import MockConfig, start_mock_server  # noqa: E402
+
+APP = os.path.join(ROOT, "toefl_app.py")
+PAGES = ["Dashboard", "오늘 학습", "오답 노트"]
+# AppTest 를 import 한 뒤 앱이 새로 import 한 무거운 모듈 (numpy/pandas 는 쓰는 페이지에서만)
+WATCHED_MODULES = ("matplotlib.figure", "matplotlib.pyplot", "matplotlib.backends.backend_agg",
+                   "numpy", "pandas", "scheduler", "wrongnote_index", "chart_cache", "recommender")
+
+def child(page, api_base_url, warm_runs):
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    import_s = time.perf_counter() - start
+
+    before = set(sys.modules)
+    with tempfile.TemporaryDirectory() as tmp:
+        def run_page():
+            at = AppTest.from_file(APP, default_timeout=120)
+            at.secrets["API_BASE_URL"] = api_base_url
+            at.secrets["LOCAL_DB_PATH"] = os.path.join(tmp, "bench.db")
+            at.session_state["page"] = page
+            start = time.perf_counter()
+            at.run()
+            return at, time.perf_counter() - start
+
+        at, first_s = run_page()
+        warm = [run_page()[1] for _ in range(warm_runs)]
+
+    loaded = sorted(m for m in WATCHED_MODULES if m in sys.modules and m not in before)
+    print(json.dumps({"import_s": import_s, "first_s": first_s,
+                      "warm_s": statistics.median(warm), "loaded": loaded,
+                      "exceptions": [e.value for e in at.exception]}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", nargs="+", default=PAGES)
+    parser.add_argument("--runs", type=int, default=3, help="페이지당 콜드 프로세스 수")
+    parser.add_argument("--warm-runs", type=int, default=5)
+    parser.add_argument("--api-base-url", help="지정하지 않으면 지연 없는 모의 백엔드 사용")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.api_base_url, args.warm_runs)
+        return
+
+    server = None
+    api_base_url = args.api_base_url
+    if not api_base_url:
+        server, api_base_url = start_mock_server(MockConfig())
+
+    print(f"{'page':<10} {'process(s)':>10} {'import(s)':>10} {'first(s)':>9} {'warm(ms)':>9}  loaded")
+    for page in args.pages:
+        samples = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", page, "--api-base-url", api_base_url,
+                 "--warm-runs", str(args.warm_runs)],
+                capture_output=True, text=True, check=True)
+            process_s = time.perf_counter() - start
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+            result["process_s"] = process_s
+            samples.append(result)
+            if result["exceptions"]:
+                print(f"  {page}: {result['exceptions']}", file=sys.stderr)
+
+        def med(key):
+            return statistics.median(s[key] for s in samples)
+
+        print(f"{page:<10} {med('process_s'):>10.2f} {med('import_s'):>10.2f} "
+              f"{med('first_s'):>9.2f} {med('warm_s') * 1000:>9.1f}  "
+              f"{','.join(samples[-1]['loaded']) or '-'}")
+
+    if server:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
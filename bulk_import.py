@@ -0,0 +1,298 @@
+"""CSV / TSV / JSONL 오답 노트 대량 가져오기
+
+    python bulk_import.py notes.csv --api-base-url http://127.0.0.1:8765
+    python bulk_import.py notes.jsonl --api-base-url URL --batch-size 100 --workers 4 --dry-run
+
+입력은 한 줄씩 읽어 검증하고, 기존 노트/이미 올린 노트와 내용 해시가 같은 행은 건너뛴다.
+올린 노트의 해시는 로컬 DB 에 기록하므로 중간에 끊겨도 다시 실행하면 이어서 올린다.
+"""
+import argparse
+import csv
+import hashlib
+import io
+import json
+import re
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+from api_client import ApiClient, confirmed, unsupported
+from local_store import DEFAULT_DB_PATH, LocalStore
+
+BATCH_ENDPOINT = "/wrongnote/batch"
+NOTE_FIELDS = ("passage_text", "question_text", "options", "correct_answer", "user_answer",
+               "explanation", "why_wrong", "skill_tags")
+REQUIRED_FIELDS = ("question_text", "correct_answer")
+# 선택지 앞의 "A." / "(B)" 같은 기호
+_OPTION_LABEL = re.compile(r"^\(?([A-Za-z])[.)]\s*")
+
+
+@dataclass
+class ImportStats:
+    read: int = 0
+    invalid: int = 0
+    duplicates: int = 0
+    uploaded: int = 0
+    failed: int = 0
+    bytes_read: int = 0
+    errors: list = field(default_factory=list)   # (행 번호, 메시지) 앞부분만 보관
+
+    def error(self, line, message, keep=50):
+        self.invalid += 1
+        if len(self.errors) < keep:
+            self.errors.append((line, message))
+
+
+class _CountingReader(io.RawIOBase):
+    """읽은 바이트 수를 세는 바이너리 스트림 래퍼 (진행률 계산용)"""
+
+    def __init__(self, raw, stats):
+        self.raw = raw
+        self.stats = stats
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.raw.read(len(buffer))
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        n = len(data)
+        buffer[:n] = data
+        self.stats.bytes_read += n
+        return n
+
+
+def detect_format(name, first_line):
+    name = (name or "").lower()
+    for suffix, fmt in ((".jsonl", "jsonl"), (".ndjson", "jsonl"), (".tsv", "tsv"), (".csv", "csv")):
+        if name.endswith(suffix):
+            return fmt
+    if first_line.lstrip().startswith("{"):
+        return "jsonl"
+    return "tsv" if "\t" in first_line else "csv"
+
+
+def iter_rows(binary, name=None, fmt=None):
+    """(행 번호, dict 또는 파싱 오류 문자열) 를 한 줄씩 생성"""
+    text = io.TextIOWrapper(io.BufferedReader(binary), encoding="utf-8-sig", newline="")
+    first = text.readline()
+    fmt = fmt or detect_format(name, first)
+    lines = _chain(first, text)
+    if fmt == "jsonl":
+        for line_no, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield line_no, f"JSON 파싱 실패: {e}"
+                continue
+            yield line_no, row if isinstance(row, dict) else "JSON 객체가 아님"
+    else:
+        reader = csv.DictReader(lines, delimiter="\t" if fmt == "tsv" else ",")
+        for row in reader:
+            yield reader.line_num, row
+
+
+def _chain(first, rest):
+    if first:
+        yield first
+    yield from rest
+
+
+def _split_list(value, separators):
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(v).strip() for v in value if str(v).strip()]
+    value = str(value).strip()
+    if value.startswith("["):
+        try:
+            return _split_list(json.loads(value), separators)
+        except ValueError:
+            pass
+    for sep in separators:
+        if sep in value:
+            return [v.strip() for v in value.split(sep) if v.strip()]
+    return [value] if value else []
+
+
+def normalize_note(row, known_tags=None):
+    """입력 행을 /wrongnote 형식으로 맞춤. (note, 오류 메시지 또는 None)"""
+    note = {key: (row.get(key) or "") for key in NOTE_FIELDS}
+    for key in ("passage_text", "question_text", "correct_answer", "user_answer",
+                "explanation", "why_wrong"):
+        note[key] = str(note[key]).strip()
+    note["options"] = _split_list(row.get("options"), ("\n", "|"))
+    note["skill_tags"] = _split_list(row.get("skill_tags"), (";", ","))
+
+    missing = [key for key in REQUIRED_FIELDS if not note[key]]
+    if missing:
+        return None, f"필수 항목 누락: {', '.join(missing)}"
+    if note["options"]:
+        # "B" 처럼 기호만 적은 정답/내 답은 해당 선택지로 바꿈
+        labels = {}
+        for option in note["options"]:
+            match = _OPTION_LABEL.match(option)
+            if match:
+                labels[match.group(1).upper()] = option
+        for key in ("correct_answer", "user_answer"):
+            if note[key] and note[key] not in note["options"]:
+                note[key] = labels.get(note[key].strip("().").upper(), note[key])
+        if note["correct_answer"] not in note["options"]:
+            return None, "정답이 선택지에 없음"
+    if known_tags is not None:
+        unknown = [tag for tag in note["skill_tags"] if tag not in known_tags]
+        if unknown:
+            return None, f"등록되지 않은 태그: {', '.join(unknown)}"
+    return note, None
+
+
+def content_hash(note):
+    # 공백/대소문자 차이는 같은 노트로 취급
+    def norm(value):
+        return " ".join(str(value or "").split()).lower()
+    key = "\x1f".join(norm(note.get(k)) for k in ("passage_text", "question_text", "correct_answer"))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+class BulkImporter:
+    """검증 -> 중복 제거 -> 배치 단위 동시 업로드 (진행 상황은 on_progress 로 전달)
+
+    /wrongnote/batch 를 지원하지 않는 백엔드(404 또는 200 + 알 수 없는 action)면
+    배치 안의 노트를 /wrongnote 로 하나씩 올린다. 백엔드가 success 로 확인한 노트만 올린 것으로 기록한다.
+    """
+
+    def __init__(self, client, store, existing_notes=(), known_tags=None, batch_size=100,
+                 max_workers=4, on_progress=None, dry_run=False):
+        self.client = client
+        self.store = store
+        self.known_tags = known_tags
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.on_progress = on_progress
+        self.dry_run = dry_run
+        self.stats = ImportStats()
+        self.seen = {content_hash(note) for note in existing_notes}
+        self.seen.update(store.imported_hashes())
+        self.batch_supported = True
+        self._lock = threading.Lock()
+
+    def run(self, binary, name=None, fmt=None):
+        stats = self.stats
+        batch = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            in_flight = set()
+            for line_no, row in iter_rows(_CountingReader(binary, stats), name, fmt):
+                stats.read += 1
+                if isinstance(row, str):
+                    stats.error(line_no, row)
+                    continue
+                note, error = normalize_note(row, self.known_tags)
+                if error:
+                    stats.error(line_no, error)
+                    continue
+                digest = content_hash(note)
+                if digest in self.seen:
+                    stats.duplicates += 1
+                    continue
+                self.seen.add(digest)
+                batch.append((digest, note))
+                if len(batch) >= self.batch_size:
+                    in_flight.add(executor.submit(self._upload, batch))
+                    batch = []
+                    # 메모리에 쌓이지 않도록 진행 중인 배치 수를 제한
+                    if len(in_flight) >= self.max_workers * 2:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        self._collect(done)
+                    self._progress()
+            if batch:
+                in_flight.add(executor.submit(self._upload, batch))
+            self._collect(wait(in_flight)[0])
+        self._progress()
+        return stats
+
+    def _collect(self, futures):
+        for future in futures:
+            future.result()
+
+    def _progress(self):
+        if self.on_progress:
+            self.on_progress(self.stats)
+
+    def _upload(self, batch):
+        if self.dry_run:
+            sent = [digest for digest, _ in batch]
+        elif self.batch_supported:
+            notes = [dict(note, idempotency_key=f"import:{digest}") for digest, note in batch]
+            result = self.client.post(BATCH_ENDPOINT, {"notes": notes})
+            if confirmed(result):
+                sent = [digest for digest, _ in batch]
+            elif unsupported(result):
+                self.batch_supported = False
+                sent = self._upload_each(batch)
+            else:
+                sent = []
+        else:
+            sent = self._upload_each(batch)
+        if sent and not self.dry_run:
+            self.store.mark_imported(sent)
+        with self._lock:
+            self.stats.uploaded += len(sent)
+            self.stats.failed += len(batch) - len(sent)
+
+    def _upload_each(self, batch):
+        sent = []
+        for digest, note in batch:
+            result = self.client.post("/wrongnote", dict(note, idempotency_key=f"import:{digest}"))
+            if confirmed(result):
+                sent.append(digest)
+        return sent
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="입력 파일 (- 이면 표준 입력)")
+    parser.add_argument("--api-base-url", required=True)
+    parser.add_argument("--format", choices=("csv", "tsv", "jsonl"))
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="이어 올리기 기록용 로컬 DB")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--allow-new-tags", action="store_true", help="등록되지 않은 태그도 허용")
+    parser.add_argument("--dry-run", action="store_true", help="검증/중복 검사만 하고 올리지 않음")
+    args = parser.parse_args()
+
+    client = ApiClient(args.api_base_url, pool_size=args.workers)
+    store = LocalStore(args.db)
+    existing = client.get("/wrongnotes")
+    if not existing.ok:
+        sys.exit(f"/wrongnotes 조회 실패: {existing.error} {existing.message}")
+    known_tags = None
+    if not args.allow_new_tags:
+        tags = client.get("/skill-tags")
+        known_tags = {t["name"] for t in (tags.data or {}).get("tags", [])} if tags.ok else None
+
+    def report(stats):
+        print(f"\rread={stats.read} uploaded={stats.uploaded} duplicates={stats.duplicates} "
+              f"invalid={stats.invalid} failed={stats.failed}", end="", file=sys.stderr)
+
+    importer = BulkImporter(client, store, (existing.data or {}).get("notes", []), known_tags,
+                            batch_size=args.batch_size, max_workers=args.workers,
+                            on_progress=report, dry_run=args.dry_run)
+    if args.path == "-":
+        stats = importer.run(sys.stdin.buffer, fmt=args.format)
+    else:
+        with open(args.path, "rb") as f:
+            stats = importer.run(f, args.path, args.format)
+    print(file=sys.stderr)
+    for line_no, message in stats.errors:
+        print(f"  {line_no}행: {message}", file=sys.stderr)
+    client.close()
+    store.close()
+    sys.exit(1 if stats.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+
+WEAK_SKILL_COLORS = ['#ff6b6b', '#ffa06b', '#ffcb6b']
+DEFAULT_STYLE = {"figsize": (8, 4), "dpi": 100, "format": "png"}
+
+
+def chart_key(kind, data, style):
+    raw = json.dumps([kind, data, style], sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class ChartCache:
+    """입력 데이터+스타일 해시로 렌더링된 차트 바이트를 재사용 (LRU, 프로세스 공유)"""
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, kind, data, render, style=None):
+        style = dict(DEFAULT_STYLE, **(style or {}))
+        key = chart_key(kind, data, style)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+        self.misses += 1
+        image = render(data, style)
+        with self._lock:
+            self._entries[key] = image
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return image
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_configured = False
+
+
+def _configure_matplotlib():
+    # 전역 설정은 프로세스당 한 번만 (matplotlib 은 첫 렌더링 때 import)
+    global _configured
+    if _configured:
+        return
+    import matplotlib
+    # 한글 폰트 설정
+    matplotlib.rcParams['font.family'] = 'DejaVu Sans'
+    matplotlib.rcParams['axes.unicode_minus'] = False
+    _configured = True
+
+
+def _new_figure(style):
+    _configure_matplotlib()
+    # pyplot 전역 상태를 거치지 않는 Figure 를 직접 만들어 누수 방지
+    from matplotlib.figure import Figure
+    return Figure(figsize=style["figsize"], dpi=style["dpi"])
+
+
+def _to_bytes(fig, style):
+    buf = io.BytesIO()
+    try:
+        fig.savefig(buf, format=style["format"], bbox_inches="tight")
+    finally:
+        fig.clear()
+    return buf.getvalue()
+
+
+def render_weak_skills(data, style):
+    fig = _new_figure(style)
+    ax = fig.subplots()
+    ax.barh(data["skills"], data["counts"], color=WEAK_SKILL_COLORS[:len(data["skills"])])
+    ax.set_xlabel('오답 횟수')
+    return _to_bytes(fig, style)
+
+
+def render_heatmap(data, style):
+    import numpy as np
+
+    fig = _new_figure(style)
+    ax = fig.subplots()
+    # None (기간 밖의 칸) 은 NaN 으로 비워 둠
+    matrix = np.array(data["matrix"], dtype=float)
+    im = ax.imshow(matrix, cmap='YlOrRd', aspect='auto')
+
+    ax.set_xticks(range(matrix.shape[1]))
+    ax.set_xticklabels(data["xlabels"])
+    ax.set_yticks(range(matrix.shape[0]))
+    ax.set_yticklabels(data["ylabels"])
+
+    # 값 표시
+    for i in range(matrix.shape[0]):
+        for j in range(matrix.shape[1]):
+            if not np.isnan(matrix[i, j]):
+                ax.text(j, i, int(matrix[i, j]), ha="center", va="center", color="black")
+
+    fig.colorbar(im, ax=ax)
+    return _to_bytes(fig, style)
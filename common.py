@@ -0,0 +1,267 @@
+import functools
+import uuid
+
+import streamlit as st
+
+from api_cache import ResponseCache
+from api_client import ApiClient, ApiResult
+from instrumentation import METRICS, start_metrics_server, timed
+from local_store import DEFAULT_DB_PATH, LocalStore, SyncWorker
+from note_replica import NoteReplica
+from page_loader import PageLoader
+
+
+# 설정값 (secrets.toml)
+def get_setting(name, default=None):
+    return st.secrets.get(name, default)
+
+# 세션 상태 초기화
+def init_session_state():
+    if 'current_session' not in st.session_state:
+        st.session_state.current_session = None
+    if 'current_question_idx' not in st.session_state:
+        st.session_state.current_question_idx = 0
+    if 'show_results' not in st.session_state:
+        st.session_state.show_results = False
+    if 'skill_tags' not in st.session_state:
+        st.session_state.skill_tags = []
+    if 'client_id' not in st.session_state:
+        # 브라우저 탭마다 하나 (로컬 답안 키). URL 에 남겨 같은 탭은 새로고침해도 이어서 씀
+        client_id = st.query_params.get("sid") or uuid.uuid4().hex
+        st.query_params["sid"] = client_id
+        st.session_state.client_id = client_id
+
+# API 클라이언트 (백엔드 URL 당 하나, 커넥션 풀 공유)
+@st.cache_resource
+def _api_client(base_url):
+    return ApiClient(base_url, observers=[METRICS.observe_request])
+
+def get_api_client():
+    return _api_client(get_setting("API_BASE_URL", "YOUR_APPS_SCRIPT_URL"))
+
+# GET 응답 캐시 (백엔드 URL 당 하나, 쓰기 요청 시 관련 항목 무효화)
+@st.cache_resource
+def _response_cache(base_url):
+    return ResponseCache()
+
+def get_response_cache():
+    return _response_cache(get_setting("API_BASE_URL", "YOUR_APPS_SCRIPT_URL"))
+
+# API 호출 함수들
+def api_get(endpoint):
+    # 이번 실행에서 load_page 가 이미 실패/마감 초과로 처리한 요청은 다시 보내지 않음
+    load = st.session_state.get('page_load')
+    if load is not None and (endpoint in load.late or endpoint in load.failed):
+        return None
+    # 다른 세션이 시작한 같은 요청이 진행 중이면 새로 요청하지 않고 함께 기다림
+    pending = get_page_loader().inflight(endpoint)
+    if pending is not None:
+        return pending.result()
+    cache = get_response_cache()
+    hits = cache.hits
+    data = cache.get_or_fetch(endpoint, lambda: _fetch(endpoint))
+    METRICS.observe_cache(endpoint, cache.hits > hits)
+    return data
+
+# 일일 배치(daily_batch.py)가 미리 계산해 둔 응답이 있으면 백엔드를 호출하지 않음
+# 설정/공유 객체는 스크립트 스레드에서 정해 두어, 반환한 함수는 다른 스레드에서도 실행할 수 있다
+def _fetcher(endpoint):
+    base_url = get_setting("API_BASE_URL", "YOUR_APPS_SCRIPT_URL")
+    store, _ = get_local_store()
+    client = get_api_client()
+    # 오답 노트는 로컬 복제본에 변경분만 받아 반영 (DELTA_SYNC = false 이면 매번 전체 목록)
+    replica = get_note_replica() if endpoint == "/wrongnotes" and get_setting("DELTA_SYNC", True) else None
+
+    def fetch():
+        warm = store.get_warm(base_url, endpoint)
+        if warm is not None:
+            return ApiResult(data=warm)
+        if replica is not None:
+            return replica.sync(client)
+        return client.get(endpoint)
+    return fetch
+
+def _fetch(endpoint):
+    return _fetcher(endpoint)()
+
+# 페이지 데이터 동시 로드 (백엔드 URL 당 하나, 진행 중인 요청은 세션 간 공유)
+@st.cache_resource
+def _page_loader(base_url):
+    return PageLoader()
+
+def get_page_loader():
+    return _page_loader(get_setting("API_BASE_URL", "YOUR_APPS_SCRIPT_URL"))
+
+def load_page(endpoints):
+    """페이지가 선언한 GET 들을 동시에 받아 응답 캐시에 넣음 (이후 api_get 은 캐시에서 읽음)
+
+    PAGE_DEADLINE(초) 안에 오지 않은 요청은 late 로 돌려주고 백그라운드에서 계속 받는다.
+    실패하거나 늦은 요청은 이번 실행 동안 api_get 이 다시 보내지 않고 None 을 돌려준다.
+    캐시하지 않는 endpoint 는 미리 받아도 쓸 곳이 없으므로 건너뛴다.
+    PARALLEL_LOAD = false 이면 아무것도 하지 않음 (각 섹션이 차례로 요청)
+    """
+    if not get_setting("PARALLEL_LOAD", True):
+        endpoints = ()
+    cache, loader = get_response_cache(), get_page_loader()
+    rerun = METRICS.current
+    # watch_late 가 실패로 끝났다고 알린 요청은 이 실행에서 다시 보내지 않음
+    settled_failed = st.session_state.pop('late_failed', ())
+    tasks = {}
+    for endpoint in dict.fromkeys(endpoints):
+        if (endpoint in settled_failed or cache.ttl_for(endpoint) is None
+                or cache.get(endpoint) is not None):
+            continue
+        fetch = _fetcher(endpoint)
+
+        def task(endpoint=endpoint, fetch=fetch):
+            with METRICS.attach(rerun):
+                METRICS.observe_cache(endpoint, False)
+                return cache.get_or_fetch(endpoint, fetch)
+        tasks[endpoint] = task
+    load = loader.load(tasks, deadline=float(get_setting("PAGE_DEADLINE", 5.0)))
+    load.failed.extend(e for e in dict.fromkeys(endpoints) if e in settled_failed)
+    # 이번 전체 실행 동안 api_get 이 참고 (toefl_app 이 실행 끝에 end_page_load 로 지움)
+    st.session_state.page_load = load
+    return load
+
+def end_page_load():
+    st.session_state.page_load = None
+
+def watch_late(load):
+    """늦은 데이터를 PAGE_LATE_POLL 초마다 확인해 모두 끝나면 페이지 전체를 다시 그림
+
+    스크립트 스레드를 막지 않도록 run_every fragment 로 확인한다. 0 이면 다시 그리지 않음.
+    다시 그린 실행에는 늦은 요청이 없으므로 watcher 도 그려지지 않아 확인이 멈춘다.
+    """
+    interval = float(get_setting("PAGE_LATE_POLL", 1.0))
+    if not (load.late and interval):
+        return
+
+    @st.fragment(run_every=interval)
+    def watcher():
+        arrived = PageLoader.settled(load)
+        if arrived is None:
+            return
+        # 실패한 요청은 다시 보내지 않고 사이드바에 실패로 표시
+        st.session_state.late_failed = [e for e in load.late if e not in arrived]
+        st.rerun()
+    watcher()
+
+def show_loading(*endpoints):
+    """마감까지 오지 않은 데이터가 있으면 빈 화면 대신 안내를 표시하고 True (도착하면 다시 그림)"""
+    load = st.session_state.get('page_load')
+    if load is None or not any(endpoint in load.late for endpoint in endpoints):
+        return False
+    st.info("⏳ 데이터를 불러오는 중입니다...")
+    return True
+
+def is_warm(endpoint):
+    store, _ = get_local_store()
+    return store.get_warm(get_setting("API_BASE_URL", "YOUR_APPS_SCRIPT_URL"), endpoint) is not None
+
+def api_post(endpoint, data):
+    result = get_api_client().post(endpoint, data)
+    # 실패(타임아웃 등)해도 서버에 반영됐을 수 있으므로 항상 무효화
+    invalidate_for_write(endpoint)
+    return result.data if result.ok else None
+
+# 쓰기 요청 후 관련 GET 응답 캐시와 미리 계산된 응답을 함께 무효화
+def _invalidate(cache, store, base_url, endpoint):
+    cache.invalidate_for_write(endpoint)
+    paths = cache.paths_for_write(endpoint)
+    if paths:
+        store.drop_warm(base_url, paths)
+
+def invalidate_for_write(endpoint):
+    base_url = get_setting("API_BASE_URL", "YOUR_APPS_SCRIPT_URL")
+    _invalidate(get_response_cache(), get_local_store()[0], base_url, endpoint)
+
+# 로컬 저장소 + write-behind 동기화 스레드 (DB 파일당 하나)
+@st.cache_resource
+def _local_store(path, base_url):
+    store = LocalStore(path)
+    cache = _response_cache(base_url)
+    worker = SyncWorker(store, _api_client(base_url),
+                        on_flushed=lambda endpoint: _invalidate(cache, store, base_url, endpoint))
+    worker.start()
+    return store, worker
+
+def get_local_store():
+    # 답안/오답노트를 먼저 커밋하는 로컬 SQLite 경로
+    return _local_store(get_setting("LOCAL_DB_PATH", DEFAULT_DB_PATH),
+                        get_setting("API_BASE_URL", "YOUR_APPS_SCRIPT_URL"))
+
+# /wrongnotes 로컬 복제본 (DB 파일/백엔드 URL 당 하나, 모든 세션이 공유)
+@st.cache_resource
+def _note_replica(path, base_url):
+    return NoteReplica(_local_store(path, base_url)[0], base_url)
+
+def get_note_replica():
+    return _note_replica(get_setting("LOCAL_DB_PATH", DEFAULT_DB_PATH),
+                         get_setting("API_BASE_URL", "YOUR_APPS_SCRIPT_URL"))
+
+# 월별 보관본 (ARCHIVE_DIR 당 하나, 열어 둔 파일을 모든 세션이 공유)
+@st.cache_resource
+def _archive(root, fmt):
+    from archive import Archive  # pyarrow 는 보관 기능을 켰을 때만 import
+    return Archive(root, fmt)
+
+def get_archive():
+    # ARCHIVE_DIR 이 없으면 None (보관 기능 꺼짐), ARCHIVE_FORMAT: arrow(기본) / parquet
+    root = get_setting("ARCHIVE_DIR")
+    if not root:
+        return None
+    return _archive(root, get_setting("ARCHIVE_FORMAT", "arrow"))
+
+# 로컬에 먼저 커밋하고 백그라운드에서 전송
+def queue_post(endpoint, data):
+    store, worker = get_local_store()
+    key = store.enqueue(endpoint, data)
+    worker.notify()
+    return key
+
+# 계측 설정 (METRICS_LOG: rerun 별 JSON lines 파일, METRICS_PORT: /metrics 서버 포트)
+@st.cache_resource
+def _metrics_server(port):
+    return start_metrics_server(port)
+
+def init_metrics():
+    METRICS.log_path = get_setting("METRICS_LOG")
+    port = get_setting("METRICS_PORT")
+    if port:
+        _metrics_server(int(port))
+    return METRICS
+
+# 위젯을 조작하면 이 함수 부분만 다시 실행 (st.fragment)
+# 인자는 처음 실행 때 값이 고정되므로 데이터는 함수 안에서 캐시/세션 상태로 읽는다.
+# FRAGMENTS = false 이면 매번 전체 스크립트를 다시 실행 (비교/디버깅용)
+def fragment(func):
+    name = f"{func.__module__}.{func.__name__}"
+
+    @functools.wraps(func)
+    def body():
+        if METRICS.current is not None:
+            with timed(f"fragment:{name}"):
+                return func()
+        # fragment 만 다시 실행될 때는 toefl_app 이 rerun 을 시작하지 않으므로 여기서 기록
+        rerun = METRICS.start_rerun(st.session_state.get('page'), fragment=name)
+        try:
+            with timed(f"fragment:{name}"):
+                return func()
+        finally:
+            METRICS.finish_rerun(rerun, st.session_state if METRICS.log_path else None)
+    isolated = st.fragment(body)
+
+    @functools.wraps(func)
+    def run():
+        if get_setting("FRAGMENTS", True):
+            return isolated()
+        return body()
+    return run
+
+# 스킬 태그 로드
+def load_skill_tags():
+    tags = api_get("/skill-tags")
+    if tags:
+        st.session_state.skill_tags = tags.get('tags', [])
+    return st.session_state.skill_tags
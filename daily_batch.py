@@ -0,0 +1,321 @@
+"""다음 날 복습 큐 일괄 계산 / 앱 캐시 워밍 / 알림 메일 발송 (cron 용, Streamlit 없이 실행)
+
+    python daily_batch.py --api-base-url http://127.0.0.1:8765 --outbox mail/
+    python daily_batch.py --users users.jsonl --workers 16 --smtp-host localhost --smtp-port 1025
+    python daily_batch.py --users users.jsonl --date 2026-10-18 --dry-run
+
+    # crontab: 매일 21:30 에 다음 날 큐 계산
+    30 21 * * * cd /srv/toefl && python daily_batch.py --users users.jsonl --outbox /var/mail/toefl
+
+users.jsonl 은 한 줄에 사용자 한 명: {"user": "kim", "api_base_url": "...", "db_path": "kim.db"}
+(db_path 는 그 사용자 앱의 LOCAL_DB_PATH, email 을 적으면 대시보드 설정보다 우선한다)
+모든 사용자의 /history 를 병렬로 받아 한 번에 스케줄링하고, 결과를 로컬 DB 의 warm_cache 에
+/due?date=... 응답으로 넣어 둔다. 앱은 그 날 첫 로드 때 스케줄 계산/백엔드 호출 없이 이 값을 읽는다.
+"""
+import argparse
+import json
+import os
+import re
+import smtplib
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from email.message import EmailMessage
+
+import scheduler
+from analytics import UNTAGGED
+from api_client import ApiClient
+from local_store import DEFAULT_DB_PATH, LocalStore
+
+WEEKDAYS_KO = "월화수목금토일"
+PREVIEW_QUESTIONS = 5
+
+
+@dataclass
+class BatchStats:
+    users: int = 0
+    fetched: int = 0
+    failed: int = 0
+    queued: int = 0         # 모든 사용자의 큐에 들어간 문항 수
+    warmed: int = 0
+    sent: int = 0
+    timings: dict = field(default_factory=dict)   # 단계 -> 초
+    errors: list = field(default_factory=list)    # (사용자, 메시지)
+
+
+def _as_date(value):
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value)[:10]).date()
+
+
+def load_users(path):
+    """users.jsonl -> [{user, api_base_url, db_path, ...}]"""
+    users, names = [], set()
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            entry = json.loads(line)
+            if not entry.get("api_base_url"):
+                raise ValueError(f"{path}:{line_no}: api_base_url 누락")
+            entry.setdefault("user", entry["api_base_url"])
+            entry.setdefault("db_path", DEFAULT_DB_PATH)
+            if entry["user"] in names:
+                raise ValueError(f"{path}:{line_no}: 중복된 사용자 {entry['user']}")
+            names.add(entry["user"])
+            users.append(entry)
+    return users
+
+
+class FileSender:
+    """메일을 .eml 파일로 저장 (SMTP 대역, 테스트/로컬 확인용)"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def send(self, message):
+        name = re.sub(r"[^\w.@-]", "_", f"{message['X-Digest-Date']}-{message['To']}")
+        with open(os.path.join(self.directory, f"{name}.eml"), "wb") as f:
+            f.write(bytes(message))
+
+    def close(self):
+        pass
+
+
+class SmtpSender:
+    """SMTP 서버로 발송 (연결 하나를 스레드 간에 공유, 끊기면 다시 연결)"""
+
+    def __init__(self, host, port=25, username=None, password=None, starttls=False, timeout=30):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self._smtp = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.starttls:
+            smtp.starttls()
+        if self.username:
+            smtp.login(self.username, self.password or "")
+        return smtp
+
+    def send(self, message):
+        with self._lock:
+            if self._smtp is None:
+                self._smtp = self._connect()
+            try:
+                self._smtp.send_message(message)
+            except smtplib.SMTPServerDisconnected:
+                self._smtp = self._connect()
+                self._smtp.send_message(message)
+
+    def close(self):
+        with self._lock:
+            if self._smtp is not None:
+                try:
+                    self._smtp.quit()
+                except smtplib.SMTPException:
+                    pass
+                self._smtp = None
+
+
+def render_digest(day, questions, backlog, settings, mail_from):
+    """사용자 한 명의 알림 메일. 알림 이메일이 없거나 할 일이 없으면 None
+
+    questions 는 큐 순서의 문항 dict (reviews, next_due 포함)
+    """
+    email = (settings.get("email") or "").strip()
+    if not email or not (questions or backlog):
+        return None
+    day = _as_date(day)
+    overdue = sum(1 for q in questions if q["next_due"] < day)
+    new = sum(1 for q in questions if not q["reviews"])
+    skills = Counter(q.get("skill") or UNTAGGED for q in questions)
+
+    lines = [f"{day.isoformat()} ({WEEKDAYS_KO[day.weekday()]}) 복습 안내", ""]
+    target = settings.get("daily_target")
+    lines.append(f"복습할 문항: {len(questions)}문항" + (f" (일일 목표 {target})" if target else ""))
+    lines.append(f"  - 밀린 복습: {overdue}")
+    lines.append(f"  - 새 문항: {new}")
+    if backlog:
+        lines.append(f"목표를 넘어 다음 날로 밀리는 문항: {backlog}")
+    if skills:
+        lines += ["", "유형별"]
+        lines += [f"  {skill}: {count}" for skill, count in skills.most_common()]
+    if questions:
+        lines += ["", "미리 보기"]
+        for i, q in enumerate(questions[:PREVIEW_QUESTIONS], 1):
+            text = " ".join(str(q.get("question_text") or "").split())
+            lines.append(f"  {i}. {text[:80]}{'…' if len(text) > 80 else ''}")
+
+    message = EmailMessage()
+    message["Subject"] = f"[TOEFL RC] {day.isoformat()} 복습 {len(questions)}문항"
+    message["From"] = mail_from
+    message["To"] = email
+    message["X-Digest-Date"] = day.isoformat()
+    message.set_content("\n".join(lines) + "\n")
+    return message
+
+
+class DailyBatch:
+    """/history 병렬 조회 -> scheduler.batch_due_queues 로 전체 스케줄링 -> 사용자별 캐시 워밍/메일 발송"""
+
+    def __init__(self, users, day, sender=None, workers=8, policy=None, warm=True,
+                 mail_from="toefl-review@localhost"):
+        self.users = users
+        self.day = _as_date(day)
+        self.sender = sender
+        self.workers = workers
+        self.policy = policy
+        self.warm = warm
+        self.mail_from = mail_from
+        self.stats = BatchStats(users=len(users))
+        self._clients = {}
+        self._stores = {}
+        self._lock = threading.Lock()
+
+    def _client(self, base_url):
+        with self._lock:
+            if base_url not in self._clients:
+                self._clients[base_url] = ApiClient(base_url, pool_size=self.workers)
+            return self._clients[base_url]
+
+    def _store(self, path):
+        with self._lock:
+            if path not in self._stores:
+                self._stores[path] = LocalStore(path)
+            return self._stores[path]
+
+    def _error(self, user, message):
+        with self._lock:
+            self.stats.failed += 1
+            self.stats.errors.append((user, message))
+
+    def run(self):
+        stats = self.stats
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            start = time.perf_counter()
+            histories = {}
+            for entry, result in zip(self.users, executor.map(self._fetch, self.users)):
+                if result.ok and isinstance(result.data, dict):
+                    histories[entry["user"]] = result.data
+                else:
+                    self._error(entry["user"], f"/history 조회 실패: {result.error} {result.message}")
+            stats.fetched = len(histories)
+            stats.timings["fetch"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            queue, backlog = scheduler.batch_due_queues(histories, self.day, self.policy)
+            stats.queued = len(queue)
+            stats.timings["schedule"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            rows = {user: group for user, group in queue.groupby("user", sort=False)}
+            jobs = [executor.submit(self._deliver, entry, histories[entry["user"]],
+                                    rows.get(entry["user"]), int(backlog[entry["user"]]))
+                    for entry in self.users if entry["user"] in histories]
+            for job in jobs:
+                job.result()
+            stats.timings["deliver"] = time.perf_counter() - start
+        return stats
+
+    def close(self):
+        for client in self._clients.values():
+            client.close()
+        for store in self._stores.values():
+            store.close()
+        if self.sender:
+            self.sender.close()
+
+    def _fetch(self, entry):
+        return self._client(entry["api_base_url"]).get("/history")
+
+    def _deliver(self, entry, history, rows, backlog):
+        user = entry["user"]
+        by_id = {q["question_id"]: q for q in history.get("questions", [])}
+        questions = []
+        if rows is not None:
+            for qid, reviews, next_due in zip(rows["question_id"], rows["reviews"], rows["next_due"]):
+                questions.append(dict(by_id[qid], reviews=int(reviews), next_due=next_due.date()))
+        try:
+            if self.warm:
+                # 앱의 load_due_questions 가 읽는 /due 응답 형태로 저장 (그 날이 끝나면 만료)
+                expires_at = datetime.combine(self.day + timedelta(days=1), datetime.min.time())
+                payload = {"questions": [{k: v for k, v in q.items() if k not in ("reviews", "next_due")}
+                                         for q in questions],
+                           "backlog": backlog}
+                self._store(entry["db_path"]).put_warm(
+                    entry["api_base_url"], f"/due?date={self.day.isoformat()}",
+                    payload, expires_at.timestamp())
+                with self._lock:
+                    self.stats.warmed += 1
+            settings = dict(history.get("settings") or {})
+            if entry.get("email"):
+                settings["email"] = entry["email"]
+            message = render_digest(self.day, questions, backlog, settings, self.mail_from)
+            if message is not None and self.sender is not None:
+                self.sender.send(message)
+                with self._lock:
+                    self.stats.sent += 1
+        except Exception as e:  # 한 사용자의 실패가 나머지 발송을 막지 않도록
+            self._error(user, f"{type(e).__name__}: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--users", help="사용자 목록 (JSON lines)")
+    source.add_argument("--api-base-url", help="사용자 한 명만 처리")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="--api-base-url 사용 시 워밍할 로컬 DB")
+    parser.add_argument("--date", default=(date.today() + timedelta(days=1)).isoformat(),
+                        help="큐를 계산할 날짜 (기본: 내일)")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--policy", choices=("ladder", "sm2"), default="ladder")
+    parser.add_argument("--outbox", help="메일을 .eml 파일로 저장할 디렉터리")
+    parser.add_argument("--smtp-host")
+    parser.add_argument("--smtp-port", type=int, default=25)
+    parser.add_argument("--smtp-user")
+    parser.add_argument("--starttls", action="store_true")
+    parser.add_argument("--mail-from", default="toefl-review@localhost")
+    parser.add_argument("--dry-run", action="store_true", help="계산만 하고 워밍/발송하지 않음")
+    args = parser.parse_args()
+
+    if args.users:
+        users = load_users(args.users)
+    else:
+        users = [{"user": args.api_base_url, "api_base_url": args.api_base_url, "db_path": args.db}]
+    sender = None
+    if not args.dry_run:
+        if args.smtp_host:
+            sender = SmtpSender(args.smtp_host, args.smtp_port, args.smtp_user,
+                                os.environ.get("SMTP_PASSWORD"), args.starttls)
+        elif args.outbox:
+            sender = FileSender(args.outbox)
+    policy = scheduler.SM2() if args.policy == "sm2" else scheduler.IntervalLadder()
+
+    batch = DailyBatch(users, args.date, sender, workers=args.workers, policy=policy,
+                       warm=not args.dry_run, mail_from=args.mail_from)
+    try:
+        stats = batch.run()
+    finally:
+        batch.close()
+    timings = " ".join(f"{name}={seconds:.2f}s" for name, seconds in stats.timings.items())
+    print(f"date={batch.day} users={stats.users} fetched={stats.fetched} failed={stats.failed} "
+          f"queued={stats.queued} warmed={stats.warmed} sent={stats.sent} {timings}", file=sys.stderr)
+    for user, message in stats.errors:
+        print(f"  {user}: {message}", file=sys.stderr)
+    sys.exit(1 if stats.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
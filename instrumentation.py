@@ -0,0 +1,260 @@
+import json
+import sys
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from api_client import endpoint_path
+
+# 지연 히스토그램 버킷 상한(초)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q):
+        # 버킷 상한으로 근사
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return BUCKETS[i] if i < len(BUCKETS) else float("inf")
+        return float("inf")
+
+
+class Rerun:
+    """스크립트 rerun 한 번 동안의 구간 시간/요청 기록 (fragment 만 다시 실행되면 fragment 이름)"""
+
+    def __init__(self, page, fragment=None):
+        self.page = page
+        self.fragment = fragment
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.duration = None
+        self.sections = []   # (name, seconds)
+        self.requests = []   # (method, endpoint, seconds, bytes, error)
+        self.cache_hits = 0
+        self.session_state_bytes = None
+
+    def to_dict(self):
+        return {
+            "ts": self.started_at,
+            "page": self.page,
+            "fragment": self.fragment,
+            "duration_s": self.duration,
+            "sections": [{"name": n, "seconds": s} for n, s in self.sections],
+            "requests": [{"method": m, "endpoint": e, "seconds": s, "bytes": b, "error": err}
+                         for m, e, s, b, err in self.requests],
+            "cache_hits": self.cache_hits,
+            "session_state_bytes": self.session_state_bytes,
+        }
+
+
+class Metrics:
+    """프로세스 전체 누적 지표 (엔드포인트별 지연 히스토그램, 요청 수, 페이로드 크기)"""
+
+    def __init__(self, history=200):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.request_latency = {}     # (method, endpoint) -> Histogram
+        self.request_total = Counter()  # (method, endpoint, status)
+        self.payload_bytes = Counter()  # (method, endpoint)
+        self.section_latency = {}     # name -> Histogram
+        self.rerun_latency = {}       # (page, fragment) -> Histogram
+        self.cache_total = Counter()  # (endpoint, "hit"|"miss")
+        self.reruns = deque(maxlen=history)
+        self.log_path = None
+
+    # 현재 스레드(스크립트 실행 스레드)의 rerun
+    @property
+    def current(self):
+        return getattr(self._local, "rerun", None)
+
+    def start_rerun(self, page, fragment=None):
+        self._local.rerun = Rerun(page, fragment)
+        return self._local.rerun
+
+    # 다른 스레드(동시 로드 작업)의 요청도 시작한 rerun 에 기록
+    @contextmanager
+    def attach(self, rerun):
+        previous = self.current
+        self._local.rerun = rerun
+        try:
+            yield rerun
+        finally:
+            self._local.rerun = previous
+
+    def finish_rerun(self, rerun, session_state=None):
+        rerun.duration = time.perf_counter() - rerun.start
+        if session_state is not None:
+            rerun.session_state_bytes = sum(deep_sizeof(session_state[k])
+                                            for k in list(session_state.keys()))
+        with self._lock:
+            self.rerun_latency.setdefault((rerun.page, rerun.fragment or ""),
+                                          Histogram()).observe(rerun.duration)
+            self.reruns.append(rerun)
+        self._local.rerun = None
+        if self.log_path:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(rerun.to_dict(), ensure_ascii=False) + "\n")
+
+    def observe_request(self, method, endpoint, result):
+        path = endpoint_path(endpoint)
+        with self._lock:
+            self.request_latency.setdefault((method, path), Histogram()).observe(result.elapsed)
+            self.request_total[(method, path, result.status or result.error)] += 1
+            self.payload_bytes[(method, path)] += result.size
+        rerun = self.current
+        if rerun is not None:
+            rerun.requests.append((method, path, result.elapsed, result.size, result.error))
+
+    def observe_cache(self, endpoint, hit):
+        with self._lock:
+            self.cache_total[(endpoint_path(endpoint), "hit" if hit else "miss")] += 1
+        rerun = self.current
+        if rerun is not None and hit:
+            rerun.cache_hits += 1
+
+    def observe_section(self, name, seconds):
+        with self._lock:
+            self.section_latency.setdefault(name, Histogram()).observe(seconds)
+        rerun = self.current
+        if rerun is not None:
+            rerun.sections.append((name, seconds))
+
+    def jsonl(self):
+        with self._lock:
+            reruns = list(self.reruns)
+        return "".join(json.dumps(r.to_dict(), ensure_ascii=False) + "\n" for r in reruns)
+
+    def prometheus_text(self):
+        lines = []
+        with self._lock:
+            _histogram_lines(lines, "toefl_api_request_seconds", "API 요청 지연",
+                             {f'method="{m}",endpoint="{e}"': h
+                              for (m, e), h in self.request_latency.items()})
+            _histogram_lines(lines, "toefl_section_seconds", "렌더링 구간 시간",
+                             {f'section="{n}"': h for n, h in self.section_latency.items()})
+            _histogram_lines(lines, "toefl_rerun_seconds", "스크립트 rerun 시간",
+                             {f'page="{p}",fragment="{f}"': h
+                              for (p, f), h in self.rerun_latency.items()})
+            lines.append("# HELP toefl_api_requests_total API 요청 수")
+            lines.append("# TYPE toefl_api_requests_total counter")
+            for (m, e, status), n in self.request_total.items():
+                lines.append(f'toefl_api_requests_total{{method="{m}",endpoint="{e}",status="{status}"}} {n}')
+            lines.append("# HELP toefl_api_payload_bytes_total 응답 본문 바이트")
+            lines.append("# TYPE toefl_api_payload_bytes_total counter")
+            for (m, e), n in self.payload_bytes.items():
+                lines.append(f'toefl_api_payload_bytes_total{{method="{m}",endpoint="{e}"}} {n}')
+            lines.append("# HELP toefl_cache_lookups_total GET 캐시 조회 수")
+            lines.append("# TYPE toefl_cache_lookups_total counter")
+            for (e, outcome), n in self.cache_total.items():
+                lines.append(f'toefl_cache_lookups_total{{endpoint="{e}",outcome="{outcome}"}} {n}')
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(lines, name, help_text, series):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, h in series.items():
+        cumulative = 0
+        for bound, n in zip(BUCKETS + (float("inf"),), h.counts):
+            cumulative += n
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {h.total}")
+        lines.append(f"{name}_count{{{labels}}} {h.count}")
+
+
+def deep_sizeof(obj, seen=None):
+    """객체가 참조하는 컨테이너/DataFrame 까지 포함한 대략적인 메모리 크기(바이트)"""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    # 프로세스 전체가 공유하는 자원(텍스트 저장소, 스레드 풀, 함수)은 세션 크기에서 제외
+    if (getattr(obj, "shared_resource", False) is True or callable(obj)
+            or isinstance(obj, (Executor, threading.Thread))):
+        return 0
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(deep_sizeof(v, seen) for v in obj)
+    elif hasattr(obj, "memory_usage") and callable(obj.memory_usage):
+        try:
+            usage = obj.memory_usage(deep=True)
+            size += int(usage.sum() if hasattr(usage, "sum") else usage)
+        except TypeError:
+            pass
+    elif hasattr(obj, "nbytes"):
+        size += int(obj.nbytes)
+    elif hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    elif hasattr(obj, "__slots__"):
+        size += sum(deep_sizeof(getattr(obj, s), seen) for s in obj.__slots__ if hasattr(obj, s))
+    return size
+
+
+# 프로세스 전체에서 공유하는 지표 저장소
+METRICS = Metrics()
+
+
+@contextmanager
+def timed(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        METRICS.observe_section(name, time.perf_counter() - start)
+
+
+def start_metrics_server(port, host="127.0.0.1", metrics=METRICS):
+    """Prometheus 수집용 /metrics (text) 와 /reruns (JSON lines) 를 제공하는 서버"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path == "/metrics":
+                body, content_type = metrics.prometheus_text(), "text/plain; version=0.0.4"
+            elif self.path == "/reruns":
+                body, content_type = metrics.jsonl(), "application/x-ndjson"
+            else:
+                self.send_response(404)
+                self.end_headers()
+                return
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,346 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+
+from api_client import ERROR_CONNECTION, ERROR_TIMEOUT, backend_error
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = "toefl_local.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    session_key TEXT NOT NULL,
+    question_id TEXT NOT NULL,
+    answer TEXT,
+    flagged INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (session_key, question_id)
+);
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    endpoint TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS outbox_next_attempt ON outbox (next_attempt_at);
+CREATE TABLE IF NOT EXISTS outbox_dead (
+    id INTEGER PRIMARY KEY,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    endpoint TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    attempts INTEGER NOT NULL,
+    last_error TEXT,
+    failed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS imported (
+    content_hash TEXT PRIMARY KEY,
+    imported_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS warm_cache (
+    base_url TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (base_url, endpoint)
+);
+CREATE TABLE IF NOT EXISTS note_replica (
+    base_url TEXT NOT NULL,
+    note_key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (base_url, note_key)
+);
+CREATE TABLE IF NOT EXISTS replica_cursor (
+    base_url TEXT PRIMARY KEY,
+    cursor INTEGER NOT NULL
+);
+"""
+
+
+class LocalStore:
+    """답안/플래그/오답노트를 먼저 로컬 SQLite(WAL)에 커밋하고, outbox 로 백엔드 전송을 대기"""
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # 진행 중인 답안
+    def save_answer(self, session_key, question_id, answer, flagged=False):
+        self._execute(
+            "INSERT INTO answers (session_key, question_id, answer, flagged, updated_at) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (session_key, question_id) DO UPDATE SET "
+            "answer = excluded.answer, flagged = excluded.flagged, updated_at = excluded.updated_at",
+            (session_key, str(question_id), answer, int(bool(flagged)), time.time()))
+
+    def load_answers(self, session_key):
+        rows = self._execute(
+            "SELECT question_id, answer, flagged FROM answers WHERE session_key = ?",
+            (session_key,))
+        return {row["question_id"]: {"answer": row["answer"], "flagged": bool(row["flagged"])}
+                for row in rows}
+
+    def clear_answers(self, session_key):
+        self._execute("DELETE FROM answers WHERE session_key = ?", (session_key,))
+
+    # 전송 대기열
+    def enqueue(self, endpoint, payload, idempotency_key=None):
+        idempotency_key = idempotency_key or uuid.uuid4().hex
+        self._execute(
+            "INSERT OR IGNORE INTO outbox (idempotency_key, endpoint, payload, created_at) "
+            "VALUES (?, ?, ?, ?)",
+            (idempotency_key, endpoint, json.dumps(payload, ensure_ascii=False), time.time()))
+        return idempotency_key
+
+    def pending(self, limit=100, now=None):
+        now = time.time() if now is None else now
+        rows = self._execute(
+            "SELECT id, idempotency_key, endpoint, payload, attempts FROM outbox "
+            "WHERE next_attempt_at <= ? ORDER BY id LIMIT ?", (now, limit))
+        return [dict(row, payload=json.loads(row["payload"])) for row in rows]
+
+    def pending_count(self):
+        return self._execute("SELECT COUNT(*) FROM outbox")[0][0]
+
+    def mark_sent(self, ids):
+        with self._lock:
+            self._conn.executemany("DELETE FROM outbox WHERE id = ?", [(i,) for i in ids])
+
+    def mark_failed(self, ids, error, delay):
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE outbox SET attempts = attempts + 1, last_error = ?, next_attempt_at = ? "
+                "WHERE id = ?", [(error, time.time() + delay, i) for i in ids])
+
+    # 재시도 한도를 넘긴 전송 (outbox_dead 로 옮겨 더 이상 보내지 않음)
+    def mark_dead(self, ids, error):
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO outbox_dead (id, idempotency_key, endpoint, payload, "
+                    "created_at, attempts, last_error, failed_at) "
+                    "SELECT id, idempotency_key, endpoint, payload, created_at, attempts + 1, ?, ? "
+                    "FROM outbox WHERE id = ?", [(error, now, i) for i in ids])
+                self._conn.executemany("DELETE FROM outbox WHERE id = ?", [(i,) for i in ids])
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def dead_count(self):
+        return self._execute("SELECT COUNT(*) FROM outbox_dead")[0][0]
+
+    def dead_letters(self, limit=100):
+        rows = self._execute(
+            "SELECT id, idempotency_key, endpoint, payload, attempts, last_error, failed_at "
+            "FROM outbox_dead ORDER BY id LIMIT ?", (limit,))
+        return [dict(row, payload=json.loads(row["payload"])) for row in rows]
+
+    def requeue_dead(self):
+        """실패 처리된 전송을 모두 outbox 로 되돌림 (시도 횟수 초기화)"""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                count = self._conn.execute(
+                    "INSERT OR IGNORE INTO outbox (id, idempotency_key, endpoint, payload, created_at) "
+                    "SELECT id, idempotency_key, endpoint, payload, created_at FROM outbox_dead").rowcount
+                self._conn.execute("DELETE FROM outbox_dead")
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return count
+
+    # 대량 가져오기로 올린 노트 (내용 해시, 이어 올리기용)
+    def imported_hashes(self):
+        return {row[0] for row in self._execute("SELECT content_hash FROM imported")}
+
+    def mark_imported(self, hashes):
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO imported (content_hash, imported_at) VALUES (?, ?)",
+                [(h, now) for h in hashes])
+
+    # 일일 배치(daily_batch.py)가 미리 계산해 둔 GET 응답
+    def put_warm(self, base_url, endpoint, payload, expires_at):
+        self._execute(
+            "INSERT OR REPLACE INTO warm_cache (base_url, endpoint, payload, created_at, expires_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (base_url, endpoint, json.dumps(payload, ensure_ascii=False), time.time(), expires_at))
+
+    def get_warm(self, base_url, endpoint, now=None):
+        now = time.time() if now is None else now
+        rows = self._execute(
+            "SELECT payload FROM warm_cache WHERE base_url = ? AND endpoint = ? AND expires_at > ?",
+            (base_url, endpoint, now))
+        return json.loads(rows[0]["payload"]) if rows else None
+
+    def drop_warm(self, base_url, paths):
+        # paths 는 쿼리 문자열을 뺀 경로 ("/due" 이면 "/due?date=..." 모두 삭제)
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM warm_cache WHERE base_url = ? AND (endpoint = ? OR endpoint LIKE ?)",
+                [(base_url, path, f"{path}?%") for path in paths])
+            self._conn.execute("DELETE FROM warm_cache WHERE expires_at <= ?", (time.time(),))
+
+    # /wrongnotes 로컬 복제본 (행 순서 = 처음 받은 순서)
+    def load_replica(self, base_url):
+        rows = self._execute("SELECT cursor FROM replica_cursor WHERE base_url = ?", (base_url,))
+        if not rows:
+            return None, []
+        notes = self._execute(
+            "SELECT payload FROM note_replica WHERE base_url = ? ORDER BY rowid", (base_url,))
+        return rows[0]["cursor"], [json.loads(row["payload"]) for row in notes]
+
+    def apply_replica(self, base_url, cursor, upserts=(), deletes=(), reset=False):
+        # 한 트랜잭션으로 반영 (중간에 끊겨도 cursor 와 노트가 어긋나지 않게)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                if reset:
+                    self._conn.execute("DELETE FROM note_replica WHERE base_url = ?", (base_url,))
+                self._conn.executemany(
+                    "INSERT INTO note_replica (base_url, note_key, payload) VALUES (?, ?, ?) "
+                    "ON CONFLICT (base_url, note_key) DO UPDATE SET payload = excluded.payload",
+                    [(base_url, str(key), json.dumps(note, ensure_ascii=False))
+                     for key, note in upserts])
+                self._conn.executemany(
+                    "DELETE FROM note_replica WHERE base_url = ? AND note_key = ?",
+                    [(base_url, str(key)) for key in deletes])
+                self._conn.execute(
+                    "INSERT INTO replica_cursor (base_url, cursor) VALUES (?, ?) "
+                    "ON CONFLICT (base_url) DO UPDATE SET cursor = excluded.cursor",
+                    (base_url, cursor))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def with_idempotency_key(payload, key):
+    # Apps Script 는 요청 헤더를 읽을 수 없으므로 키를 본문 레코드마다 넣는다
+    if isinstance(payload, list):
+        return [dict(item, idempotency_key=f"{key}:{i}") for i, item in enumerate(payload)]
+    return dict(payload, idempotency_key=key)
+
+
+class SyncWorker(threading.Thread):
+    """outbox 를 주기적으로 백엔드에 flush 하는 write-behind 스레드
+
+    실패한 행은 행마다 자기 시도 횟수로 backoff 하고, max_attempts 번 실패하면 outbox_dead 로 옮긴다.
+    /submit 묶음을 백엔드가 거부하면 한 건 때문일 수 있으므로 행을 하나씩 다시 보낸다.
+    """
+
+    def __init__(self, store, client, batch_size=50, interval=2.0, base_delay=2.0,
+                 max_delay=300.0, max_attempts=10, on_flushed=None):
+        super().__init__(name="toefl-sync", daemon=True)
+        self.store = store
+        self.client = client
+        self.batch_size = batch_size
+        self.interval = interval
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self.on_flushed = on_flushed
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+
+    def notify(self):
+        self._wakeup.set()
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+
+    def run(self):
+        while not self._stopped.is_set():
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("outbox flush failed")
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+
+    def flush(self):
+        rows = self.store.pending(self.batch_size)
+        if not rows:
+            return 0
+        sent = 0
+        # /submit 은 리스트 본문이므로 여러 건을 한 번의 POST 로 묶는다
+        submit_rows = [r for r in rows if r["endpoint"] == "/submit"]
+        if submit_rows:
+            result = self.client.post("/submit", _submit_records(submit_rows))
+            if self._sent("/submit", submit_rows, result):
+                sent += len(submit_rows)
+            elif len(submit_rows) > 1 and result.error not in (ERROR_TIMEOUT, ERROR_CONNECTION):
+                # 백엔드가 응답하고 거부했으면 문제 행만 남도록 한 건씩 다시 보냄
+                for row in submit_rows:
+                    sent += self._send("/submit", _submit_records([row]), [row])
+            else:
+                self._failed(submit_rows, result)
+        for row in rows:
+            if row["endpoint"] != "/submit":
+                payload = with_idempotency_key(row["payload"], row["idempotency_key"])
+                sent += self._send(row["endpoint"], payload, [row])
+        return sent
+
+    def _send(self, endpoint, payload, rows):
+        result = self.client.post(endpoint, payload)
+        if self._sent(endpoint, rows, result):
+            return len(rows)
+        self._failed(rows, result)
+        return 0
+
+    def _sent(self, endpoint, rows, result):
+        # Apps Script 는 실패도 200 + {"success": false} 로 응답
+        if not result.ok or backend_error(result) is not None:
+            return False
+        self.store.mark_sent([r["id"] for r in rows])
+        if self.on_flushed:
+            self.on_flushed(endpoint)
+        return True
+
+    def _failed(self, rows, result):
+        error = f"{result.error}: {result.message}" if result.error else backend_error(result)
+        dead = [r["id"] for r in rows if r["attempts"] + 1 >= self.max_attempts]
+        if dead:
+            logger.warning("giving up on %d outbox rows after %d attempts: %s",
+                           len(dead), self.max_attempts, error)
+            self.store.mark_dead(dead, error)
+        for row in rows:
+            if row["attempts"] + 1 < self.max_attempts:
+                delay = min(self.max_delay, self.base_delay * 2 ** row["attempts"])
+                self.store.mark_failed([row["id"]], error, delay)
+
+
+def _submit_records(rows):
+    # 각 행의 /submit 레코드를 하나의 리스트 본문으로 (레코드마다 행의 idempotency key)
+    records = []
+    for row in rows:
+        records.extend(with_idempotency_key(row["payload"], row["idempotency_key"]))
+    return records
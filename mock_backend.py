@@ -0,0 +1,434 @@
+"""Apps Script 백엔드 대역 서버 (성능 테스트/오프라인 개발용)
+
+    python mock_backend.py --port 8765 --notes 5000 --latency 0.3 --fail-rate 0.05
+    python mock_backend.py --latency 0.5 --slow /history=4
+
+secrets.toml 의 API_BASE_URL 을 http://127.0.0.1:8765 로 바꾸면 앱이 이 서버를 사용한다.
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from bisect import bisect_right
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+SKILLS = ["Vocabulary", "Inference", "Detail", "Negative Factual", "Rhetorical Purpose",
+          "Reference", "Sentence Simplification", "Insert Text", "Prose Summary", "Organization"]
+WORDS = ("glacier river climate species migration colony pottery volcano desert fossil "
+         "agriculture trade empire settlement erosion sediment photosynthesis predator "
+         "the a of and in to was were by with from during because however therefore").split()
+OPTION_LABELS = ["A", "B", "C", "D"]
+
+
+@dataclass
+class MockConfig:
+    notes: int = 200
+    questions: int = 300
+    questions_per_passage: int = 10
+    reviews: int = 2000
+    latency: float = 0.0          # 요청당 평균 지연(초)
+    jitter: float = 0.0           # 지연 편차(초)
+    fail_rate: float = 0.0        # 500 응답 비율
+    slow_paths: dict = field(default_factory=dict)  # 경로 -> 추가 지연(초), 예: {"/history": 3}
+    lite_due: bool = False        # True 면 /due 에 지문/해설을 빼고 보냄
+    apps_script: bool = False     # True 면 Apps Script 처럼 알 수 없는 요청도 200 + {"success": false}
+    unsupported: tuple = ()       # 지원하지 않는 경로 (이전 버전 백엔드), 예: ("/wrongnote/batch",)
+    seed: int = 0
+
+
+def _sentence(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+
+class MockState:
+    """합성 데이터셋과 쓰기 요청을 반영하는 메모리 상태"""
+
+    def __init__(self, config):
+        rng = random.Random(config.seed)
+        self.lock = threading.Lock()
+        self.lite_due = config.lite_due
+        self.settings = {"rest_day": None, "daily_target": 10, "email": ""}
+        self.tags = [{"tag_id": i + 1, "name": name} for i, name in enumerate(SKILLS)]
+        self.next_tag_id = len(self.tags) + 1
+        self.seen_keys = set()
+        self.stats = Counter()
+        # 노트 변경 버전 (델타 동기화용): 노트/삭제 기록마다 마지막으로 바뀐 버전
+        self.version = 0
+        self.note_versions = {}
+        self.tombstones = {}
+        self.compacted = 0          # 이 버전 이하의 삭제 기록은 정리됨
+
+        n_passages = max(1, config.questions // config.questions_per_passage)
+        self.passages = {
+            p: {"passage_id": p, "passage_title": f"Passage {p}",
+                "passage_text": " ".join(_sentence(rng, 20) for _ in range(30))}
+            for p in range(n_passages)
+        }
+        self.questions = {}
+        for q in range(config.questions):
+            self.questions[q] = {
+                "question_id": q,
+                "passage_id": q % n_passages,
+                "question_text": _sentence(rng, 15),
+                "options": json.dumps([f"{label}. {_sentence(rng, 6)}" for label in OPTION_LABELS]),
+                "answer": None,
+                "explanation": " ".join(_sentence(rng, 12) for _ in range(3)),
+                "skill": rng.choice(SKILLS),
+            }
+            self.questions[q]["answer"] = json.loads(self.questions[q]["options"])[rng.randrange(4)]
+
+        today = date.today()
+        self.reviews = [
+            {"question_id": rng.randrange(config.questions),
+             "reviewed_at": (today - timedelta(days=rng.randrange(60))).isoformat(),
+             "correct": rng.random() < 0.7}
+            for _ in range(config.reviews)
+        ]
+
+        self.notes = {}
+        self.next_note_id = 1
+        for _ in range(config.notes):
+            q = self.questions[rng.randrange(config.questions)]
+            self._add_note({
+                "passage_text": self.passages[q["passage_id"]]["passage_text"],
+                "question_text": q["question_text"],
+                "options": json.loads(q["options"]),
+                "correct_answer": q["answer"],
+                "user_answer": rng.choice(json.loads(q["options"])),
+                "explanation": q["explanation"],
+                "why_wrong": _sentence(rng, 8),
+                "skill_tags": rng.sample(SKILLS, rng.randint(1, 3)),
+            }, date_added=(today - timedelta(days=rng.randrange(365))).isoformat(),
+               wrong_count=rng.randint(1, 5))
+
+    def _add_note(self, data, date_added=None, wrong_count=1):
+        note = dict(data, note_id=self.next_note_id,
+                    date_added=date_added or date.today().isoformat(), wrong_count=wrong_count)
+        note.pop("idempotency_key", None)
+        self.notes[note["note_id"]] = note
+        self._touch(note["note_id"])
+        self.next_note_id += 1
+        return note
+
+    def _touch(self, note_id, deleted=False):
+        self.version += 1
+        if deleted:
+            self.note_versions.pop(note_id, None)
+            self.tombstones[note_id] = self.version
+        else:
+            self.tombstones.pop(note_id, None)
+            self.note_versions[note_id] = self.version
+
+    def note_changes(self, since, limit, after=None):
+        """델타 동기화: since 이후 바뀐 노트/삭제된 note_id 를 버전 순으로 limit 건까지
+
+        since=0 이면 현재 노트 전체를 note_id 순으로 나눠 보낸다 (after: 이전 페이지의 마지막 note_id).
+        이때 cursor 는 요청 시점의 버전이며, 클라이언트는 첫 페이지의 cursor 부터 이어 받는다.
+        """
+        if since <= 0:
+            ids = sorted(self.notes)
+            start = 0 if after is None else bisect_right(ids, after)
+            page = ids[start:start + limit]
+            return {"notes": [self.notes[i] for i in page], "deleted": [], "cursor": self.version,
+                    "has_more": start + limit < len(ids), "after": page[-1] if page else after}
+        if since < self.compacted:
+            # 정리된 삭제 기록이 필요한 오래된 cursor -> 처음부터 다시 받게 함
+            return {"reset": True, "notes": [], "deleted": [], "cursor": 0, "has_more": True}
+        changes = sorted([(v, i, False) for i, v in self.note_versions.items() if v > since] +
+                         [(v, i, True) for i, v in self.tombstones.items() if v > since])
+        page = changes[:limit]
+        return {"notes": [self.notes[i] for _, i, deleted in page if not deleted],
+                "deleted": [i for _, i, deleted in page if deleted],
+                "cursor": page[-1][0] if page else since,
+                "has_more": len(changes) > limit}
+
+    def compact_tombstones(self):
+        self.tombstones.clear()
+        self.compacted = self.version
+
+    def _first_time(self, key):
+        # 같은 idempotency_key 로 다시 온 요청은 한 번만 반영
+        if key is None:
+            return True
+        if key in self.seen_keys:
+            return False
+        self.seen_keys.add(key)
+        return True
+
+    def due_question(self, q, lite):
+        item = {k: v for k, v in self.questions[q].items() if k != "skill"}
+        if lite:
+            item.pop("explanation")
+        else:
+            item.update(self.passages[item["passage_id"]])
+        return item
+
+    # GET
+    def get(self, path, query):
+        if path == "/dashboard":
+            return self.dashboard()
+        if path == "/due":
+            return {"questions": self.due(query.get("date"), self.lite_due)[0]}
+        if path == "/history":
+            return {"reviews": self.reviews,
+                    "questions": [dict(self.due_question(q, False), skill=self.questions[q]["skill"])
+                                  for q in self.questions],
+                    "settings": self.settings}
+        if path == "/passage":
+            return self.passages.get(int(query.get("passage_id", -1)))
+        if path == "/explanation":
+            q = self.questions.get(int(query.get("question_id", -1)))
+            return {"explanation": q["explanation"]} if q else None
+        if path == "/wrongnotes":
+            if "since" in query:
+                after = int(query["after"]) if "after" in query else None
+                return self.note_changes(int(query["since"]), int(query.get("limit", 1000)), after)
+            return {"notes": list(self.notes.values()), "cursor": self.version}
+        if path == "/skill-tags":
+            return {"tags": self.tags}
+        return None
+
+    def due(self, day, lite):
+        import scheduler
+        payload = {"reviews": self.reviews, "settings": self.settings,
+                   "questions": [{"question_id": q} for q in self.questions]}
+        due, backlog = scheduler.due_questions(payload, day or date.today().isoformat())
+        return [self.due_question(q["question_id"], lite) for q in due], backlog
+
+    def dashboard(self):
+        today = date.today()
+        days = Counter(r["reviewed_at"] for r in self.reviews)
+        heatmap = [{"date": (today - timedelta(days=13 - i)).isoformat(),
+                    "count": days.get((today - timedelta(days=13 - i)).isoformat(), 0)}
+                   for i in range(14)]
+        streak = 0
+        while days.get((today - timedelta(days=streak)).isoformat()):
+            streak += 1
+        wrong = Counter(tag for note in self.notes.values() for tag in note["skill_tags"])
+        due, backlog = self.due(today.isoformat(), True)
+        return dict(self.settings,
+                    rest_day=self.settings["rest_day"] or "없음",
+                    due_today=len(due),
+                    total_days=len(days),
+                    streak_days=streak,
+                    backlog=backlog,
+                    weak_skills=[{"skill": s, "wrong_count": c} for s, c in wrong.most_common(3)],
+                    heatmap=heatmap)
+
+    # POST
+    def post(self, path, data):
+        if path == "/submit":
+            today = date.today().isoformat()
+            for record in data:
+                if not self._first_time(record.get("idempotency_key")):
+                    continue
+                self.reviews.append({"question_id": record["question_id"], "reviewed_at": today,
+                                     "correct": bool(record.get("correct"))})
+                if record.get("add_to_wrongnote"):
+                    q = self.questions.get(record["question_id"], {})
+                    self._add_note({
+                        "passage_text": self.passages.get(q.get("passage_id"), {}).get("passage_text", ""),
+                        "question_text": q.get("question_text", ""),
+                        "options": json.loads(q.get("options", "[]")),
+                        "correct_answer": q.get("answer"),
+                        "user_answer": record.get("user_answer"),
+                        "explanation": q.get("explanation", ""),
+                        "why_wrong": record.get("memo", ""),
+                        "skill_tags": record.get("skill_tags", []),
+                    })
+            return {"success": True}
+        if path == "/wrongnote":
+            if self._first_time(data.get("idempotency_key")):
+                return {"success": True, "note_id": self._add_note(data)["note_id"]}
+            return {"success": True}
+        if path == "/wrongnote/batch":
+            note_ids = [self._add_note(note)["note_id"]
+                        for note in data.get("notes", [])
+                        if self._first_time(note.get("idempotency_key"))]
+            return {"success": True, "note_ids": note_ids}
+        if path == "/wrongnote/delete":
+            if self.notes.pop(data.get("note_id"), None) is not None:
+                self._touch(data.get("note_id"), deleted=True)
+            return {"success": True}
+        if path == "/skill-tags":
+            return self.update_tags(data)
+        if path == "/skill-tags/batch":
+            return self.batch_update_tags(data)
+        if path == "/settings":
+            self.settings.update({k: data.get(k) for k in ("rest_day", "daily_target", "email")})
+            return {"success": True}
+        return None
+
+    def update_tags(self, data):
+        action = data.get("action")
+        if action == "create":
+            self.tags.append({"tag_id": self.next_tag_id, "name": data["name"]})
+            self.next_tag_id += 1
+        elif action == "update":
+            for tag in self.tags:
+                if tag["tag_id"] == data["tag_id"]:
+                    tag["name"] = data["name"]
+        elif action == "delete":
+            self.tags = [t for t in self.tags if t["tag_id"] != data["tag_id"]]
+        else:
+            return None
+        return {"success": True}
+
+    def batch_update_tags(self, data):
+        # 태그 목록과 모든 노트의 skill_tags 를 한 번에 갱신
+        from tag_editor import TagDiff
+        diff = TagDiff(data.get("mapping", {}), data.get("create", []))
+        tags = []
+        for tag in self.tags:
+            name = diff.mapping.get(tag["name"], tag["name"])
+            if name is not None and all(t["name"] != name for t in tags):
+                tags.append({"tag_id": tag["tag_id"], "name": name})
+        for name in diff.creates:
+            if all(t["name"] != name for t in tags):
+                tags.append({"tag_id": self.next_tag_id, "name": name})
+                self.next_tag_id += 1
+        updated = 0
+        for note in self.notes.values():
+            if any(tag in diff.mapping for tag in note.get("skill_tags") or ()):
+                note["skill_tags"] = diff.apply_to_note_tags(note["skill_tags"])
+                self._touch(note["note_id"])
+                updated += 1
+        self.tags = tags
+        return {"success": True, "tags": tags, "notes_updated": updated}
+
+
+def make_handler(state, config):
+    rng = random.Random(config.seed)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _delay_or_fail(self, path):
+            if config.latency or config.jitter:
+                time.sleep(max(0.0, rng.gauss(config.latency, config.jitter)))
+            if path in config.slow_paths:
+                time.sleep(config.slow_paths[path])
+            if config.fail_rate and rng.random() < config.fail_rate:
+                self._send(500, {"error": "injected failure"})
+                return True
+            return False
+
+        def _send(self, status, payload, etag=False):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            tag = f'"{hashlib.sha1(body).hexdigest()[:16]}"' if etag else None
+            if tag and tag == self.headers.get("If-None-Match"):
+                # 바뀌지 않았으면 본문 없이 304
+                with state.lock:
+                    state.stats["304"] += 1
+                self.send_response(304)
+                self.send_header("ETag", tag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            if tag:
+                self.send_header("ETag", tag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _route(self, method):
+            parts = urlsplit(self.path)
+            path = parts.path
+            query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+            if path == "/__stats":
+                with state.lock:
+                    return self._send(200, dict(state.stats))
+            if path == "/__reset":
+                with state.lock:
+                    state.stats.clear()
+                return self._send(200, {"success": True})
+            if path == "/__compact":
+                with state.lock:
+                    state.compact_tombstones()
+                return self._send(200, {"success": True})
+
+            with state.lock:
+                state.stats[f"{method} {path}"] += 1
+            if self._delay_or_fail(path):
+                return
+            data = None
+            if method == "POST":
+                length = int(self.headers.get("Content-Length", 0))
+                data = json.loads(self.rfile.read(length) or b"null")
+            with state.lock:
+                if path in config.unsupported:
+                    result = None
+                else:
+                    result = state.get(path, query) if method == "GET" else state.post(path, data)
+            if result is None:
+                if config.apps_script:
+                    return self._send(200, {"success": False, "error": f"Unknown action: {method} {path}"})
+                return self._send(404, {"error": f"unknown {method} {path}"})
+            self._send(200, result, etag=method == "GET")
+
+        def do_GET(self):
+            self._route("GET")
+
+        def do_POST(self):
+            self._route("POST")
+
+    return Handler
+
+
+def start_mock_server(config=None, host="127.0.0.1", port=0):
+    """백그라운드 스레드로 서버를 띄우고 (server, base_url) 반환"""
+    config = config or MockConfig()
+    state = MockState(config)
+    server = ThreadingHTTPServer((host, port), make_handler(state, config))
+    server.daemon_threads = True
+    server.state = state
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--notes", type=int, default=MockConfig.notes)
+    parser.add_argument("--questions", type=int, default=MockConfig.questions)
+    parser.add_argument("--reviews", type=int, default=MockConfig.reviews)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--slow", action="append", default=[], metavar="PATH=SECONDS",
+                        help="특정 경로에 지연 추가 (예: --slow /history=3)")
+    parser.add_argument("--lite-due", action="store_true")
+    parser.add_argument("--apps-script", action="store_true", help="알 수 없는 요청도 200 으로 응답")
+    parser.add_argument("--unsupported", action="append", default=[], metavar="PATH",
+                        help="지원하지 않는 경로 (예: --unsupported /wrongnote/batch)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = MockConfig(notes=args.notes, questions=args.questions, reviews=args.reviews,
+                        latency=args.latency, jitter=args.jitter, fail_rate=args.fail_rate,
+                        slow_paths={path: float(seconds) for path, seconds in
+                                    (item.rsplit("=", 1) for item in args.slow)},
+                        lite_due=args.lite_due, apps_script=args.apps_script,
+                        unsupported=tuple(args.unsupported), seed=args.seed)
+    server, url = start_mock_server(config, args.host, args.port)
+    print(f"mock backend listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
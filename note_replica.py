@@ -0,0 +1,116 @@
+import logging
+import threading
+import time
+
+from api_client import ApiResult
+from note_search import note_key
+
+logger = logging.getLogger(__name__)
+
+DELTA_ENDPOINT = "/wrongnotes?since={cursor}&limit={limit}"
+
+
+class NoteReplica:
+    """/wrongnotes 로컬 복제본 (cursor 이후 바뀐 노트와 삭제 기록만 받아 반영)
+
+    델타 응답: {notes, deleted, cursor, has_more, reset}. reset 이면 복제본을 비우고 처음부터 받는다.
+    처음 받을 때(since=0)는 note_id 순 페이지(after)로 전체를 받고, 첫 페이지의 cursor 부터 이어 받는다.
+    전체를 다 받기 전에는 cursor 를 -1 로 두어, 중간에 끊기면 다음 동기화 때 처음부터 다시 받는다.
+    cursor 가 없는 응답(델타를 모르는 구버전 백엔드)은 전체 목록으로 보고 통째로 바꾼다.
+    store(LocalStore) 를 주면 복제본과 cursor 를 저장해 재시작 후에도 이어서 받는다.
+    """
+
+    def __init__(self, store=None, base_url="", page_size=1000, max_pages=1000):
+        self.store = store
+        self.base_url = base_url
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.lock = threading.Lock()
+        self.cursor = None
+        self.notes = {}     # 노트 키 -> 노트 (처음 받은 순서 유지)
+        if store is not None:
+            self.cursor, notes = store.load_replica(base_url)
+            self.notes = {note_key(note, row): note for row, note in enumerate(notes)}
+        # 현재 목록. 바뀔 때만 새 객체로 바꾸므로 색인들은 `is` 로 변경 여부를 알 수 있다
+        self.snapshot = {"notes": list(self.notes.values())}
+
+    def __len__(self):
+        return len(self.notes)
+
+    @property
+    def complete(self):
+        return self.cursor is not None and self.cursor >= 0
+
+    def sync(self, client):
+        """변경분을 받아 반영하고 ApiResult(data=현재 목록) 반환
+
+        요청이 실패해도 다 받아 둔 복제본이 있으면 그 목록을 돌려준다.
+        """
+        start = time.perf_counter()
+        size = 0
+        with self.lock:
+            changed = False
+            after = None        # 전체 받기 중 이전 페이지의 마지막 note_id
+            snapshot_cursor = None
+            for _ in range(self.max_pages):
+                cursor = self.cursor if self.complete else 0
+                endpoint = DELTA_ENDPOINT.format(cursor=cursor, limit=self.page_size)
+                if after is not None:
+                    endpoint += f"&after={after}"
+                result = client.get(endpoint, conditional=False)
+                size += result.size
+                if not result.ok or not isinstance(result.data, dict):
+                    if not self.complete:
+                        if changed:
+                            self.snapshot = {"notes": list(self.notes.values())}
+                        return result
+                    logger.warning("note delta sync failed (%s), serving local replica", result.error)
+                    break
+                data = result.data
+                if "cursor" not in data:
+                    self._replace(data.get("notes", []))
+                    changed = True
+                    break
+                if data.get("reset"):
+                    self.cursor = -1
+                    after = None
+                    continue
+                if not self.complete:
+                    # 전체 받기: 첫 페이지에서 복제본을 비우고, 마지막 페이지에서 cursor 확정
+                    first = after is None
+                    if first:
+                        snapshot_cursor = data["cursor"]
+                    done = not data.get("has_more")
+                    self._apply(data.get("notes", []), [], snapshot_cursor if done else -1, reset=first)
+                    changed = True
+                    if done:
+                        break
+                    after = data.get("after")
+                    continue
+                if data.get("notes") or data.get("deleted"):
+                    changed = True
+                self._apply(data.get("notes", []), data.get("deleted", []), data["cursor"])
+                if not data.get("has_more"):
+                    break
+            if changed:
+                self.snapshot = {"notes": list(self.notes.values())}
+            return ApiResult(data=self.snapshot, status=200, size=size,
+                             elapsed=time.perf_counter() - start)
+
+    def _apply(self, notes, deleted, cursor, reset=False):
+        if reset:
+            self.notes = {}
+        upserts = []
+        for note in notes:
+            key = note_key(note, len(self.notes))
+            self.notes[key] = note
+            upserts.append((key, note))
+        for key in deleted:
+            self.notes.pop(key, None)
+        self.cursor = cursor
+        if self.store is not None:
+            self.store.apply_replica(self.base_url, cursor, upserts, deleted, reset)
+
+    def _replace(self, notes):
+        # 구버전 백엔드: 매번 전체 목록 (저장하지 않고 cursor 도 두지 않음)
+        self.notes = {note_key(note, row): note for row, note in enumerate(notes)}
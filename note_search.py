@@ -0,0 +1,250 @@
+import math
+import re
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+
+# 검색 대상 필드
+SEARCH_FIELDS = ("question_text", "passage_text", "explanation", "why_wrong")
+# 필드 사이 위치 간격 (필드 경계를 넘는 구문 일치 방지)
+FIELD_GAP = 2
+# 접두어 검색 시 확장할 최대 용어 수
+MAX_PREFIX_TERMS = 64
+# 따옴표 없는 여러 토큰 단어가 연속으로 나온 노트에 더하는 점수 비율
+PHRASE_BONUS = 0.5
+
+_WORD = re.compile(r"[a-z0-9]+|[가-힣]+")
+_QUERY = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def tokenize(text):
+    """영문/숫자는 단어 단위, 한글은 어절을 글자 bigram 으로 분해 (조사가 붙어도 일치)"""
+    if not text:
+        return []
+    tokens = []
+    for word in _WORD.findall(unicodedata.normalize("NFKC", str(text)).lower()):
+        if len(word) > 1 and "가" <= word[0] <= "힣":
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+# 같은 지문을 공유하는 노트가 많으므로 필드 단위로 토큰화 결과를 재사용
+@lru_cache(maxsize=2048)
+def _field_tokens(text):
+    return tuple(tokenize(text))
+
+
+def note_key(note, row):
+    # note_id 가 없는 응답(구버전 백엔드)은 목록 순서로 식별
+    return note.get("note_id", row)
+
+
+def _fingerprint(note):
+    return hash(tuple(note.get(field) or "" for field in SEARCH_FIELDS))
+
+
+def parse_query(query):
+    """검색어 -> (용어, 접두어, 구문 필터, 구문 가산점) 절
+
+    "따옴표 구문" 은 반드시 포함, 끝이 * 인 단어는 접두어 검색.
+    여러 토큰으로 나뉘는 단어(한글 어절)는 토큰마다 OR 로 점수를 매기고 (조사가 달라도 일치),
+    토큰이 연속으로 나온 노트에는 가산점을 준다.
+    """
+    terms, prefixes, required, phrases = [], [], [], []
+    for quoted, word in _QUERY.findall(query or ""):
+        if quoted:
+            tokens = tokenize(quoted)
+            if tokens:
+                required.append(tokens)
+            continue
+        prefix = word.endswith("*")
+        tokens = tokenize(word.rstrip("*"))
+        if not tokens:
+            continue
+        if prefix:
+            terms.extend(tokens[:-1])
+            prefixes.append(tokens[-1])
+        else:
+            terms.extend(tokens)
+            if len(tokens) > 1:
+                phrases.append(tokens)
+    return terms, prefixes, required, phrases
+
+
+class NoteSearchIndex:
+    """오답 노트 전문 검색용 역색인 (BM25, 구문/접두어 검색)
+
+    노트 추가/삭제 시 해당 문서만 갱신하며 검색마다 다시 만들지 않는다.
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.lock = threading.Lock()
+        self.postings = {}      # term -> {doc_key: array 위치}
+        self.doc_lengths = {}   # doc_key -> 토큰 수
+        self.doc_terms = {}     # doc_key -> 문서의 용어 (삭제 시 해당 posting 만 수정)
+        self.fingerprints = {}  # doc_key -> 검색 필드 해시
+        self.total_length = 0
+        self.source = None
+        self._vocab = None      # 접두어 검색용 정렬된 용어 목록 (변경 시 다시 정렬)
+
+    def __len__(self):
+        return len(self.doc_lengths)
+
+    def add(self, key, note):
+        with self.lock:
+            self._add(key, note)
+
+    def _add(self, key, note):
+        self._remove(key)
+        positions = {}
+        pos = 0
+        for field in SEARCH_FIELDS:
+            for token in _field_tokens(note.get(field) or ""):
+                positions.setdefault(token, array("I")).append(pos)
+                pos += 1
+            pos += FIELD_GAP
+        for token, where in positions.items():
+            docs = self.postings.get(token)
+            if docs is None:
+                docs = self.postings[token] = {}
+                self._vocab = None
+            docs[key] = where
+        self.doc_terms[key] = tuple(positions)
+        length = pos - FIELD_GAP * len(SEARCH_FIELDS)
+        self.doc_lengths[key] = length
+        self.fingerprints[key] = _fingerprint(note)
+        self.total_length += length
+
+    def remove(self, key):
+        with self.lock:
+            self._remove(key)
+
+    def _remove(self, key):
+        terms = self.doc_terms.pop(key, None)
+        if terms is None:
+            return
+        for token in terms:
+            docs = self.postings[token]
+            del docs[key]
+            if not docs:
+                del self.postings[token]
+                self._vocab = None
+        self.total_length -= self.doc_lengths.pop(key)
+        self.fingerprints.pop(key, None)
+
+    def sync(self, notes):
+        """/wrongnotes 응답과 색인을 맞춤 (바뀐 노트만 추가/삭제)"""
+        if notes is self.source:
+            return
+        # 다른 세션의 검색/동기화가 중간 상태를 보지 않도록 끝까지 lock 을 잡음
+        with self.lock:
+            seen = set()
+            for row, note in enumerate(notes):
+                key = note_key(note, row)
+                seen.add(key)
+                if self.fingerprints.get(key) != _fingerprint(note):
+                    self._add(key, note)
+            for key in [key for key in self.doc_lengths if key not in seen]:
+                self._remove(key)
+            self.source = notes
+
+    def expand_prefix(self, prefix):
+        if self._vocab is None:
+            self._vocab = sorted(self.postings)
+        vocab = self._vocab
+        start = bisect_left(vocab, prefix)
+        matches = []
+        for term in vocab[start:start + MAX_PREFIX_TERMS]:
+            if not term.startswith(prefix):
+                break
+            matches.append(term)
+        return matches
+
+    def _idf(self, term):
+        df = len(self.postings.get(term, ()))
+        n = len(self.doc_lengths)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def _score_term(self, scores, term, docs=None, avg_length=1.0, weight=1.0):
+        postings = self.postings.get(term)
+        if not postings:
+            return
+        idf = self._idf(term)
+        k1, b = self.k1, self.b
+        lengths = self.doc_lengths
+        for key in (postings if docs is None else docs):
+            where = postings.get(key)
+            if where is None:
+                continue
+            tf = len(where)
+            norm = k1 * (1 - b + b * lengths[key] / avg_length)
+            scores[key] = scores.get(key, 0.0) + weight * idf * tf * (k1 + 1) / (tf + norm)
+
+    def _phrase_docs(self, tokens):
+        postings = [self.postings.get(t) for t in tokens]
+        if any(p is None for p in postings):
+            return set()
+        candidates = set(min(postings, key=len))
+        for p in postings:
+            candidates.intersection_update(p)
+        matched = set()
+        for key in candidates:
+            # 첫 토큰의 시작 위치 중 뒤 토큰들이 연속으로 이어지는 것만 남김
+            starts = set(postings[0][key])
+            for offset, p in enumerate(postings[1:], 1):
+                starts.intersection_update([pos - offset for pos in p[key]])
+                if not starts:
+                    break
+            if starts:
+                matched.add(key)
+        return matched
+
+    def search(self, query, limit=None):
+        """[(doc_key, score), ...] 점수 내림차순"""
+        terms, prefixes, required, phrases = parse_query(query)
+        if not (terms or prefixes or required or phrases):
+            return []
+        with self.lock:
+            if not self.doc_lengths:
+                return []
+            avg_length = max(1.0, self.total_length / len(self.doc_lengths))
+
+            allowed = None
+            for tokens in required:
+                docs = self._phrase_docs(tokens)
+                allowed = docs if allowed is None else allowed & docs
+            if allowed is not None and not allowed:
+                return []
+
+            scores = {}
+            for tokens in required:
+                for token in tokens:
+                    self._score_term(scores, token, allowed, avg_length)
+            for term in terms:
+                self._score_term(scores, term, allowed, avg_length)
+            for tokens in phrases:
+                docs = self._phrase_docs(tokens)
+                if allowed is not None:
+                    docs &= allowed
+                for token in tokens:
+                    self._score_term(scores, token, docs, avg_length, PHRASE_BONUS)
+            for prefix in prefixes:
+                # 확장된 용어 중 가장 높은 점수만 반영 (짧은 접두어가 과하게 가산되지 않도록)
+                best = {}
+                for term in self.expand_prefix(prefix):
+                    partial = {}
+                    self._score_term(partial, term, allowed, avg_length)
+                    for key, score in partial.items():
+                        if score > best.get(key, 0.0):
+                            best[key] = score
+                for key, score in best.items():
+                    scores[key] = scores.get(key, 0.0) + score
+
+        ranked = sorted(scores.items(), key=lambda item: -item[1])
+        return ranked[:limit] if limit else ranked
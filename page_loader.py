@@ -0,0 +1,90 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FutureTimeout
+
+logger = logging.getLogger(__name__)
+
+
+class PageLoad:
+    """한 번의 페이지 데이터 로드 결과"""
+
+    def __init__(self):
+        self.data = {}      # endpoint -> 응답 데이터 (실패하면 None)
+        self.failed = []    # 응답이 실패한 endpoint
+        self.late = []      # 마감까지 오지 않은 endpoint (백그라운드에서 계속 받음)
+        self.futures = {}   # 늦은 endpoint -> Future
+        self.elapsed = 0.0
+
+
+class PageLoader:
+    """페이지가 선언한 GET 들을 동시에 요청
+
+    같은 endpoint 의 진행 중인 요청은 여러 세션이 함께 기다린다 (중복 요청 없음).
+    마감(deadline)이 지나면 도착한 것만 돌려주고, 나머지는 백그라운드에서 계속 받는다.
+    task 는 응답 데이터(실패하면 None)를 반환하는 함수. 예외도 실패로 처리한다.
+    """
+
+    def __init__(self, max_workers=8):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="toefl-loader")
+        self.lock = threading.Lock()
+        self._inflight = {}     # endpoint -> Future
+
+    def submit(self, endpoint, task):
+        with self.lock:
+            future = self._inflight.get(endpoint)
+            if future is not None:
+                return future
+            future = self._inflight[endpoint] = self.executor.submit(task)
+        # 이미 끝났으면 콜백이 바로 실행되므로 lock 밖에서 등록
+        future.add_done_callback(lambda f: self._finished(endpoint, f))
+        return future
+
+    def _finished(self, endpoint, future):
+        with self.lock:
+            if self._inflight.get(endpoint) is future:
+                del self._inflight[endpoint]
+
+    def inflight(self, endpoint):
+        with self.lock:
+            return self._inflight.get(endpoint)
+
+    def load(self, tasks, deadline=None):
+        """tasks: {endpoint: task}. 모두 도착하거나 deadline(초)이 지나면 PageLoad 반환"""
+        start = time.perf_counter()
+        load = PageLoad()
+        futures = {self.submit(endpoint, task): endpoint for endpoint, task in tasks.items()}
+        try:
+            for future in as_completed(futures, timeout=deadline):
+                self._collect(load, futures[future], future)
+        except FutureTimeout:
+            for future, endpoint in futures.items():
+                if endpoint in load.data:
+                    continue
+                if future.done():
+                    self._collect(load, endpoint, future)
+                else:
+                    load.late.append(endpoint)
+                    load.futures[endpoint] = future
+        load.elapsed = time.perf_counter() - start
+        return load
+
+    @staticmethod
+    def _collect(load, endpoint, future):
+        try:
+            data = future.result()
+        except Exception:
+            logger.exception("page resource %s failed", endpoint)
+            data = None
+        load.data[endpoint] = data
+        if data is None:
+            load.failed.append(endpoint)
+
+    @staticmethod
+    def settled(load):
+        """늦은 요청이 모두 끝났으면 데이터가 도착한 endpoint 목록, 아직 진행 중이면 None (기다리지 않음)"""
+        if not all(future.done() for future in load.futures.values()):
+            return None
+        return [endpoint for endpoint, future in load.futures.items()
+                if future.exception() is None and future.result() is not None]
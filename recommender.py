@@ -0,0 +1,350 @@
+import threading
+import zlib
+from array import array
+from functools import lru_cache
+
+import numpy as np
+
+from note_search import note_key, tokenize
+
+# 해시 특징 공간 크기 (단어 + 인접 단어쌍)
+N_FEATURES = 1 << 18
+# 문항 유사도 가중치 (나머지는 지문 유사도)
+QUESTION_WEIGHT = 0.7
+# 이 이상이면 같은 문항으로 보고 추천에서 제외
+DUPLICATE_SCORE = 0.98
+
+_EMPTY = (np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32))
+
+
+@lru_cache(maxsize=4096)
+def text_vector(text, n_features=N_FEATURES):
+    """텍스트 -> (정렬된 특징 번호, 1 + log(tf)) 희소 벡터
+
+    특징은 단어와 인접 단어쌍을 crc32 로 해시한 값 (프로세스가 바뀌어도 같음).
+    """
+    tokens = tokenize(text)
+    if not tokens:
+        return _EMPTY
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    hashed = np.fromiter((zlib.crc32(gram.encode("utf-8")) for gram in grams),
+                         dtype=np.int64, count=len(grams)) % n_features
+    features, counts = np.unique(hashed, return_counts=True)
+    weights = (1 + np.log(counts)).astype(np.float32)
+    features = features.astype(np.int32)
+    features.flags.writeable = False
+    weights.flags.writeable = False
+    return features, weights
+
+
+def _grow(values, size, fill):
+    if size <= len(values):
+        return values
+    grown = np.full(max(size, 2 * len(values), 64), fill, dtype=values.dtype)
+    grown[:len(values)] = values
+    return grown
+
+
+class SparseVectorIndex:
+    """해시 n-gram 벡터의 역색인 (TF-IDF 코사인 유사도)
+
+    벡터는 추가할 때 한 번만 계산해 보관한다. 새 벡터는 작은 delta 구간에 쌓고,
+    delta/삭제가 전체의 merge_ratio 를 넘으면 특징 순으로 정렬된 본 구간에 합친다.
+    질의는 질의 특징의 posting 만 모아 bincount 로 모든 행의 점수를 한 번에 계산한다.
+    """
+
+    def __init__(self, n_features=N_FEATURES, merge_ratio=0.05, min_merge=256):
+        self.n_features = n_features
+        self.merge_ratio = merge_ratio
+        self.min_merge = min_merge
+        self.vectors = []       # 행 -> (특징, 가중치), 삭제되면 None
+        self.df = np.zeros(n_features, dtype=np.int32)
+        self.n_alive = 0
+        self._alive = np.zeros(0, dtype=bool)
+        self._norms = np.zeros(0, dtype=np.float32)
+        # 본 구간 (CSC): 특징 f 의 posting = rows/weights[indptr[f]:indptr[f + 1]]
+        self._indptr = np.zeros(n_features + 1, dtype=np.int64)
+        self._rows = np.zeros(0, dtype=np.int32)
+        self._weights = np.zeros(0, dtype=np.float32)
+        self._delta = []        # 본 구간에 아직 없는 행
+        self._delta_arrays = None
+        self._stale = 0         # 본 구간에 남아 있는 삭제된 행 수
+
+    def __len__(self):
+        return self.n_alive
+
+    def idf(self, features):
+        return np.log((1 + self.n_alive) / (1 + self.df[features])).astype(np.float32) + 1
+
+    def add(self, vector):
+        """벡터 추가 후 행 번호 반환"""
+        features, weights = vector
+        row = len(self.vectors)
+        self.vectors.append(vector)
+        self._alive = _grow(self._alive, row + 1, False)
+        self._norms = _grow(self._norms, row + 1, 0)
+        self._alive[row] = True
+        self.df[features] += 1
+        self.n_alive += 1
+        self._norms[row] = np.linalg.norm(weights * self.idf(features))
+        self._delta.append(row)
+        self._delta_arrays = None
+        return row
+
+    def remove(self, row):
+        vector = self.vectors[row]
+        if vector is None:
+            return
+        self.vectors[row] = None
+        self._alive[row] = False
+        self.df[vector[0]] -= 1
+        self.n_alive -= 1
+        if row in self._delta:
+            self._delta.remove(row)
+            self._delta_arrays = None
+        else:
+            self._stale += 1
+
+    def _maybe_merge(self):
+        pending = len(self._delta) + self._stale
+        if pending and pending >= max(self.min_merge, self.merge_ratio * self.n_alive):
+            self.merge()
+
+    def merge(self):
+        """살아 있는 모든 행으로 본 구간을 다시 만들고 현재 IDF 로 norm 을 갱신"""
+        rows = np.flatnonzero(self._alive[:len(self.vectors)]).astype(np.int32)
+        if len(rows):
+            vectors = [self.vectors[row] for row in rows]
+            features = np.concatenate([v[0] for v in vectors])
+            weights = np.concatenate([v[1] for v in vectors])
+            owners = np.repeat(rows, [len(v[0]) for v in vectors])
+        else:
+            features = np.zeros(0, dtype=np.int32)
+            weights = np.zeros(0, dtype=np.float32)
+            owners = np.zeros(0, dtype=np.int32)
+        order = np.argsort(features, kind="stable")
+        self._rows = owners[order]
+        self._weights = weights[order]
+        self._indptr = np.zeros(self.n_features + 1, dtype=np.int64)
+        np.cumsum(np.bincount(features, minlength=self.n_features), out=self._indptr[1:])
+        tfidf = weights * self.idf(features)
+        self._norms[:len(self.vectors)] = 0
+        self._norms[rows] = np.sqrt(np.bincount(owners, tfidf * tfidf, minlength=len(self.vectors))[rows])
+        self._delta = []
+        self._delta_arrays = None
+        self._stale = 0
+
+    def _delta_postings(self):
+        if self._delta_arrays is None:
+            vectors = [self.vectors[row] for row in self._delta]
+            self._delta_arrays = (
+                np.concatenate([v[0] for v in vectors]),
+                np.concatenate([v[1] for v in vectors]),
+                np.repeat(np.asarray(self._delta, dtype=np.int32), [len(v[0]) for v in vectors]),
+            )
+        return self._delta_arrays
+
+    def scores(self, vector):
+        """모든 행과의 코사인 유사도 배열 (삭제된 행은 0)"""
+        self._maybe_merge()
+        n_rows = len(self.vectors)
+        features, weights = vector
+        scores = np.zeros(n_rows, dtype=np.float32)
+        if not len(features) or not n_rows:
+            return scores
+        idf = self.idf(features)
+        query = weights * idf
+        query_norm = np.linalg.norm(query)
+        if not query_norm:
+            return scores
+        # 문서 쪽 IDF 까지 질의 가중치에 미리 곱해 둠
+        query = query * idf / query_norm
+
+        starts = self._indptr[features]
+        lengths = self._indptr[features + 1] - starts
+        total = int(lengths.sum())
+        if total:
+            positions = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(total)
+            scores += np.bincount(self._rows[positions],
+                                  self._weights[positions] * np.repeat(query, lengths),
+                                  minlength=n_rows).astype(np.float32)
+        if self._delta:
+            delta_features, delta_weights, delta_rows = self._delta_postings()
+            at = np.minimum(np.searchsorted(features, delta_features), len(features) - 1)
+            hit = features[at] == delta_features
+            scores += np.bincount(delta_rows[hit], delta_weights[hit] * query[at[hit]],
+                                  minlength=n_rows).astype(np.float32)
+
+        norms = self._norms[:n_rows]
+        np.divide(scores, norms, out=scores, where=norms > 0)
+        scores[~self._alive[:n_rows]] = 0
+        return scores
+
+
+def centroid(vectors):
+    """여러 벡터를 L2 정규화해 더한 벡터 (여러 노트를 한 번의 질의로 묶을 때)"""
+    vectors = [v for v in vectors if len(v[0])]
+    if not vectors:
+        return _EMPTY
+    features = np.concatenate([v[0] for v in vectors])
+    weights = np.concatenate([v[1] / np.linalg.norm(v[1]) for v in vectors])
+    merged, inverse = np.unique(features, return_inverse=True)
+    return merged.astype(np.int32), np.bincount(inverse, weights).astype(np.float32)
+
+
+class SimilarNotes:
+    """문항/지문 TF-IDF 유사도의 가중합으로 비슷한 노트(문항)를 찾는 추천 색인
+
+    지문은 여러 노트가 공유하므로 지문 벡터는 지문 내용당 하나만 보관한다.
+    sync 로 바뀐 노트만 추가/삭제하며, 모든 세션이 하나의 색인을 공유한다.
+    요청 중에는 sync_in_background 로 백그라운드에서 맞추고, 끝날 때까지 추천하지 않는다.
+    """
+
+    def __init__(self, key=note_key, question_weight=QUESTION_WEIGHT, n_features=N_FEATURES):
+        self.key = key
+        self.question_weight = question_weight
+        self.lock = threading.Lock()
+        self.questions = SparseVectorIndex(n_features)  # 행 = 노트
+        self.passages = SparseVectorIndex(n_features)   # 행 = 지문
+        self.rows = {}              # 노트 키 -> 문항 행
+        self.keys = []              # 문항 행 -> 노트 키
+        self.passage_of = array("i")    # 문항 행 -> 지문 행 (-1: 지문 없음)
+        self.passage_rows = {}      # 지문 내용 -> [지문 행, 참조 수]
+        self.fingerprints = {}      # 노트 키 -> (문항, 지문)
+        self.source = None
+        self._builder = None        # 백그라운드 sync 스레드
+        self._builder_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def add(self, key, note):
+        with self.lock:
+            self._add(key, note)
+
+    def _add(self, key, note):
+        self._remove(key)
+        question = note.get("question_text") or ""
+        passage = note.get("passage_text") or ""
+        row = self.questions.add(text_vector(question, self.questions.n_features))
+        passage_row = -1
+        if passage:
+            entry = self.passage_rows.get(passage)
+            if entry is None:
+                entry = self.passage_rows[passage] = [
+                    self.passages.add(text_vector(passage, self.passages.n_features)), 0]
+            entry[1] += 1
+            passage_row = entry[0]
+        self.rows[key] = row
+        self.keys.append(key)
+        self.passage_of.append(passage_row)
+        self.fingerprints[key] = (question, passage)
+
+    def remove(self, key):
+        with self.lock:
+            self._remove(key)
+
+    def _remove(self, key):
+        row = self.rows.pop(key, None)
+        if row is None:
+            return
+        self.questions.remove(row)
+        passage = self.fingerprints.pop(key)[1]
+        entry = self.passage_rows.get(passage)
+        if entry is not None:
+            entry[1] -= 1
+            if not entry[1]:
+                self.passages.remove(entry[0])
+                del self.passage_rows[passage]
+
+    def sync(self, notes):
+        """/wrongnotes 응답과 색인을 맞춤 (바뀐 노트만 다시 벡터화)"""
+        if notes is self.source:
+            return
+        with self.lock:
+            seen = set()
+            for row, note in enumerate(notes):
+                key = self.key(note, row)
+                seen.add(key)
+                fingerprint = (note.get("question_text") or "", note.get("passage_text") or "")
+                if self.fingerprints.get(key) != fingerprint:
+                    self._add(key, note)
+            for key in [key for key in self.rows if key not in seen]:
+                self._remove(key)
+            self.source = notes
+
+    def sync_in_background(self, notes):
+        """sync 를 백그라운드 스레드에서 시작하고, 색인이 이미 notes 와 맞으면 True
+
+        노트가 많으면 첫 벡터화가 수 초 걸리므로 요청 스레드에서 기다리지 않는다.
+        진행 중인 sync 가 있으면 그것이 끝난 뒤의 호출에서 다시 맞춘다.
+        """
+        if notes is self.source:
+            return True
+        with self._builder_lock:
+            if self._builder is None or not self._builder.is_alive():
+                self._builder = threading.Thread(target=self.sync, args=(notes,),
+                                                 name="toefl-similar-sync", daemon=True)
+                self._builder.start()
+        return False
+
+    def _scores(self, question_vector, passage_vector):
+        scores = self.questions.scores(question_vector)
+        question_scores = scores.copy()
+        passage_of = np.frombuffer(self.passage_of, dtype=np.int32) if len(self.passage_of) else \
+            np.zeros(0, dtype=np.int32)
+        if len(passage_vector[0]) and len(self.passages.vectors):
+            # 지문이 없는 행(-1)은 끝에 붙인 0 을 가리키게 함
+            passage_scores = np.append(self.passages.scores(passage_vector), np.float32(0))
+            scores *= self.question_weight
+            scores += (1 - self.question_weight) * passage_scores[passage_of]
+        return scores, question_scores
+
+    def _top(self, scores, k, min_score, skip_texts=()):
+        # 같은 문항 내용이 여러 번 나오면 점수가 가장 높은 하나만 남김
+        n = min(len(scores), 4 * k + len(skip_texts))
+        if k <= 0 or n <= 0:
+            return []
+        top = np.argpartition(-scores, n - 1)[:n]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        seen = set(skip_texts)
+        ranked = []
+        for row in top:
+            if scores[row] <= min_score or len(ranked) == k:
+                break
+            key = self.keys[row]
+            text = self.fingerprints[key][0]
+            if text not in seen:
+                seen.add(text)
+                ranked.append((key, float(scores[row])))
+        return ranked
+
+    def similar(self, key, k=5, min_score=0.05):
+        """노트 key 와 비슷한 다른 노트 [(키, 점수)] (같은 문항은 제외)"""
+        with self.lock:
+            row = self.rows.get(key)
+            if row is None:
+                return []
+            passage_row = self.passage_of[row]
+            passage_vector = self.passages.vectors[passage_row] if passage_row >= 0 else _EMPTY
+            scores, question_scores = self._scores(self.questions.vectors[row], passage_vector)
+            scores[question_scores >= DUPLICATE_SCORE] = 0
+            return self._top(scores, k, min_score, skip_texts=(self.fingerprints[key][0],))
+
+    def recommend(self, notes, k=10, exclude=(), min_score=0.05):
+        """notes(예: 최근 오답 노트) 전체와 비슷한 항목 [(키, 점수)]
+
+        notes 의 문항/지문 벡터를 각각 하나로 합쳐 한 번만 질의한다.
+        notes 와 문항 내용이 같은 항목과 exclude 에 있는 키는 제외한다.
+        """
+        texts = {n.get("question_text") or "" for n in notes}
+        passages = {n.get("passage_text") for n in notes if n.get("passage_text")}
+        question_vector = centroid([text_vector(t, self.questions.n_features) for t in texts])
+        passage_vector = centroid([text_vector(p, self.passages.n_features) for p in passages])
+        with self.lock:
+            scores, _ = self._scores(question_vector, passage_vector)
+            for key in exclude:
+                row = self.rows.get(key)
+                if row is not None:
+                    scores[row] = 0
+            return self._top(scores, k, min_score, skip_texts=texts)
@@ -0,0 +1,234 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+# 에빙하우스 망각곡선 기반 기본 복습 간격(일)
+DEFAULT_LADDER = (1, 2, 4, 7, 15, 30)
+
+# 휴무일 설정값 -> 요일 번호 (월=0)
+REST_DAY_WEEKDAYS = {"토요일": 5, "일요일": 6}
+
+SCHEDULE_COLUMNS = ["question_id", "last_review", "reviews", "streak", "interval", "next_due"]
+
+
+@dataclass
+class IntervalLadder:
+    """연속 정답 횟수에 따라 고정된 간격 사다리를 오르는 방식. 오답이면 첫 칸으로"""
+    intervals: tuple = DEFAULT_LADDER
+
+    def intervals_for(self, correct_matrix, lengths, streak):
+        ladder = np.asarray(self.intervals, dtype=np.int64)
+        return ladder[np.minimum(streak, len(ladder) - 1)]
+
+
+@dataclass
+class SM2:
+    """SM-2 방식 (정답=품질 4, 오답=품질 1). 문항별 ease factor 를 누적 갱신"""
+    initial_ease: float = 2.5
+    min_ease: float = 1.3
+    first_intervals: tuple = field(default=(1, 6))
+    correct_quality: int = 4
+    wrong_quality: int = 1
+    max_interval: int = 365
+
+    def intervals_for(self, correct_matrix, lengths, streak):
+        n_questions, max_len = correct_matrix.shape
+        ease = np.full(n_questions, self.initial_ease)
+        interval = np.zeros(n_questions)
+        reps = np.zeros(n_questions, dtype=np.int64)
+        # 문항 방향은 벡터화하고, 복습 회차(열)만 순회
+        for col in range(max_len):
+            active = col < lengths
+            correct = correct_matrix[:, col]
+            q = np.where(correct, self.correct_quality, self.wrong_quality)
+            new_ease = np.maximum(self.min_ease, ease + (0.1 - (5 - q) * (0.08 + (5 - q) * 0.02)))
+            new_reps = np.where(correct, reps + 1, 0)
+            grown = np.minimum(np.rint(interval * new_ease), self.max_interval)
+            new_interval = np.where(new_reps <= 1, self.first_intervals[0],
+                                    np.where(new_reps == 2, self.first_intervals[1], grown))
+            ease = np.where(active, new_ease, ease)
+            reps = np.where(active, new_reps, reps)
+            interval = np.where(active, new_interval, interval)
+        return interval.astype(np.int64)
+
+
+def _to_frame(history):
+    df = history if isinstance(history, pd.DataFrame) else pd.DataFrame(list(history))
+    if df.empty:
+        return pd.DataFrame({"question_id": pd.Series(dtype=object),
+                             "reviewed_at": pd.Series(dtype="datetime64[ns]"),
+                             "correct": pd.Series(dtype=bool)})
+    df = df[["question_id", "reviewed_at", "correct"]].copy()
+    if not pd.api.types.is_datetime64_any_dtype(df["reviewed_at"]):
+        df["reviewed_at"] = pd.to_datetime(df["reviewed_at"])
+    df["reviewed_at"] = df["reviewed_at"].dt.normalize()
+    df["correct"] = df["correct"].astype(bool)
+    return df
+
+
+def shift_rest_day(dates, rest_day):
+    # 휴무일에 걸린 복습일은 다음날로 미룸
+    weekday = REST_DAY_WEEKDAYS.get(rest_day)
+    if weekday is None:
+        return dates
+    on_rest = dates.dt.weekday == weekday
+    return dates.where(~on_rest, dates + pd.Timedelta(days=1))
+
+
+def compute_schedule(history, policy=None, rest_day=None):
+    """복습 기록(question_id, reviewed_at, correct)에서 문항별 다음 복습일 계산"""
+    policy = policy or IntervalLadder()
+    df = _to_frame(history)
+    if df.empty:
+        return pd.DataFrame(columns=SCHEDULE_COLUMNS)
+
+    codes, question_ids = pd.factorize(df["question_id"], sort=False)
+    reviewed_at = df["reviewed_at"].to_numpy()
+    order = np.lexsort((reviewed_at, codes))
+    codes = codes[order]
+    reviewed_at = reviewed_at[order]
+    correct = df["correct"].to_numpy()[order]
+    n_questions = len(question_ids)
+
+    lengths = np.bincount(codes, minlength=n_questions)
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    position = np.arange(len(codes)) - np.repeat(starts, lengths)
+
+    # 마지막 오답 이후 연속 정답 수 = 전체 길이 - (마지막 오답 위치 + 1)
+    last_wrong = np.full(n_questions, -1)
+    wrong = ~correct
+    np.maximum.at(last_wrong, codes[wrong], position[wrong])
+    streak = lengths - (last_wrong + 1)
+
+    correct_matrix = np.zeros((n_questions, lengths.max()), dtype=bool)
+    correct_matrix[codes, position] = correct
+    interval = policy.intervals_for(correct_matrix, lengths, streak)
+
+    last_review = reviewed_at[starts + lengths - 1]
+    schedule = pd.DataFrame({
+        "question_id": question_ids,
+        "last_review": last_review,
+        "reviews": lengths,
+        "streak": streak,
+        "interval": interval,
+    })
+    next_due = schedule["last_review"] + pd.to_timedelta(schedule["interval"], unit="D")
+    schedule["next_due"] = shift_rest_day(next_due, rest_day)
+    return schedule
+
+
+def due_queue(schedule, today, daily_target=None, rest_day=None):
+    """오늘 복습할 문항 큐와 백로그 수 반환 (가장 오래 밀린 문항부터)"""
+    today = pd.Timestamp(today).normalize()
+    if REST_DAY_WEEKDAYS.get(rest_day) == today.weekday():
+        return schedule.iloc[0:0], 0
+
+    due = schedule[schedule["next_due"] <= today]
+    order = np.lexsort((due["streak"].to_numpy(), due["next_due"].to_numpy()))
+    due = due.iloc[order]
+    if daily_target is None:
+        return due, 0
+    # 설정값은 문자열이나 실수로 올 수 있으므로 정수로 맞춤 (batch_due_queues 와 같음)
+    daily_target = int(daily_target)
+    return due.iloc[:daily_target], max(0, len(due) - daily_target)
+
+
+def due_questions(history_payload, today, policy=None):
+    """/history 응답({reviews, questions, settings})으로 /due 와 같은 형태의 문항 목록 생성"""
+    settings = history_payload.get("settings") or {}
+    rest_day = settings.get("rest_day")
+    schedule = compute_schedule(history_payload.get("reviews", []), policy, rest_day)
+
+    questions = history_payload.get("questions", [])
+    reviewed = set(schedule["question_id"])
+    # 한 번도 풀지 않은 문항은 오늘 바로 학습 대상
+    new_ids = [q["question_id"] for q in questions if q["question_id"] not in reviewed]
+    if new_ids:
+        today_ts = pd.Timestamp(today).normalize()
+        new_rows = pd.DataFrame({"question_id": new_ids, "last_review": pd.NaT, "reviews": 0,
+                                 "streak": 0, "interval": 0, "next_due": today_ts})
+        schedule = new_rows if schedule.empty else pd.concat([schedule, new_rows], ignore_index=True)
+
+    queue, backlog = due_queue(schedule, today, settings.get("daily_target"), rest_day)
+    by_id = {q["question_id"]: q for q in questions}
+    return [by_id[qid] for qid in queue["question_id"] if qid in by_id], backlog
+
+
+def batch_due_queues(payloads, today, policy=None):
+    """여러 사용자의 /history 응답으로 모든 사용자의 due 큐를 한 번에 계산
+
+    payloads: {user: /history 응답}. (사용자, 문항) 쌍을 하나의 키로 묶어 compute_schedule 을
+    한 번만 호출한다. 반환: (큐 DataFrame [user, question_id, reviews, streak, next_due],
+    사용자별 백로그 수 Series). 사용자별 결과는 due_questions 와 같다.
+    """
+    today = pd.Timestamp(today).normalize()
+    users = list(payloads)
+    n_users = len(users)
+    targets = np.full(n_users, np.inf)
+    rest_weekdays = np.full(n_users, -1)
+    # 사용자별로 DataFrame 을 만들지 않고 열 목록으로 이어 붙여 한 번에 변환
+    review_users, question_ids, reviewed_at, correct = [], [], [], []
+    known_users, known_ids = [], []
+    for code, user in enumerate(users):
+        payload = payloads[user] or {}
+        settings = payload.get("settings") or {}
+        if settings.get("daily_target") is not None:
+            targets[code] = int(settings["daily_target"])
+        rest_weekdays[code] = REST_DAY_WEEKDAYS.get(settings.get("rest_day"), -1)
+        records = payload.get("reviews", [])
+        review_users.extend([code] * len(records))
+        for record in records:
+            question_ids.append(record["question_id"])
+            reviewed_at.append(record["reviewed_at"])
+            correct.append(record["correct"])
+        questions = payload.get("questions", [])
+        known_users.extend([code] * len(questions))
+        known_ids.extend(q["question_id"] for q in questions)
+    reviews = _to_frame(pd.DataFrame({"question_id": pd.Series(question_ids, dtype=object),
+                                      "reviewed_at": reviewed_at, "correct": correct}))
+    reviews["user"] = np.asarray(review_users, dtype=np.int64)
+    known = pd.DataFrame({"user": np.asarray(known_users, dtype=np.int64),
+                          "question_id": pd.Series(known_ids, dtype=object)})
+
+    # (사용자, 문항) -> 정수 키. 사용자 순서대로 이어 붙였으므로 사용자 안의 문항 순서는 유지된다
+    codes, question_ids = pd.factorize(reviews["question_id"].astype(object), sort=False)
+    n_codes = max(1, len(question_ids))
+    schedule = compute_schedule(
+        reviews.assign(question_id=reviews["user"].to_numpy(dtype=np.int64) * n_codes + codes), policy)
+    if not schedule.empty:
+        keys = schedule["question_id"].to_numpy(dtype=np.int64)
+        user = keys // n_codes
+        schedule = schedule.assign(user=user, question_id=question_ids[keys % n_codes])
+        # 사용자마다 휴무일이 다르므로 shift_rest_day 를 행 단위로 적용
+        on_rest = schedule["next_due"].dt.weekday.to_numpy() == rest_weekdays[user]
+        schedule.loc[on_rest, "next_due"] += pd.Timedelta(days=1)
+    else:
+        schedule = schedule.assign(user=pd.Series(dtype="int64"))
+
+    # 한 번도 풀지 않은 문항은 오늘 바로 학습 대상
+    reviewed = pd.MultiIndex.from_frame(schedule[["user", "question_id"]])
+    is_new = ~pd.MultiIndex.from_frame(known).isin(reviewed)
+    new_rows = known[is_new].assign(last_review=pd.NaT, reviews=0, streak=0, interval=0,
+                                    next_due=today)
+    if len(new_rows):
+        schedule = new_rows if schedule.empty else pd.concat([schedule, new_rows], ignore_index=True)
+
+    user = schedule["user"].to_numpy(dtype=np.int64)
+    due = (schedule["next_due"] <= today).to_numpy() & (rest_weekdays[user] != today.weekday())
+    due = schedule[due]
+    order = np.lexsort((due["streak"].to_numpy(), due["next_due"].to_numpy(),
+                        due["user"].to_numpy()))
+    due = due.iloc[order]
+    user = due["user"].to_numpy(dtype=np.int64)
+    rank = due.groupby("user").cumcount().to_numpy()
+    counts = np.bincount(user, minlength=n_users)
+    backlog = np.where(np.isinf(targets), 0, np.maximum(0, counts - np.nan_to_num(targets, posinf=0)))
+
+    queue = due[rank < targets[user]]
+    # 문항 정보가 없는 문항은 큐에서 제외 (due_questions 와 같음)
+    queue = queue[pd.MultiIndex.from_frame(queue[["user", "question_id"]]).isin(
+        pd.MultiIndex.from_frame(known))]
+    queue = queue.assign(user=np.asarray(users, dtype=object)[queue["user"].to_numpy(dtype=np.int64)])
+    return (queue[["user", "question_id", "reviews", "streak", "next_due"]].reset_index(drop=True),
+            pd.Series(backlog.astype("int64"), index=users))
@@ -0,0 +1,308 @@
+import hashlib
+import json
+import threading
+import weakref
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from api_client import backend_error, unsupported
+
+# 지문/해설이 빠진 경량 /due 응답일 때 개별로 받아오는 엔드포인트
+PASSAGE_ENDPOINT = "/passage?passage_id={}"
+EXPLANATION_ENDPOINT = "/explanation?question_id={}"
+
+
+def passage_key(question):
+    if question.get("passage_id") is not None:
+        return str(question["passage_id"])
+    text = question.get("passage_text")
+    if not text:
+        return None
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def render_passage_html(title, text):
+    return f"""
+                <div style="height: 500px; overflow-y: auto; padding: 20px;
+                           background-color: #f9f9f9; border-radius: 10px;">
+                    <h4>{title or 'Passage'}</h4>
+                    <p>{text or 'No passage text available.'}</p>
+                </div>
+                """
+
+
+class Passage:
+    __slots__ = ("key", "title", "text", "html", "__weakref__")
+    shared_resource = True  # 세션이 참조해도 세션별 메모리 측정에서 제외
+
+    def __init__(self, key, title, text):
+        self.key = key
+        self.title = title
+        self.text = text
+        self.html = render_passage_html(title, text)
+
+
+class Explanation:
+    __slots__ = ("text", "__weakref__")
+    shared_resource = True
+
+    def __init__(self, text):
+        self.text = text
+
+
+class TextStore:
+    """지문/해설 텍스트를 프로세스 전체에서 공유 (LRU 로 크기 제한)
+
+    세션은 자기 문항의 지문/해설 객체를 붙잡고 있으므로, LRU 에서 밀려나도 그 세션이
+    끝날 때까지는 약한 참조로 계속 찾을 수 있다.
+    """
+    shared_resource = True  # 세션별 메모리 측정에서 제외
+
+    def __init__(self, max_passages=2048, max_explanations=20000):
+        self.max_passages = max_passages
+        self.max_explanations = max_explanations
+        self._passages = OrderedDict()      # key -> Passage (최근 쓴 항목)
+        self._explanations = OrderedDict()  # question_id -> Explanation
+        self._live_passages = weakref.WeakValueDictionary()      # 세션이 쓰고 있는 항목
+        self._live_explanations = weakref.WeakValueDictionary()
+        self.supported = set()    # 응답을 받아 본 개별 조회 ("passage", "explanation")
+        self.unsupported = set()  # 백엔드에 없는 개별 조회
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _lookup(lru, live, key, limit):
+        item = lru.get(key)
+        if item is None:
+            item = live.get(key)
+            if item is None:
+                return None
+            lru[key] = item
+        lru.move_to_end(key)
+        while len(lru) > limit:
+            lru.popitem(last=False)
+        return item
+
+    @staticmethod
+    def _store(lru, live, key, item, limit):
+        lru[key] = live[key] = item
+        lru.move_to_end(key)
+        while len(lru) > limit:
+            lru.popitem(last=False)
+        return item
+
+    def passage(self, key):
+        with self._lock:
+            return self._lookup(self._passages, self._live_passages, key, self.max_passages)
+
+    def put_passage(self, key, title, text):
+        with self._lock:
+            passage = self._lookup(self._passages, self._live_passages, key, self.max_passages)
+            if passage is not None and passage.text == text and passage.title == title:
+                return passage
+            return self._store(self._passages, self._live_passages, key,
+                               Passage(key, title, text), self.max_passages)
+
+    def has_explanation(self, question_id):
+        return question_id in self._explanations or question_id in self._live_explanations
+
+    def explanation_entry(self, question_id):
+        with self._lock:
+            return self._lookup(self._explanations, self._live_explanations, question_id,
+                                self.max_explanations)
+
+    def explanation(self, question_id):
+        entry = self.explanation_entry(question_id)
+        return entry.text if entry is not None else None
+
+    def put_explanation(self, question_id, text):
+        with self._lock:
+            entry = self._lookup(self._explanations, self._live_explanations, question_id,
+                                 self.max_explanations)
+            if entry is not None and entry.text == text:
+                return entry
+            return self._store(self._explanations, self._live_explanations, question_id,
+                               Explanation(text), self.max_explanations)
+
+    def supports(self, kind):
+        return kind not in self.unsupported
+
+
+def parse_options(options):
+    if isinstance(options, str):
+        options = json.loads(options or "[]")
+    return tuple(options or ())
+
+
+class Question:
+    """세션에 남기는 문항 필드만 보관 (선택지는 생성 시 한 번만 파싱)"""
+    __slots__ = ("question_id", "passage_key", "text", "options", "answer")
+
+    def __init__(self, question_id, passage_key, text, options, answer):
+        self.question_id = question_id
+        self.passage_key = passage_key
+        self.text = text
+        self.options = options
+        self.answer = answer
+
+    @classmethod
+    def from_raw(cls, raw):
+        return cls(raw["question_id"], passage_key(raw), raw.get("question_text", ""),
+                   parse_options(raw.get("options")), raw.get("answer"))
+
+
+class StudySession:
+    """/due 문항 목록을 압축된 문항 배열 + 공유 텍스트 저장소 키로 보관하고
+    다음 지문·해설을 미리 받아온다. 답안/플래그는 문항 순서의 배열로 관리한다.
+
+    fetch(endpoint) 는 ApiResult 를 반환. 백엔드에 없는 개별 조회는 한 번 확인한 뒤 다시 보내지 않는다.
+    """
+
+    def __init__(self, questions, fetch=None, executor=None, prefetch_ahead=3, texts=None):
+        self.fetch = fetch
+        self.executor = executor
+        self.prefetch_ahead = prefetch_ahead
+        self.texts = texts if texts is not None else TextStore()
+        self.questions = []
+        self._pending = {}  # key -> Future
+        # 이 세션이 쓰는 공유 지문/해설 객체 (붙잡고 있는 동안 저장소에서 사라지지 않음)
+        self._held = set()
+        for raw in questions:
+            q = Question.from_raw(raw)
+            if q.passage_key is not None and raw.get("passage_text"):
+                self._held.add(self.texts.put_passage(q.passage_key, raw.get("passage_title"),
+                                                      raw["passage_text"]))
+            if "explanation" in raw:
+                self._held.add(self.texts.put_explanation(q.question_id, raw["explanation"]))
+            self.questions.append(q)
+        # 선택한 선택지 번호(-1: 미응답)와 플래그
+        self.choices = array("b", [-1]) * len(self.questions)
+        self.flags = bytearray(len(self.questions))
+
+    def __len__(self):
+        return len(self.questions)
+
+    def question(self, idx):
+        return self.questions[idx]
+
+    # 답안
+    def answer(self, idx):
+        choice = self.choices[idx]
+        return None if choice < 0 else self.questions[idx].options[choice]
+
+    def flagged(self, idx):
+        return bool(self.flags[idx])
+
+    def set_answer(self, idx, answer, flagged=False):
+        """답안/플래그 기록. 바뀌었으면 True"""
+        options = self.questions[idx].options
+        choice = options.index(answer) if answer in options else -1
+        flagged = int(bool(flagged))
+        if self.choices[idx] == choice and self.flags[idx] == flagged:
+            return False
+        self.choices[idx] = choice
+        self.flags[idx] = flagged
+        return True
+
+    def restore_answers(self, saved):
+        # LocalStore.load_answers 결과 (question_id 문자열 -> {answer, flagged})
+        for idx, q in enumerate(self.questions):
+            entry = saved.get(str(q.question_id))
+            if entry:
+                self.set_answer(idx, entry["answer"], entry["flagged"])
+
+    def answered(self):
+        return [idx for idx, choice in enumerate(self.choices) if choice >= 0]
+
+    # 지문/해설
+    def explanation(self, idx, timeout=None):
+        q = self.questions[idx]
+        if not self.texts.has_explanation(q.question_id):
+            self._schedule(("explanation", idx), EXPLANATION_ENDPOINT.format(q.question_id))
+            self._resolve(("explanation", idx), timeout)
+        return self.texts.explanation(q.question_id)
+
+    def passage(self, idx, timeout=None):
+        key = self.questions[idx].passage_key
+        if key is None:
+            return None
+        passage = self.texts.passage(key)
+        if passage is None:
+            self._schedule_passage(key)
+            self._resolve(("passage", key), timeout)
+            passage = self.texts.passage(key)
+        return passage
+
+    def prefetch(self, idx):
+        # 현재 문항 뒤로 prefetch_ahead 개 문항의 지문/해설을 백그라운드에서 요청
+        if self.fetch is None or self.executor is None:
+            return
+        # 끝난 요청은 결과를 공유 저장소로 옮겨 세션이 응답을 붙잡고 있지 않도록 함
+        for task, future in list(self._pending.items()):
+            if future.done():
+                self._resolve(task)
+        for i in range(idx, min(idx + self.prefetch_ahead + 1, len(self.questions))):
+            q = self.questions[i]
+            if q.passage_key is not None and self.texts.passage(q.passage_key) is None:
+                self._schedule_passage(q.passage_key)
+            if not self.texts.has_explanation(q.question_id):
+                self._schedule(("explanation", i), EXPLANATION_ENDPOINT.format(q.question_id))
+
+    def _schedule_passage(self, key):
+        self._schedule(("passage", key), PASSAGE_ENDPOINT.format(key))
+
+    def _schedule(self, task, endpoint):
+        kind = task[0]
+        if task in self._pending or self.fetch is None or not self.texts.supports(kind):
+            return
+        # 지원 여부를 아직 모르면 한 번에 하나만 보내 확인 (prefetch 가 없는 endpoint 로 몰리지 않도록)
+        if kind not in self.texts.supported and any(t[0] == kind for t in self._pending):
+            return
+        if self.executor is None:
+            self._pending[task] = _Done(self.fetch(endpoint))
+        else:
+            self._pending[task] = self.executor.submit(self.fetch, endpoint)
+
+    def _resolve(self, task, timeout=None):
+        future = self._pending.get(task)
+        if future is None:
+            return
+        try:
+            result = future.result(timeout)
+        except TimeoutError:
+            # 아직 받는 중이면 다음 rerun 에서 다시 확인
+            return
+        except Exception:
+            # 실패/타임아웃은 다음 prefetch 때 다시 시도
+            self._pending.pop(task, None)
+            return
+        self._pending.pop(task, None)
+        kind, ref = task
+        if unsupported(result):
+            # 이 백엔드에는 개별 조회가 없음 -> 같은 저장소를 쓰는 세션 모두 더 요청하지 않음
+            self.texts.unsupported.add(kind)
+            return
+        data = result.data
+        if not result.ok or backend_error(result) or not isinstance(data, dict):
+            return
+        self.texts.supported.add(kind)
+        if kind == "passage":
+            self._held.add(self.texts.put_passage(ref, data.get("passage_title"),
+                                                  data.get("passage_text")))
+        else:
+            self._held.add(self.texts.put_explanation(self.questions[ref].question_id,
+                                                      data.get("explanation")))
+
+
+class _Done:
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def result(self, timeout=None):
+        return self.value
+
+
+def make_executor(max_workers=4):
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="toefl-prefetch")
@@ -0,0 +1,122 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+BATCH_ENDPOINT = "/skill-tags/batch"
+
+
+@dataclass
+class TagDiff:
+    """태그 이름 변경/병합/삭제/추가를 한 번에 적용할 변경 묶음
+
+    mapping 은 기존 이름 -> 새 이름(None 이면 삭제). 모든 변경은 동시에 적용되므로
+    a->b, b->a 는 서로 맞바꾸기이고, 여러 태그를 같은 이름으로 바꾸면 병합이다.
+    """
+    mapping: dict = field(default_factory=dict)
+    creates: list = field(default_factory=list)
+
+    @classmethod
+    def from_edits(cls, names, renames=None, deletes=(), creates=()):
+        mapping = {}
+        for old, new in (renames or {}).items():
+            new = (new or "").strip()
+            if old in names and new and new != old:
+                mapping[old] = new
+        for name in deletes:
+            if name in names:
+                mapping[name] = None
+        final = {mapping.get(name, name) for name in names} - {None}
+        new_tags = []
+        for name in creates:
+            name = name.strip()
+            if name and name not in final and name not in new_tags:
+                new_tags.append(name)
+        return cls(mapping, new_tags)
+
+    def __bool__(self):
+        return bool(self.mapping or self.creates)
+
+    def apply_to_note_tags(self, tags):
+        # 순서를 유지하고, 병합으로 생긴 중복은 제거
+        result = []
+        for name in tags:
+            new = self.mapping.get(name, name)
+            if new is not None and new not in result:
+                result.append(new)
+        return result
+
+    def apply_to_names(self, names):
+        result = self.apply_to_note_tags(names)
+        return result + [name for name in self.creates if name not in result]
+
+    def describe(self, names):
+        """[(기존 이름, 동작, 새 이름)]"""
+        targets = {}
+        for name in names:
+            new = self.mapping.get(name, name)
+            if new is not None:
+                targets.setdefault(new, []).append(name)
+        rows = []
+        for old, new in self.mapping.items():
+            if new is None:
+                action = "삭제"
+            elif len(targets.get(new, ())) > 1:
+                action = "병합"
+            else:
+                action = "이름 변경"
+            rows.append((old, action, new))
+        rows.extend((None, "추가", name) for name in self.creates)
+        return rows
+
+    def preview(self, names, index):
+        """노트를 바꾸지 않고 영향받는 노트 수 계산 (WrongNoteIndex 의 태그 역색인 사용)
+
+        반환: ([{기존 태그, 동작, 새 태그, 노트 수}], 영향받는 전체 노트 수)
+        """
+        rows = []
+        affected = []
+        for old, action, new in self.describe(names):
+            positions = index.tag_rows.get(old) if old is not None else None
+            count = 0 if positions is None else len(positions)
+            if count:
+                affected.append(positions)
+            rows.append({"기존 태그": old or "", "동작": action, "새 태그": new or "", "노트 수": count})
+        total = len(np.unique(np.concatenate(affected))) if affected else 0
+        return rows, total
+
+    def payload(self):
+        return {"mapping": self.mapping, "create": self.creates}
+
+    def steps(self, tags):
+        """/skill-tags/batch 를 지원하지 않는 백엔드용 태그별 /skill-tags 요청 목록
+
+        삭제(병합으로 없어지는 태그 포함) -> 이름 변경 -> 추가 순서. 다른 태그가 아직 쓰는 이름으로는
+        그 태그를 먼저 바꾼 뒤 바꾸고, 맞바꾸기처럼 순환하면 임시 이름을 거친다.
+        """
+        names = {t["tag_id"]: t["name"] for t in tags}
+        keep = {}   # 새 이름 -> 남길 tag_id (병합이면 이미 그 이름인 태그, 없으면 처음 태그)
+        for tag_id, name in names.items():
+            new = self.mapping.get(name, name)
+            if new is not None and (new not in keep or name == new):
+                keep[new] = tag_id
+        survivors = set(keep.values())
+        steps = [{"action": "delete", "tag_id": tag_id} for tag_id in names if tag_id not in survivors]
+        current = {tag_id: names[tag_id] for tag_id in survivors}
+        pending = {tag_id: new for new, tag_id in keep.items() if names[tag_id] != new}
+        while pending:
+            held = set(current.values())
+            ready = [tag_id for tag_id, new in pending.items() if new not in held]
+            if not ready:
+                # 순환 (a->b, b->a): 하나를 임시 이름으로 옮겨 순환을 끊음
+                tag_id = next(iter(pending))
+                temp = f"{current[tag_id]}~{tag_id}"
+                while temp in held:
+                    temp += "~"
+                steps.append({"action": "update", "tag_id": tag_id, "name": temp})
+                current[tag_id] = temp
+                continue
+            for tag_id in ready:
+                steps.append({"action": "update", "tag_id": tag_id, "name": pending.pop(tag_id)})
+                current[tag_id] = steps[-1]["name"]
+        steps.extend({"action": "create", "name": name} for name in self.creates)
+        return steps
@@ -0,0 +1,41 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from mock_backend import MockConfig, start_mock_server  # noqa: E402
+
+APP = os.path.join(ROOT, "toefl_app.py")
+
+
+@pytest.fixture
+def mock_backend():
+    """테스트마다 새 모의 백엔드 (포트가 달라 앱의 프로세스 캐시도 새로 만들어짐)"""
+    servers = []
+
+    def start(**config):
+        server, url = start_mock_server(MockConfig(**config))
+        servers.append(server)
+        return server, url
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+@pytest.fixture
+def app(tmp_path):
+    """AppTest 생성: app(url, page, **secrets)"""
+    from streamlit.testing.v1 import AppTest
+
+    def make(url, page, **secrets):
+        at = AppTest.from_file(APP, default_timeout=60)
+        at.secrets["API_BASE_URL"] = url
+        at.secrets["LOCAL_DB_PATH"] = str(tmp_path / "app.db")
+        for name, value in secrets.items():
+            at.secrets[name] = value
+        at.session_state["page"] = page
+        return at
+    return make
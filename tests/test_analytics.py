@@ -0,0 +1,38 @@
+import threading
+
+from analytics import ReviewAnalytics
+from mock_backend import MockConfig, MockState
+
+
+def history(reviews=500):
+    state = MockState(MockConfig(notes=10, reviews=reviews))
+    return {"reviews": state.reviews, "questions": list(state.questions.values())}
+
+
+def test_concurrent_updates_fold_each_review_once():
+    data = history()
+    analytics = ReviewAnalytics()
+    barrier = threading.Barrier(8)
+
+    def run():
+        barrier.wait()
+        analytics.update(data)
+    threads = [threading.Thread(target=run) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert int(analytics.daily.sum()) == len(data["reviews"])
+    assert int(analytics.skill_daily["total"].sum()) == len(data["reviews"])
+
+
+def test_appended_reviews_are_folded_incrementally():
+    data = history()
+    analytics = ReviewAnalytics()
+    first = {"reviews": data["reviews"][:300], "questions": data["questions"]}
+    assert analytics.update(first) == 300
+    assert analytics.update(data) == len(data["reviews"]) - 300
+    fresh = ReviewAnalytics()
+    fresh.update(data)
+    assert analytics.daily.equals(fresh.daily)
+    assert analytics.weak_skills() == fresh.weak_skills()
@@ -0,0 +1,29 @@
+from datetime import date
+
+import pytest
+
+from api_client import ERROR_ENCODE, ApiClient
+
+
+@pytest.mark.parametrize("payload", [{"when": date.today()}, {"score": float("nan")}])
+def test_unserializable_payload_returns_error_without_sending(mock_backend, payload):
+    server, url = mock_backend()
+    client = ApiClient(url)
+    try:
+        result = client.post("/settings", payload)
+    finally:
+        client.close()
+    assert not result.ok
+    assert result.error == ERROR_ENCODE
+    assert server.state.stats["POST /settings"] == 0
+
+
+def test_post_sends_json(mock_backend):
+    server, url = mock_backend()
+    client = ApiClient(url)
+    try:
+        result = client.post("/settings", {"rest_day": "토요일", "daily_target": 12, "email": ""})
+    finally:
+        client.close()
+    assert result.ok and result.data == {"success": True}
+    assert server.state.settings["rest_day"] == "토요일"
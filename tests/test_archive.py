@@ -0,0 +1,89 @@
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from archive import Archive  # noqa: E402
+
+REVIEWS = [{"question_id": q, "reviewed_at": f"2026-{m:02d}-{d:02d}", "correct": d % 2 == 0}
+           for m in (7, 8, 9) for d in (1, 10, 20) for q in (1, 2)]
+NOTES = [{"note_id": i, "date_added": f"2026-{m:02d}-05", "skill_tags": ["a"]}
+         for i, m in enumerate((7, 8, 9))]
+
+
+def review_rows(archive):
+    return {month: table.num_rows for month, table in archive.partitions("reviews")}
+
+
+def test_empty_snapshot_keeps_everything(tmp_path):
+    archive = Archive(str(tmp_path))
+    archive.snapshot({"reviews": REVIEWS}, NOTES)
+    before = review_rows(archive)
+
+    stats = archive.snapshot({}, [], prune=True)
+
+    assert review_rows(archive) == before
+    assert archive.months("wrongnotes") == ["2026-07", "2026-08", "2026-09"]
+    assert stats["reviews"]["removed"] == stats["wrongnotes"]["removed"] == 0
+
+
+def test_shorter_history_keeps_old_and_partial_months(tmp_path):
+    archive = Archive(str(tmp_path))
+    archive.snapshot({"reviews": REVIEWS}, NOTES)
+    before = review_rows(archive)
+    # 최근 기간만: 8월은 일부만, 7월은 없음
+    recent = [r for r in REVIEWS if r["reviewed_at"] >= "2026-08-10"]
+
+    stats = archive.snapshot({"reviews": recent}, NOTES)
+
+    assert review_rows(archive) == before
+    assert stats["reviews"]["kept"] == 1
+
+
+def test_prune_removes_only_emptied_note_months(tmp_path):
+    archive = Archive(str(tmp_path))
+    archive.snapshot({"reviews": REVIEWS}, NOTES)
+
+    archive.snapshot({"reviews": REVIEWS}, NOTES[1:])
+    assert archive.months("wrongnotes") == ["2026-07", "2026-08", "2026-09"]
+
+    archive.snapshot({"reviews": REVIEWS}, NOTES[1:], prune=True)
+    assert archive.months("wrongnotes") == ["2026-08", "2026-09"]
+    assert archive.months("reviews") == ["2026-07", "2026-08", "2026-09"]
+
+
+def test_sliding_history_window_merges_reviews(tmp_path):
+    archive = Archive(str(tmp_path))
+    archive.snapshot({"reviews": REVIEWS}, NOTES)
+    # 같은 행 수로 밀린 기간: 8/1 이 빠지고 8/25 가 들어옴, 8/10 의 한 건은 결과가 바뀜
+    window = [r for r in REVIEWS if r["reviewed_at"] >= "2026-08-10"]
+    window += [{"question_id": q, "reviewed_at": "2026-08-25", "correct": True} for q in (1, 2)]
+    window = [dict(r, correct=True) if r["reviewed_at"] == "2026-08-10" and r["question_id"] == 1
+              else r for r in window]
+
+    stats = archive.snapshot({"reviews": window}, NOTES)
+
+    august = archive.table("reviews", ["2026-08"]).to_pylist()
+    assert len(august) == 8
+    assert sorted({r["reviewed_at"] for r in august}) == ["2026-08-01", "2026-08-10",
+                                                           "2026-08-20", "2026-08-25"]
+    changed = [r for r in august if r["reviewed_at"] == "2026-08-10" and r["question_id"] == 1]
+    assert [r["correct"] for r in changed] == [True]
+    assert stats["reviews"]["kept"] == 1
+    assert review_rows(archive)["2026-07"] == 6
+
+    # 같은 응답을 다시 받으면 다시 쓰지 않음
+    again = archive.snapshot({"reviews": window}, NOTES)
+    assert again["reviews"]["written"] == 0
+
+
+def test_reviews_with_ids_merge_by_id(tmp_path):
+    archive = Archive(str(tmp_path))
+    first = [{"review_id": i, "question_id": 1, "reviewed_at": "2026-09-01", "correct": False}
+             for i in range(3)]
+    archive.write("reviews", first)
+    archive.write("reviews", [dict(first[2], correct=True),
+                              {"review_id": 3, "question_id": 1, "reviewed_at": "2026-09-01",
+                               "correct": True}])
+    rows = archive.table("reviews").to_pylist()
+    assert [(r["review_id"], r["correct"]) for r in rows] == [(0, False), (1, False), (2, True),
+                                                               (3, True)]
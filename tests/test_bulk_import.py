@@ -0,0 +1,38 @@
+import io
+import json
+
+from api_client import ApiClient
+from bulk_import import BulkImporter
+from local_store import LocalStore
+
+
+def notes_jsonl(n):
+    rows = [{"question_text": f"Question {i}?", "correct_answer": "A"} for i in range(n)]
+    return io.BytesIO("\n".join(json.dumps(r) for r in rows).encode("utf-8"))
+
+
+def run_import(url, tmp_path, n=5):
+    client = ApiClient(url, max_retries=0)
+    store = LocalStore(str(tmp_path / "import.db"))
+    try:
+        stats = BulkImporter(client, store, batch_size=2).run(notes_jsonl(n), fmt="jsonl")
+        return stats, store.imported_hashes()
+    finally:
+        client.close()
+        store.close()
+
+
+def test_falls_back_to_single_uploads_on_apps_script_unknown_action(mock_backend, tmp_path):
+    server, url = mock_backend(notes=0, apps_script=True, unsupported=("/wrongnote/batch",))
+    stats, imported = run_import(url, tmp_path)
+    assert (stats.uploaded, stats.failed) == (5, 0)
+    assert len(server.state.notes) == 5
+    assert len(imported) == 5
+
+
+def test_unconfirmed_notes_are_not_marked_imported(mock_backend, tmp_path):
+    server, url = mock_backend(notes=0, apps_script=True,
+                               unsupported=("/wrongnote/batch", "/wrongnote"))
+    stats, imported = run_import(url, tmp_path)
+    assert (stats.uploaded, stats.failed) == (0, 5)
+    assert not imported
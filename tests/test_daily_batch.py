@@ -0,0 +1,75 @@
+from datetime import date, datetime, timedelta
+
+import scheduler
+from api_cache import ResponseCache
+from api_client import ApiClient
+from daily_batch import DailyBatch, FileSender
+from local_store import LocalStore
+
+
+def run_batch(url, db_path, day, sender=None):
+    batch = DailyBatch([{"user": "kim", "api_base_url": url, "db_path": str(db_path)}], day, sender)
+    try:
+        return batch.run()
+    finally:
+        batch.close()
+
+
+def test_batch_warms_due_queue_and_sends_digest(mock_backend, tmp_path):
+    server, url = mock_backend()
+    server.state.settings["email"] = "kim@example.com"
+    day = date.today() + timedelta(days=1)
+    stats = run_batch(url, tmp_path / "kim.db", day, FileSender(str(tmp_path / "mail")))
+    assert (stats.fetched, stats.failed, stats.warmed, stats.sent) == (1, 0, 1, 1)
+    assert len(list((tmp_path / "mail").iterdir())) == 1
+
+    store = LocalStore(str(tmp_path / "kim.db"))
+    warm = store.get_warm(url, f"/due?date={day.isoformat()}")
+    history = ApiClient(url).get("/history").data
+    expected, backlog = scheduler.due_questions(history, day)
+    assert [q["question_id"] for q in warm["questions"]] == [q["question_id"] for q in expected]
+    assert warm["backlog"] == backlog
+    assert stats.queued == len(expected)
+
+
+def test_app_reads_warm_queue_instead_of_backend(mock_backend, app, tmp_path):
+    server, url = mock_backend()
+    today = date.today()
+    run_batch(url, tmp_path / "app.db", today)
+    warm = LocalStore(str(tmp_path / "app.db")).get_warm(url, f"/due?date={today.isoformat()}")
+    with server.state.lock:
+        server.state.stats.clear()
+
+    # LOCAL_SCHEDULING 이어도 워밍된 큐가 있으면 /history 로 계산하지 않음
+    at = app(url, "오늘 학습", LOCAL_SCHEDULING=True)
+    at.run()
+    assert not at.exception
+    assert server.state.stats["GET /due"] == 0
+    assert server.state.stats["GET /history"] == 0
+    session = at.session_state.current_session
+    assert warm["questions"] and session is not None
+    assert [q.question_id for q in session.questions] == [q["question_id"] for q in warm["questions"]]
+
+
+def test_warm_entries_expire_and_are_dropped_on_writes(mock_backend, tmp_path):
+    from common import _invalidate
+
+    server, url = mock_backend()
+    today = date.today()
+    run_batch(url, tmp_path / "kim.db", today)
+    store = LocalStore(str(tmp_path / "kim.db"))
+    endpoint = f"/due?date={today.isoformat()}"
+
+    # 그 날이 끝나면 만료
+    midnight = datetime.combine(today + timedelta(days=1), datetime.min.time()).timestamp()
+    assert store.get_warm(url, endpoint, now=midnight - 1) is not None
+    assert store.get_warm(url, endpoint, now=midnight) is None
+    # 다른 백엔드/날짜의 응답으로 쓰이지 않음
+    assert store.get_warm("http://other", endpoint) is None
+    assert store.get_warm(url, f"/due?date={(today - timedelta(days=1)).isoformat()}") is None
+
+    # 큐를 바꾸지 않는 쓰기는 그대로 두고, 답안 제출 후에는 미리 계산한 큐를 버림
+    _invalidate(ResponseCache(), store, url, "/wrongnote")
+    assert store.get_warm(url, endpoint) is not None
+    _invalidate(ResponseCache(), store, url, "/submit")
+    assert store.get_warm(url, endpoint) is None
@@ -0,0 +1,53 @@
+from streamlit.testing.v1 import AppTest
+
+from instrumentation import METRICS
+
+
+def fragment_script():
+    import streamlit as st
+
+    from common import fragment
+
+    @fragment
+    def panel():
+        st.write("panel")
+    panel()
+
+
+def test_fragment_run_without_full_rerun_is_recorded():
+    # 전체 rerun 기록(toefl_app)이 없는 상태에서 fragment 가 실행되면 자체 rerun 을 남김
+    before = len(METRICS.reruns)
+    at = AppTest.from_function(fragment_script)
+    at.secrets["FRAGMENTS"] = True
+    at.session_state["page"] = "오답 노트"
+    at.run()
+    assert not at.exception
+    rerun = METRICS.reruns[-1]
+    assert len(METRICS.reruns) == before + 1
+    assert rerun.fragment.endswith(".panel")
+    assert rerun.page == "오답 노트"
+    assert [name for name, _ in rerun.sections] == [f"fragment:{rerun.fragment}"]
+    assert METRICS.current is None
+    assert 'fragment="' in METRICS.prometheus_text()
+
+
+def test_fragments_inside_full_rerun_are_sections(mock_backend, app):
+    server, url = mock_backend()
+    at = app(url, "오답 노트")
+    at.run()
+    assert not at.exception
+    rerun = METRICS.reruns[-1]
+    assert rerun.fragment is None
+    assert any(name.startswith("fragment:views.wrongnotes.") for name, _ in rerun.sections)
+
+
+def test_debug_panel_requires_the_setting(mock_backend, app):
+    server, url = mock_backend()
+    at = app(url, "오답 노트")
+    at.query_params["debug"] = "1"
+    at.run()
+    assert not any(e.label == "🛠 디버그" for e in at.sidebar.expander)
+
+    at = app(url, "오답 노트", DEBUG_PANEL=True)
+    at.run()
+    assert any(e.label == "🛠 디버그" for e in at.sidebar.expander)
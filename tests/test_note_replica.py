@@ -0,0 +1,84 @@
+from api_client import ERROR_CONNECTION, ApiClient, ApiResult
+from local_store import LocalStore
+from note_replica import NoteReplica
+
+
+def ids(replica):
+    return sorted(note["note_id"] for note in replica.snapshot["notes"])
+
+
+def setup(mock_backend, tmp_path, notes=120):
+    server, url = mock_backend(notes=notes)
+    client = ApiClient(url, max_retries=0)
+    store = LocalStore(str(tmp_path / "replica.db"))
+    return server, client, store, NoteReplica(store, base_url=url, page_size=50)
+
+
+def test_full_load_then_deltas_advance_cursor_and_apply_tombstones(mock_backend, tmp_path):
+    server, client, store, replica = setup(mock_backend, tmp_path)
+    assert replica.sync(client).ok
+    assert ids(replica) == sorted(server.state.notes)
+    assert replica.cursor == server.state.version
+    assert server.state.stats["GET /wrongnotes"] == 3  # 50 건씩 3 페이지
+
+    added = client.post("/wrongnote", {"question_text": "new note"}).data["note_id"]
+    client.post("/wrongnote/delete", {"note_id": 0})
+    before = replica.snapshot
+    assert replica.sync(client).ok
+    assert replica.cursor == server.state.version
+    assert server.state.stats["GET /wrongnotes"] == 4  # 변경분 한 번
+    assert added in ids(replica) and 0 not in ids(replica)
+    assert replica.snapshot is not before
+
+    # 바뀐 것이 없으면 같은 목록 객체를 그대로 돌려줌
+    unchanged = replica.snapshot
+    assert replica.sync(client).data is unchanged
+
+    # 재시작해도 저장된 cursor 부터 이어 받음
+    restarted = NoteReplica(store, base_url=replica.base_url, page_size=50)
+    assert restarted.cursor == replica.cursor and ids(restarted) == ids(replica)
+
+
+def test_reset_reloads_everything(mock_backend, tmp_path):
+    server, client, store, replica = setup(mock_backend, tmp_path)
+    replica.sync(client)
+    client.post("/wrongnote/delete", {"note_id": 5})
+    with server.state.lock:
+        server.state.compact_tombstones()  # 삭제 기록이 정리되어 델타로는 알 수 없음
+
+    requests = server.state.stats["GET /wrongnotes"]
+    assert replica.sync(client).ok
+    assert 5 not in ids(replica)
+    assert ids(replica) == sorted(server.state.notes)
+    assert replica.cursor == server.state.version
+    # reset 응답 1 번 + 전체 3 페이지
+    assert server.state.stats["GET /wrongnotes"] - requests == 4
+
+
+class FailAfter:
+    """n 번째 GET 부터 연결 오류 (전체 받기 도중 끊긴 상황)"""
+
+    def __init__(self, client, n):
+        self.client = client
+        self.n = n
+
+    def get(self, endpoint, **kwargs):
+        self.n -= 1
+        if self.n < 0:
+            return ApiResult(error=ERROR_CONNECTION)
+        return self.client.get(endpoint, **kwargs)
+
+
+def test_interrupted_full_load_restarts_from_scratch(mock_backend, tmp_path):
+    server, client, store, replica = setup(mock_backend, tmp_path)
+    result = replica.sync(FailAfter(client, 2))
+    assert not result.ok
+    assert not replica.complete and len(replica) == 100
+
+    # 재시작 후에도 중단된 상태를 알고 처음부터 다시 받음 (중복 없이)
+    restarted = NoteReplica(store, base_url=replica.base_url, page_size=50)
+    assert not restarted.complete
+    assert restarted.sync(client).ok
+    assert restarted.complete
+    assert ids(restarted) == sorted(server.state.notes)
+    assert len(restarted) == len(server.state.notes)
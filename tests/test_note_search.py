@@ -0,0 +1,77 @@
+import sys
+import threading
+
+from note_search import NoteSearchIndex
+
+
+def notes(n, word):
+    return [{"note_id": i, "question_text": f"{word} question {i}"} for i in range(n)]
+
+
+def test_concurrent_syncs_leave_a_consistent_index():
+    index = NoteSearchIndex()
+    lists = [notes(300, "glacier"), notes(200, "desert"), notes(300, "glacier")]
+    errors = []
+
+    def run(items):
+        try:
+            for _ in range(20):
+                index.sync(items)
+                index.search("question")
+        except Exception as e:      # 동시 수정 중 dict 순회 오류 등
+            errors.append(e)
+    # 스레드 전환을 자주 일으켜 lock 없이 겹치는 경우를 드러냄
+    previous = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=run, args=(items,)) for items in lists]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(previous)
+    assert not errors
+    index.sync(lists[1])
+    assert len(index) == 200
+    assert index.total_length == sum(index.doc_lengths.values())
+    assert {key for key, _ in index.search("desert")} == set(index.doc_lengths)
+
+
+def test_sync_reads_the_index_under_the_lock(monkeypatch):
+    import note_search
+
+    index = NoteSearchIndex()
+    held = []
+    fingerprint = note_search._fingerprint
+
+    def checked(note):
+        held.append(index.lock.locked())
+        return fingerprint(note)
+    monkeypatch.setattr(note_search, "_fingerprint", checked)
+    index.sync(notes(10, "glacier"))
+    index.sync(notes(5, "desert"))
+    assert held and all(held)
+
+
+def test_unquoted_korean_word_matches_other_particles():
+    index = NoteSearchIndex()
+    index.sync([
+        {"note_id": 0, "question_text": "추론문제는 지문 전체를 봐야 한다"},
+        {"note_id": 1, "question_text": "세부 문제를 먼저 풀었다"},
+        {"note_id": 2, "question_text": "glacier sediment"},
+        {"note_id": 3, "question_text": "추론 과정과 논문 제목"},
+    ])
+    ranked = [key for key, _ in index.search("추론문제를")]
+    assert ranked[0] == 0
+    assert 2 not in ranked
+
+    # 토큰이 이어서 나온 노트가 흩어져 나온 노트보다 위
+    scattered = NoteSearchIndex()
+    scattered.sync([{"note_id": 0, "question_text": "추론문제 모음"},
+                    {"note_id": 1, "question_text": "문제 추론 모음"}])
+    assert [key for key, _ in scattered.search("추론문제")] == [0, 1]
+
+    # 따옴표 구문은 그대로 엄격하게 일치
+    assert index.search('"추론문제를"') == []
+    assert [key for key, _ in index.search('"추론문제"')] == [0]
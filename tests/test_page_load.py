@@ -0,0 +1,76 @@
+import threading
+import time
+
+from page_loader import PageLoader
+
+
+def test_failed_resource_is_not_refetched_in_same_run(mock_backend, app):
+    server, url = mock_backend(fail_rate=1.0)
+    at = app(url, "Dashboard", LOCAL_ANALYTICS=False)
+    at.run()
+    assert not at.exception
+    # 재시도 포함 한 번의 요청(1 + 재시도 3)만 보냄: render() 가 다시 요청하지 않음
+    assert server.state.stats["GET /dashboard"] == 4
+
+
+def test_late_resource_shows_loading_instead_of_empty(mock_backend, app):
+    server, url = mock_backend(slow_paths={"/wrongnotes": 2.0})
+    at = app(url, "오답 노트", PAGE_DEADLINE=0.2, PAGE_LATE_POLL=0)
+    at.run()
+    assert not at.exception
+    messages = [info.value for info in at.info]
+    assert any("불러오는 중" in m for m in messages)
+    assert "오답 노트가 비어있습니다." not in messages
+
+
+def test_late_due_queue_does_not_start_empty_session(mock_backend, app):
+    server, url = mock_backend(slow_paths={"/due": 2.0})
+    at = app(url, "오늘 학습", PAGE_DEADLINE=0.2, PAGE_LATE_POLL=0)
+    at.run()
+    assert not at.exception
+    assert any("불러오는 중" in info.value for info in at.info)
+    assert at.session_state.current_session is None
+
+
+def test_late_resource_does_not_block_the_run(mock_backend, app):
+    server, url = mock_backend(slow_paths={"/wrongnotes": 2.0})
+    at = app(url, "오답 노트", PAGE_DEADLINE=0.2)
+    start = time.perf_counter()
+    at.run()
+    assert time.perf_counter() - start < 1.5
+    assert not at.exception
+    # 푸터는 늦은 데이터를 기다리지 않고 그려짐
+    assert "TOEFL RC 복습 시스템 v1.0" in [c.value for c in at.sidebar.caption]
+
+    # 도착한 뒤 다시 실행하면 캐시에서 그림
+    time.sleep(2.5)
+    at.run()
+    assert not any("불러오는 중" in info.value for info in at.info)
+    assert server.state.stats["GET /wrongnotes"] == 1
+
+
+def test_settled_waits_for_every_late_future():
+    loader = PageLoader(max_workers=2)
+    gate = threading.Event()
+    load = loader.load({"/slow": lambda: gate.wait(5) and {"ok": True},
+                        "/fail": lambda: gate.wait(5) and None}, deadline=0.05)
+    assert sorted(load.late) == ["/fail", "/slow"]
+    assert PageLoader.settled(load) is None
+    gate.set()
+    for future in load.futures.values():
+        future.result()
+    assert PageLoader.settled(load) == ["/slow"]
+
+
+def test_settled_failures_are_not_refetched_after_the_watcher_rerun(mock_backend, app):
+    # watch_late 가 늦은 요청이 모두 실패로 끝난 것을 확인하고 다시 실행한 상황
+    server, url = mock_backend()
+    at = app(url, "오답 노트")
+    at.session_state["late_failed"] = ["/wrongnotes"]
+    at.run()
+    assert not at.exception
+    assert server.state.stats["GET /wrongnotes"] == 0
+    assert any("/wrongnotes" in w.value for w in at.sidebar.warning)
+    # 늦은 요청이 없으므로 다음 실행부터는 watcher 없이 평소처럼 요청
+    at.run()
+    assert server.state.stats["GET /wrongnotes"] == 1
@@ -0,0 +1,26 @@
+import time
+
+from recommender import SimilarNotes
+
+
+def wait_ready(index, notes, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not index.sync_in_background(notes):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_sync_in_background_serves_nothing_until_ready():
+    notes = [{"note_id": i, "question_text": f"glacier sediment question {i}",
+              "passage_text": "Glaciers move sediment."} for i in range(50)]
+    index = SimilarNotes()
+    assert index.sync_in_background(notes) is False
+    wait_ready(index, notes)
+    assert len(index) == 50
+    assert index.similar(0)
+
+    # 바뀐 목록은 다시 백그라운드에서 맞춤
+    changed = notes[:10]
+    assert index.sync_in_background(changed) is False
+    wait_ready(index, changed)
+    assert len(index) == 10
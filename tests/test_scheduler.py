@@ -0,0 +1,77 @@
+import pandas as pd
+
+from scheduler import SM2, batch_due_queues, compute_schedule, due_queue, due_questions
+
+
+def review(qid, day, correct=True):
+    return {"question_id": qid, "reviewed_at": f"2024-05-{day:02d}", "correct": correct}
+
+
+def test_compute_schedule_climbs_ladder_and_resets_on_wrong():
+    history = [review("a", 1), review("a", 2), review("a", 4),
+               review("b", 1), review("b", 2), review("b", 3, correct=False)]
+    schedule = compute_schedule(history).set_index("question_id")
+
+    # 연속 정답 3회 -> 사다리 네 번째 칸(7일)
+    assert schedule.loc["a", "streak"] == 3
+    assert schedule.loc["a", "interval"] == 7
+    assert schedule.loc["a", "next_due"] == pd.Timestamp("2024-05-11")
+    # 마지막이 오답 -> 첫 칸(1일)
+    assert schedule.loc["b", "streak"] == 0
+    assert schedule.loc["b", "interval"] == 1
+    assert schedule.loc["b", "reviews"] == 3
+
+
+def test_compute_schedule_shifts_rest_day():
+    # 2024-05-03(금) + 1일 = 토요일 -> 일요일로 미룸
+    schedule = compute_schedule([review("a", 3, correct=False)], rest_day="토요일")
+    assert schedule.loc[0, "next_due"] == pd.Timestamp("2024-05-05")
+
+
+def test_sm2_intervals():
+    history = [review("a", 1), review("a", 2), review("a", 8),
+               review("b", 1), review("b", 2, correct=False)]
+    schedule = compute_schedule(history, policy=SM2()).set_index("question_id")
+    # 1 -> 6 -> rint(6 * ease), 정답마다 ease 는 2.5 그대로
+    assert schedule.loc["a", "interval"] == 15
+    assert schedule.loc["b", "interval"] == 1
+
+
+def test_due_queue_orders_oldest_first_and_truncates():
+    schedule = pd.DataFrame({
+        "question_id": ["late", "older", "weak", "future"],
+        "streak": [2, 1, 0, 0],
+        "next_due": pd.to_datetime(["2024-05-10", "2024-05-01", "2024-05-10", "2024-05-20"]),
+    })
+    queue, backlog = due_queue(schedule, "2024-05-10")
+    assert list(queue["question_id"]) == ["older", "weak", "late"]
+    assert backlog == 0
+
+    queue, backlog = due_queue(schedule, "2024-05-10", daily_target="2")
+    assert list(queue["question_id"]) == ["older", "weak"]
+    assert backlog == 1
+
+    # 휴무일에는 큐가 비어 있음 (2024-05-11 은 토요일)
+    queue, backlog = due_queue(schedule, "2024-05-11", daily_target=2, rest_day="토요일")
+    assert queue.empty and backlog == 0
+
+
+def payload(seed, daily_target=None, rest_day=None):
+    reviews = [review(f"q{seed}-{i}", 1 + (i * seed) % 9, correct=(i + seed) % 3 != 0)
+               for i in range(12)]
+    reviews += [review(f"q{seed}-{i}", 10, correct=i % 2 == 0) for i in range(0, 12, 3)]
+    questions = [{"question_id": f"q{seed}-{i}"} for i in range(15)]
+    return {"reviews": reviews, "questions": questions,
+            "settings": {"daily_target": daily_target, "rest_day": rest_day}}
+
+
+def test_batch_matches_per_user():
+    payloads = {"u1": payload(1, daily_target=5), "u2": payload(2, rest_day="일요일"),
+                "u3": payload(3, daily_target="4", rest_day="토요일"), "u4": {}}
+    today = "2024-05-14"
+    queues, backlogs = batch_due_queues(payloads, today)
+    for user, data in payloads.items():
+        expected, backlog = due_questions(data, today)
+        got = queues[queues["user"] == user]["question_id"].tolist()
+        assert got == [q["question_id"] for q in expected]
+        assert backlogs[user] == backlog
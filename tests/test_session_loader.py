@@ -0,0 +1,89 @@
+import gc
+
+from api_client import ApiClient
+from session_loader import StudySession, TextStore
+
+
+def raw_question(q, passage=None, explanation=True):
+    passage = q if passage is None else passage
+    raw = {"question_id": q, "passage_id": passage, "question_text": f"Q{q}",
+           "options": ["A", "B"], "answer": "A",
+           "passage_title": f"Passage {passage}", "passage_text": f"text of passage {passage}"}
+    if explanation:
+        raw["explanation"] = f"explanation {q}"
+    return raw
+
+
+def test_evicted_passage_stays_while_session_is_open():
+    texts = TextStore(max_passages=2, max_explanations=2)
+    calls = []
+    session = StudySession([raw_question(q) for q in range(5)], fetch=calls.append, texts=texts)
+
+    # 다른 세션이 LRU 를 채워 이 세션의 지문/해설을 밀어냄
+    other = StudySession([raw_question(q) for q in range(10, 14)], texts=texts)
+    assert len(texts._passages) == 2
+
+    assert session.passage(0).text == "text of passage 0"
+    assert session.explanation(0) == "explanation 0"
+    assert calls == []
+
+    # 세션이 끝나면 밀려난 항목은 사라짐
+    del session, other
+    gc.collect()
+    assert texts.passage("1") is None
+    assert texts.explanation(1) is None
+    assert len(texts._live_passages) == 2
+
+
+def test_lite_payload_stops_fetching_when_backend_lacks_endpoint(mock_backend):
+    server, url = mock_backend(apps_script=True, unsupported=("/passage", "/explanation"))
+    client = ApiClient(url, max_retries=0)
+    texts = TextStore()
+    lite = [{k: v for k, v in raw_question(q).items() if not k.startswith("passage_t")
+             and k != "explanation"} for q in range(3)]
+
+    session = StudySession(lite, fetch=client.get, texts=texts)
+    assert session.passage(0) is None
+    assert session.explanation(0) is None
+    assert texts.unsupported == {"passage", "explanation"}
+    for idx in range(3):
+        session.passage(idx)
+        session.explanation(idx)
+    StudySession(lite, fetch=client.get, texts=texts).passage(1)
+    assert server.state.stats["GET /passage"] == 1
+    assert server.state.stats["GET /explanation"] == 1
+
+
+def test_prefetch_probes_missing_explanation_endpoint_once(mock_backend):
+    from concurrent.futures import ThreadPoolExecutor
+
+    server, url = mock_backend(apps_script=True, unsupported=("/explanation",))
+    client = ApiClient(url, max_retries=0)
+    texts = TextStore()
+    # 지문은 있고 해설만 빠진 /due 응답
+    questions = [raw_question(q, passage=0, explanation=False) for q in range(8)]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        session = StudySession(questions, fetch=client.get, executor=executor, texts=texts)
+        for idx in range(len(questions)):
+            session.prefetch(idx)
+            session.explanation(idx, timeout=5)
+    assert server.state.stats["GET /explanation"] == 1
+    assert server.state.stats["GET /passage"] == 0
+    assert texts.unsupported == {"explanation"}
+
+
+def test_prefetch_fetches_lite_payload_from_supporting_backend(mock_backend):
+    from concurrent.futures import ThreadPoolExecutor
+
+    server, url = mock_backend()
+    client = ApiClient(url, max_retries=0)
+    texts = TextStore()
+    lite = [{"question_id": q, "passage_id": 0, "question_text": "", "options": []} for q in range(4)]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        session = StudySession(lite, fetch=client.get, executor=executor, texts=texts)
+        session.prefetch(0)
+        assert session.passage(0, timeout=5).text == server.state.passages[0]["passage_text"]
+        for idx in range(4):
+            assert session.explanation(idx, timeout=5) == server.state.questions[idx]["explanation"]
+    assert texts.supported == {"passage", "explanation"}
+    assert server.state.stats["GET /explanation"] == 4
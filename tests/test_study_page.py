@@ -0,0 +1,19 @@
+def test_saved_answers_are_kept_per_browser_session(mock_backend, app):
+    server, url = mock_backend()
+    first = app(url, "오늘 학습")
+    first.run()
+    assert not first.exception
+    choice = first.radio[0].options[0]
+    first.radio[0].set_value(choice).run()
+
+    # 같은 DB 를 쓰는 다른 세션에는 답안이 복원되지 않음
+    second = app(url, "오늘 학습")
+    second.run()
+    assert second.session_state["client_id"] != first.session_state["client_id"]
+    assert second.radio[0].value is None
+
+    # 같은 탭을 새로고침하면 (URL 의 sid 가 같음) 이어서 복원
+    again = app(url, "오늘 학습")
+    again.query_params["sid"] = first.session_state["client_id"]
+    again.run()
+    assert again.radio[0].value == choice
@@ -0,0 +1,98 @@
+from api_client import ERROR_CONNECTION, ERROR_HTTP, ApiResult
+from local_store import LocalStore, SyncWorker
+
+
+class FakeClient:
+    """record 에 bad 가 있으면 묶음 전체를 거부하는 백엔드"""
+
+    def __init__(self, error=ERROR_HTTP, apps_script=False):
+        self.error = error
+        self.apps_script = apps_script
+        self.posts = []
+
+    def post(self, endpoint, payload):
+        self.posts.append((endpoint, payload))
+        records = payload if isinstance(payload, list) else [payload]
+        if any(r.get("bad") for r in records):
+            if self.apps_script:
+                return ApiResult(data={"success": False, "error": "invalid record"}, status=200)
+            return ApiResult(error=self.error, status=500 if self.error == ERROR_HTTP else None)
+        return ApiResult(data={"success": True}, status=200)
+
+
+def make(tmp_path, client, **kwargs):
+    store = LocalStore(str(tmp_path / "outbox.db"))
+    kwargs.setdefault("base_delay", 0)
+    return store, SyncWorker(store, client, **kwargs)
+
+
+def attempts(store):
+    return {row["payload"][0]["question_id"]: row["attempts"] for row in store.pending(now=float("inf"))}
+
+
+def test_rejected_batch_is_retried_row_by_row(tmp_path):
+    client = FakeClient()
+    store, worker = make(tmp_path, client)
+    for qid in range(5):
+        store.enqueue("/submit", [{"question_id": qid, "bad": qid == 2}])
+    assert worker.flush() == 4
+    assert attempts(store) == {2: 1}
+    # 묶음 1번 + 한 건씩 5번
+    assert len(client.posts) == 6
+
+
+def test_backend_error_body_counts_as_failure(tmp_path):
+    store, worker = make(tmp_path, FakeClient(apps_script=True))
+    store.enqueue("/submit", [{"question_id": 1, "bad": True}])
+    store.enqueue("/submit", [{"question_id": 2}])
+    assert worker.flush() == 1
+    assert attempts(store) == {1: 1}
+
+
+def test_transport_failure_backs_off_each_row_by_its_own_attempts(tmp_path):
+    client = FakeClient(error=ERROR_CONNECTION)
+    store, worker = make(tmp_path, client, base_delay=10)
+    store.enqueue("/submit", [{"question_id": 1, "bad": True}])
+    store._execute("UPDATE outbox SET attempts = 3")
+    store.enqueue("/submit", [{"question_id": 2}])
+    assert worker.flush() == 0
+    # 연결 실패는 한 건씩 다시 보내지 않음
+    assert len(client.posts) == 1
+    rows = {r["idempotency_key"]: r for r in store._execute("SELECT * FROM outbox")}
+    delays = sorted(r["next_attempt_at"] for r in rows.values())
+    assert delays[1] - delays[0] > 60      # 10 * 2**3 vs 10 * 2**0
+    assert attempts(store) == {1: 4, 2: 1}
+
+
+def test_rows_past_the_attempt_cap_move_to_dead_letters(tmp_path):
+    store, worker = make(tmp_path, FakeClient(), max_attempts=3)
+    store.enqueue("/submit", [{"question_id": 1, "bad": True}])
+    store.enqueue("/settings", {"bad": True})
+    for _ in range(3):
+        worker.flush()
+    assert store.pending_count() == 0
+    assert store.dead_count() == 2
+    dead = store.dead_letters()
+    assert {d["endpoint"] for d in dead} == {"/submit", "/settings"}
+    assert all(d["attempts"] == 3 for d in dead)
+
+    assert store.requeue_dead() == 2
+    assert store.dead_count() == 0
+    assert store.pending_count() == 2
+    assert all(row["attempts"] == 0 for row in store.pending())
+
+
+def test_sidebar_requeues_dead_letters(mock_backend, app, tmp_path):
+    store = LocalStore(str(tmp_path / "app.db"))
+    store.enqueue("/settings", {"rest_day": None, "daily_target": 12, "email": ""})
+    store.mark_dead([row["id"] for row in store.pending()], "http: 500")
+    server, url = mock_backend()
+    at = app(url, "오답 노트")
+    at.run()
+    assert not at.exception
+    assert any("전송 실패 1건" in w.value for w in at.sidebar.warning)
+
+    at.sidebar.button[0].click().run()
+    assert not at.exception
+    assert store.dead_count() == 0
+    store.close()
@@ -0,0 +1,45 @@
+from tag_editor import TagDiff
+
+TAGS = [{"tag_id": 1, "name": "a"}, {"tag_id": 2, "name": "b"}, {"tag_id": 3, "name": "c"}]
+
+
+def apply_steps(tags, steps):
+    """/skill-tags 를 하나씩 처리하는 백엔드 (이름은 항상 유일해야 함)"""
+    names = {t["tag_id"]: t["name"] for t in tags}
+    next_id = max(names) + 1
+    for step in steps:
+        if step["action"] == "delete":
+            del names[step["tag_id"]]
+            continue
+        assert step["name"] not in names.values(), step
+        if step["action"] == "update":
+            names[step["tag_id"]] = step["name"]
+        else:
+            names[next_id] = step["name"]
+            next_id += 1
+    return names
+
+
+def test_swap_keeps_both_tags():
+    diff = TagDiff({"a": "b", "b": "a"})
+    steps = diff.steps(TAGS)
+    assert not any(s["action"] == "delete" for s in steps)
+    assert apply_steps(TAGS, steps) == {1: "b", 2: "a", 3: "c"}
+
+
+def test_chain_renames_in_dependency_order():
+    diff = TagDiff({"a": "b", "b": "c", "c": "d"})
+    steps = diff.steps(TAGS)
+    assert not any(s["action"] == "delete" for s in steps)
+    assert apply_steps(TAGS, steps) == {1: "b", 2: "c", 3: "d"}
+
+
+def test_merge_deletes_only_the_merged_tag():
+    diff = TagDiff({"a": "c"}, ["e"])
+    names = apply_steps(TAGS, diff.steps(TAGS))
+    assert names == {2: "b", 3: "c", 4: "e"}
+
+
+def test_merge_of_renamed_tags_and_delete():
+    diff = TagDiff({"a": "x", "b": "x", "c": None})
+    assert apply_steps(TAGS, diff.steps(TAGS)) == {1: "x"}
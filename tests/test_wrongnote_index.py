@@ -0,0 +1,35 @@
+import pytest
+
+from wrongnote_index import WrongNoteIndex
+
+NOTES = [
+    {"note_id": 1, "skill_tags": ["a"], "date_added": "2026-01-01", "wrong_count": 1},
+    {"note_id": 2, "skill_tags": ["b"], "date_added": "2026-01-02", "wrong_count": 2},
+    {"note_id": 3, "skill_tags": ["a", "b"], "date_added": "2026-01-03", "wrong_count": 3},
+]
+
+
+def test_or_filter_ignores_tags_without_notes():
+    index = WrongNoteIndex(NOTES)
+    assert list(index.query(["zzz"], mode="or")) == []
+    assert sorted(index.query(["a", "zzz"], mode="or")) == [0, 2]
+
+
+def test_and_filter_with_unknown_tag_is_empty():
+    index = WrongNoteIndex(NOTES)
+    assert list(index.query(["a", "zzz"], mode="and")) == []
+    assert sorted(index.query(["a", "b"], mode="and")) == [2]
+
+
+def test_from_table_matches_list_index_without_building_a_frame():
+    pa = pytest.importorskip("pyarrow")
+    table = pa.concat_tables([pa.Table.from_pylist(NOTES[:2]), pa.Table.from_pylist(NOTES[2:])])
+    archived, live = WrongNoteIndex.from_table(table), WrongNoteIndex(NOTES)
+
+    assert archived.frame is None
+    assert archived.tags() == live.tags()
+    for sort_by in ("date_added", "wrong_count"):
+        assert list(archived.query(["a"], sort_by=sort_by)) == list(live.query(["a"], sort_by=sort_by))
+    rows = archived.rows(archived.query(), ["note_id", "wrong_count"])
+    assert rows.to_dict("records") == [{"note_id": 3, "wrong_count": 3}, {"note_id": 2, "wrong_count": 2},
+                                       {"note_id": 1, "wrong_count": 1}]
@@ -0,0 +1,11 @@
+def test_delete_note_from_detail_view(mock_backend, app):
+    server, url = mock_backend(notes=20)
+    at = app(url, "오답 노트")
+    at.run()
+    assert not at.exception
+    before = set(server.state.notes)
+
+    next(b for b in at.button if b.label == "삭제").click().run()
+
+    assert not at.exception
+    assert len(server.state.notes) == len(before) - 1
@@ -0,0 +1,199 @@
+import streamlit as st
+
+from analytics import ReviewAnalytics, calendar_heatmap, daily_counts_from_entries
+from chart_cache import ChartCache, render_heatmap, render_weak_skills
+from common import api_get, api_post, fragment, get_archive, get_setting, show_loading
+from instrumentation import timed
+
+# 히트맵 기간 (일)
+HEATMAP_WINDOWS = [14, 28, 56, 84]
+
+
+# 렌더링된 차트 캐시 (프로세스당 하나, 세션 간 공유)
+@st.cache_resource
+def get_chart_cache():
+    return ChartCache()
+
+# 복습 기록 집계 (백엔드 URL 당 하나, 새 제출만 누적)
+@st.cache_resource
+def _review_analytics(base_url):
+    return ReviewAnalytics()
+
+def get_review_analytics():
+    # True 이면 /history 의 복습 기록으로 취약 유형/히트맵/추이를 직접 계산
+    if not get_setting("LOCAL_ANALYTICS", False):
+        return None
+    history = api_get("/history")
+    if not history:
+        return None
+    analytics = _review_analytics(get_setting("API_BASE_URL", "YOUR_APPS_SCRIPT_URL"))
+    analytics.update(history)
+    return analytics
+
+# 유형별 정답률 추이 / 기억 유지 곡선
+def render_trends(analytics):
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("📉 유형별 주간 정답률")
+        trend = analytics.skill_trend()
+        if not trend.empty:
+            st.line_chart(trend.tail(12))
+    with col2:
+        st.subheader("🧠 복습 간격별 정답률")
+        curve = analytics.retention_curve()
+        if not curve.empty:
+            st.line_chart(curve['accuracy'])
+            st.caption("직전 복습 후 경과 일수별 정답률 (x축: 일)")
+
+# 이 페이지가 쓰는 GET (toefl_app 이 렌더링 전에 동시에 받아 둠)
+def resources():
+    return ["/dashboard"] + (["/history"] if get_setting("LOCAL_ANALYTICS", False) else [])
+
+def load_dashboard():
+    with timed("dashboard.load"):
+        return api_get("/dashboard")
+
+# 히트맵 (기간을 바꾸면 이 부분만 다시 그림)
+@fragment
+def render_heatmap_panel():
+    dashboard_data = load_dashboard() or {}
+    analytics = get_review_analytics()
+    # 백엔드 히트맵은 받은 기간만, 로컬 집계는 기간 선택 가능
+    heatmap_data = dashboard_data.get('heatmap', [])
+    window = len(heatmap_data) or 14
+    if analytics:
+        window = st.select_slider("기간 (일)", HEATMAP_WINDOWS, value=14)
+    st.subheader(f"📅 최근 {window}일 학습 히트맵")
+    if analytics or heatmap_data:
+        # 실제 날짜의 요일에 맞춰 주 단위 행으로 배치
+        if analytics:
+            chart = analytics.heatmap(window)
+        else:
+            chart = calendar_heatmap(daily_counts_from_entries(heatmap_data), window,
+                                     end=max(d['date'] for d in heatmap_data))
+        with timed("dashboard.heatmap_chart"):
+            st.image(get_chart_cache().get_or_render('heatmap', chart, render_heatmap))
+    elif not show_loading("/dashboard", "/history"):
+        st.info("학습 기록이 없습니다.")
+
+# 월별 보관본 (ARCHIVE_DIR 을 설정한 경우, 파티션별 열 연산으로 바로 집계)
+@fragment
+def render_archive():
+    archive = get_archive()
+    st.subheader("🗄️ 월별 기록 (보관본)")
+    
+    # 저장을 먼저 처리해 아래 집계에 바로 반영
+    if st.button("📦 지금 스냅샷 저장"):
+        history = api_get("/history")
+        wrong_notes = api_get("/wrongnotes")
+        if history is None or wrong_notes is None:
+            st.error("기록을 불러오지 못해 저장하지 않았습니다.")
+        else:
+            with timed("dashboard.archive_snapshot"):
+                stats = archive.snapshot(history, wrong_notes.get('notes', []))
+            st.success(" · ".join(f"{kind} {s['rows']}건: {s['written']}개월 저장, "
+                                  f"{s['skipped']}개월 변경 없음" for kind, s in stats.items()))
+    
+    with timed("dashboard.archive_summary"):
+        summary = archive.review_summary()
+    if summary.empty:
+        st.info("보관된 복습 기록이 없습니다.")
+        return
+    col1, col2 = st.columns(2)
+    with col1:
+        st.bar_chart(summary['reviews'])
+        st.caption("월별 복습 수")
+    with col2:
+        st.line_chart(summary['accuracy'])
+        st.caption("월별 정답률")
+
+# 설정 (입력 중에는 차트/지표를 다시 그리지 않음)
+@fragment
+def render_settings():
+    dashboard_data = load_dashboard() or {}
+    st.subheader("⚙️ 설정")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        rest_day = st.radio("휴무일 선택", 
+                          ["없음", "토요일", "일요일"],
+                          index=["없음", "토요일", "일요일"].index(
+                              dashboard_data.get('rest_day', '없음')))
+    
+    with col2:
+        daily_target = st.number_input("일일 목표 문항", 
+                                      value=dashboard_data.get('daily_target', 10),
+                                      min_value=1, max_value=50)
+    
+    with col3:
+        email = st.text_input("알림 이메일", 
+                             value=dashboard_data.get('email', ''))
+    
+    if st.button("설정 저장"):
+        settings_data = {
+            'rest_day': rest_day if rest_day != "없음" else None,
+            'daily_target': daily_target,
+            'email': email
+        }
+        result = api_post("/settings", settings_data)
+        if result:
+            st.success("설정이 저장되었습니다!")
+        else:
+            st.error("설정 저장 실패")
+
+# Dashboard 페이지
+def render():
+    st.title("📊 TOEFL RC 학습 대시보드")
+    
+    # 대시보드 데이터 로드
+    dashboard_data = load_dashboard()
+    with timed("dashboard.analytics"):
+        analytics = get_review_analytics()
+    
+    if dashboard_data:
+        # 메트릭 카드
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("오늘 목표", f"{dashboard_data.get('due_today', 0)}/{dashboard_data.get('daily_target', 10)}")
+        with col2:
+            st.metric("누적 학습일", dashboard_data.get('total_days', 0))
+        with col3:
+            st.metric("연속 학습일", dashboard_data.get('streak_days', 0))
+        with col4:
+            st.metric("백로그", dashboard_data.get('backlog', 0))
+        
+        st.divider()
+        
+        # 차트 영역
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("📈 취약 유형 TOP 3")
+            weak_skills = analytics.weak_skills() if analytics else dashboard_data.get('weak_skills', [])
+            if weak_skills:
+                chart = {
+                    'skills': [s['skill'] for s in weak_skills[:3]],
+                    'counts': [s['wrong_count'] for s in weak_skills[:3]],
+                }
+                with timed("dashboard.weak_skills_chart"):
+                    st.image(get_chart_cache().get_or_render('weak_skills', chart, render_weak_skills))
+            elif not show_loading("/history"):
+                st.info("아직 분석할 데이터가 없습니다.")
+        
+        with col2:
+            render_heatmap_panel()
+        
+        if analytics:
+            render_trends(analytics)
+        
+        if get_archive() is not None:
+            render_archive()
+        
+        st.divider()
+        
+        # 설정 영역
+        render_settings()
+    else:
+        show_loading("/dashboard")
@@ -0,0 +1,38 @@
+import pandas as pd
+import streamlit as st
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 1)
+
+# 사이드바 디버그 패널 (직전 rerun 의 구간/요청 시간과 누적 엔드포인트 통계)
+def render(rerun, metrics):
+    with st.sidebar.expander("🛠 디버그", expanded=False):
+        st.caption(f"rerun {_ms(rerun.duration)} ms · API {len(rerun.requests)}건 · "
+                   f"캐시 적중 {rerun.cache_hits}건")
+        if rerun.session_state_bytes is not None:
+            st.caption(f"session_state {rerun.session_state_bytes / 1024:.1f} KB")
+
+        if rerun.sections:
+            st.write("**구간**")
+            st.dataframe(pd.DataFrame([{"구간": n, "ms": _ms(s)} for n, s in rerun.sections]),
+                         hide_index=True, use_container_width=True)
+        if rerun.requests:
+            st.write("**요청**")
+            st.dataframe(pd.DataFrame([{"요청": f"{m} {e}", "ms": _ms(s), "KB": round(b / 1024, 1),
+                                        "오류": err or ""}
+                                       for m, e, s, b, err in rerun.requests]),
+                         hide_index=True, use_container_width=True)
+
+        # 누적 통계 (p50/p95 는 히스토그램 버킷 상한 근사값)
+        rows = [{"요청": f"{m} {e}", "횟수": h.count, "p50 ms": _ms(h.quantile(0.5)),
+                 "p95 ms": _ms(h.quantile(0.95)), "KB": round(metrics.payload_bytes[(m, e)] / 1024, 1)}
+                for (m, e), h in list(metrics.request_latency.items())]
+        if rows:
+            st.write("**엔드포인트 누적**")
+            st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+
+        st.download_button("rerun 로그 (JSONL)", metrics.jsonl(), file_name="reruns.jsonl",
+                           mime="application/x-ndjson")
+        st.download_button("Prometheus 지표", metrics.prometheus_text(), file_name="metrics.prom",
+                           mime="text/plain")
@@ -0,0 +1,286 @@
+from datetime import datetime
+
+import streamlit as st
+
+from common import (api_get, api_post, fragment, get_api_client, get_local_store, get_setting,
+                    is_warm, load_skill_tags, queue_post, show_loading)
+from instrumentation import timed
+from session_loader import StudySession, TextStore, make_executor, render_passage_html
+
+
+# 지문/해설 prefetch 용 스레드 풀 (프로세스당 하나)
+@st.cache_resource
+def get_prefetch_executor():
+    return make_executor()
+
+# 지문/해설 공유 저장소 (백엔드 URL 당 하나, 모든 학습 세션이 키로 참조)
+@st.cache_resource
+def _text_store(base_url):
+    return TextStore()
+
+# 오늘 due 문항으로 학습 세션 생성 (세션에는 문항 배열과 텍스트 키만 보관)
+def start_study_session(questions):
+    return StudySession(questions, fetch=get_api_client().get, executor=get_prefetch_executor(),
+                        texts=_text_store(get_setting("API_BASE_URL", "YOUR_APPS_SCRIPT_URL")))
+
+# due 큐를 로컬에서 계산할지 (LOCAL_SCHEDULING)
+# 일일 배치가 이 날짜의 큐를 미리 계산해 뒀으면 계산하지 않고 그 결과를 읽는다
+def schedules_locally(due_endpoint):
+    return get_setting("LOCAL_SCHEDULING", False) and not is_warm(due_endpoint)
+
+# 이 페이지가 쓰는 GET (toefl_app 이 렌더링 전에 동시에 받아 둠). 세션이 있으면 큐는 다시 받지 않음
+def resources():
+    if st.session_state.current_session:
+        return []
+    due_endpoint = f"/due?date={datetime.now().strftime('%Y-%m-%d')}"
+    endpoints = ["/history" if schedules_locally(due_endpoint) else due_endpoint]
+    if get_setting("RECOMMEND_TOP_UP", False):
+        endpoints += ["/history", "/wrongnotes"]
+    return endpoints
+
+# 오늘 due 문항 로드
+def load_due_questions(today):
+    due_endpoint = f"/due?date={today}"
+    # True 이면 /history 의 복습 기록으로 due 큐를 로컬에서 계산 (/due 는 대체 경로)
+    if schedules_locally(due_endpoint):
+        history = api_get("/history")
+        if history and history.get('questions'):
+            import scheduler
+            questions, _ = scheduler.due_questions(history, today)
+            return questions
+    due_data = api_get(due_endpoint)
+    return due_data.get('questions') if due_data else None
+
+# 추천 후보 문항 색인 (/history 의 문항, 백엔드 URL 당 하나)
+@st.cache_resource
+def _question_recommender(base_url):
+    from recommender import SimilarNotes  # numpy 는 RECOMMEND_TOP_UP 으로 채울 때만 import
+    return SimilarNotes(key=lambda q, row: q['question_id'])
+
+# due 큐가 일일 목표보다 짧으면 최근 오답 노트와 비슷한 문항으로 채움
+def top_up_questions(questions, recent_notes=20):
+    history = api_get("/history")
+    notes = (api_get("/wrongnotes") or {}).get('notes', [])
+    if not (history and history.get('questions') and notes):
+        return questions, 0
+    target = (history.get('settings') or {}).get('daily_target')
+    missing = int(target or 0) - len(questions)
+    if missing <= 0:
+        return questions, 0
+    index = _question_recommender(get_setting("API_BASE_URL", "YOUR_APPS_SCRIPT_URL"))
+    # 색인을 백그라운드에서 만드는 동안은 채우지 않음
+    if not index.sync_in_background(history['questions']):
+        return questions, 0
+    recent = sorted(notes, key=lambda n: str(n.get('date_added') or ''), reverse=True)[:recent_notes]
+    ranked = index.recommend(recent, k=missing, exclude={q['question_id'] for q in questions})
+    by_id = {q['question_id']: q for q in history['questions']}
+    extra = [by_id[key] for key, _ in ranked]
+    return questions + extra, len(extra)
+
+# 문항 패널 (답안/플래그를 바꾸면 지문을 제외한 이 부분만 다시 실행)
+@fragment
+def render_question_panel():
+    session = st.session_state.current_session
+    questions = session.questions
+    idx = st.session_state.current_question_idx
+    current_q = session.question(idx)
+    
+    st.subheader("❓ 문항")
+    
+    if not st.session_state.show_results:
+        # 문항 표시
+        st.write(current_q.text)
+        
+        # 선택지 (세션 생성 시 파싱됨)
+        options = current_q.options
+        q_id = current_q.question_id
+        saved_answer = session.answer(idx)
+        
+        answer = st.radio(
+            "답안 선택:",
+            options,
+            key=f"q_{q_id}",
+            index=None if saved_answer is None else options.index(saved_answer)
+        )
+        
+        # 플래그
+        flagged = st.checkbox("🚩 플래그 표시", value=session.flagged(idx))
+        
+        if answer and session.set_answer(idx, answer, flagged):
+            get_local_store()[0].save_answer(st.session_state.study_key,
+                                             q_id, answer, flagged)
+        
+        # 네비게이션
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            if st.button("◀ 이전") and st.session_state.current_question_idx > 0:
+                st.session_state.current_question_idx -= 1
+                st.rerun()
+        
+        with col2:
+            if st.session_state.current_question_idx == len(questions) - 1:
+                if st.button("제출하기", type="primary"):
+                    st.session_state.show_results = True
+                    st.rerun()
+        
+        with col3:
+            if st.button("다음 ▶") and st.session_state.current_question_idx < len(questions) - 1:
+                st.session_state.current_question_idx += 1
+                st.rerun()
+    
+    else:
+        # 결과 표시
+        st.success("✅ 제출 완료!")
+        
+        # 채점 결과
+        q_id = current_q.question_id
+        user_answer = session.answer(idx) or ''
+        correct_answer = current_q.answer
+        is_correct = user_answer == correct_answer
+        
+        if is_correct:
+            st.success(f"정답입니다! ✅")
+        else:
+            st.error(f"오답입니다. 정답: {correct_answer}")
+            st.write(f"당신의 답: {user_answer}")
+        
+        # 해설
+        st.write("**해설:**")
+        st.info(session.explanation(idx) or 'No explanation available.')
+        
+        # 오답노트 추가
+        if not is_correct:
+            with st.expander("오답노트에 추가"):
+                # 스킬 태그 로드
+                tags = load_skill_tags()
+                tag_names = [t['name'] for t in tags]
+                
+                # 태그 선택
+                selected_tags = st.multiselect("유형 태그 선택", tag_names)
+                
+                # 새 태그 추가
+                new_tag = st.text_input("새 태그 추가")
+                if st.button("태그 추가") and new_tag:
+                    result = api_post("/skill-tags", {
+                        'action': 'create',
+                        'name': new_tag
+                    })
+                    if result:
+                        st.success(f"태그 '{new_tag}' 추가됨")
+                        load_skill_tags()
+                        st.rerun()
+                
+                # 메모
+                memo = st.text_area("메모")
+                
+                if st.button("오답노트 저장"):
+                    # 제출 데이터 준비
+                    submit_data = [{
+                        'question_id': q_id,
+                        'user_answer': user_answer,
+                        'correct': False,
+                        'flagged': session.flagged(idx),
+                        'add_to_wrongnote': True,
+                        'memo': memo,
+                        'skill_tags': selected_tags
+                    }]
+                    
+                    queue_post("/submit", submit_data)
+                    st.success("오답노트에 저장되었습니다!")
+        
+        # 다음 문항으로
+        if st.session_state.current_question_idx < len(questions) - 1:
+            if st.button("다음 문항 ▶"):
+                st.session_state.current_question_idx += 1
+                st.session_state.show_results = False
+                st.rerun()
+        else:
+            st.balloons()
+            st.success("모든 문항을 완료했습니다! 🎉")
+            
+            # 전체 제출
+            if st.button("학습 종료"):
+                # 모든 답안 제출
+                submit_data = []
+                for i in session.answered():
+                    q = questions[i]
+                    user_ans = session.answer(i)
+                    submit_data.append({
+                        'question_id': q.question_id,
+                        'user_answer': user_ans,
+                        'correct': user_ans == q.answer,
+                        'flagged': session.flagged(i),
+                        'add_to_wrongnote': False,
+                        'memo': '',
+                        'skill_tags': []
+                    })
+                
+                queue_post("/submit", submit_data)
+                get_local_store()[0].clear_answers(st.session_state.study_key)
+                st.success("학습 기록이 저장되었습니다!")
+                # 세션 초기화
+                st.session_state.current_session = None
+                st.session_state.current_question_idx = 0
+                st.session_state.show_results = False
+                st.rerun()
+
+# 오늘 학습 페이지
+def render():
+    st.title("📚 오늘의 학습")
+    
+    # 마감까지 오지 않은 데이터로 세션을 만들지 않음 (빈 큐로 보이지 않도록)
+    if not st.session_state.current_session and show_loading(*resources()):
+        return
+    
+    # 오늘 due 문항 로드
+    if not st.session_state.current_session:
+        today = datetime.now().strftime('%Y-%m-%d')
+        with timed("study.load_due"):
+            due_questions = load_due_questions(today)
+        
+        # RECOMMEND_TOP_UP: 짧은 큐를 비슷한 문항으로 채움 (휴무일 등 빈 큐는 그대로)
+        if due_questions and get_setting("RECOMMEND_TOP_UP", False):
+            with timed("study.top_up"):
+                due_questions, added = top_up_questions(due_questions)
+            if added:
+                st.toast(f"최근 오답과 비슷한 문항 {added}개를 추가했습니다.")
+        
+        if due_questions:
+            session = start_study_session(due_questions)
+            # 같은 탭에서 같은 날 중단된 세션의 답안 복원 (다른 탭/사용자의 답안과 섞이지 않도록 탭 id 로 구분)
+            study_key = f"{st.session_state.client_id}:{today}"
+            session.restore_answers(get_local_store()[0].load_answers(study_key))
+            st.session_state.current_session = session
+            st.session_state.study_key = study_key
+            st.session_state.current_question_idx = 0
+            st.session_state.show_results = False
+    
+    if st.session_state.current_session:
+        session = st.session_state.current_session
+        questions = session.questions
+        # 사용자가 푸는 동안 다음 문항들의 지문/해설을 미리 받아둠
+        session.prefetch(st.session_state.current_question_idx)
+        
+        # 진행률 표시
+        progress = (st.session_state.current_question_idx + 1) / len(questions)
+        st.progress(progress)
+        st.write(f"문항 {st.session_state.current_question_idx + 1} / {len(questions)}")
+        
+        # 레이아웃: 좌측 지문, 우측 문항
+        col1, col2 = st.columns([1, 1])
+        
+        with col1:
+            st.subheader("📖 지문")
+            # 지문 컨테이너 (스크롤 가능)
+            passage_container = st.container()
+            with passage_container:
+                with timed("study.passage"):
+                    passage = session.passage(st.session_state.current_question_idx)
+                st.markdown(passage.html if passage else render_passage_html(None, None),
+                            unsafe_allow_html=True)
+        
+        with col2:
+            render_question_panel()
+    else:
+        st.info("오늘 학습할 문항이 없습니다. 🎯")
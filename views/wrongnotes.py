@@ -0,0 +1,418 @@
+import streamlit as st
+
+from api_client import backend_error, confirmed, unsupported
+from common import (api_get, api_post, fragment, get_api_client, get_archive, get_local_store,
+                    get_setting, invalidate_for_write, load_skill_tags, queue_post, show_loading)
+from instrumentation import timed
+from note_search import NoteSearchIndex, note_key
+from recommender import SimilarNotes
+from tag_editor import BATCH_ENDPOINT, TagDiff
+from wrongnote_index import WrongNoteIndex
+
+# 정렬 옵션 -> (정렬 기준, 내림차순 여부)
+SORT_OPTIONS = {
+    "최신순": ('date_added', True),
+    "오래된순": ('date_added', False),
+    "오답 횟수순": ('wrong_count', True),
+}
+# 목록 한 페이지의 행 수
+PAGE_SIZES = [50, 100, 200, 500]
+# 보관본 탭에서 읽는 열 (지문/해설 같은 긴 열은 열지 않음)
+ARCHIVE_COLUMNS = ['note_id', 'date_added', 'question_text', 'skill_tags', 'wrong_count']
+
+
+# 이 페이지가 쓰는 GET (toefl_app 이 렌더링 전에 동시에 받아 둠)
+def resources():
+    return ["/wrongnotes", "/skill-tags"]
+
+# 오답 노트 색인 (백엔드 URL 당 하나를 모든 세션이 공유, /wrongnotes 응답이 바뀔 때만 다시 생성)
+@st.cache_resource
+def _wrongnote_index_slot(base_url):
+    return {}
+
+def get_wrongnote_index(notes):
+    slot = _wrongnote_index_slot(get_setting("API_BASE_URL", "YOUR_APPS_SCRIPT_URL"))
+    index = slot.get('index')
+    if index is None or index.source is not notes:
+        index = slot['index'] = WrongNoteIndex(notes)
+    return index
+
+# 전문 검색 색인 (백엔드 URL 당 하나, 노트가 바뀐 만큼만 갱신)
+@st.cache_resource
+def _search_index(base_url):
+    return NoteSearchIndex()
+
+def get_search_index(notes=None):
+    index = _search_index(get_setting("API_BASE_URL", "YOUR_APPS_SCRIPT_URL"))
+    if notes is not None:
+        index.sync(notes)
+    return index
+
+# 비슷한 오답 추천 색인 (백엔드 URL 당 하나, 바뀐 노트만 다시 벡터화)
+@st.cache_resource
+def _similar_notes(base_url):
+    return SimilarNotes()
+
+def get_similar_notes(notes=None):
+    # notes 를 주면 그 노트로 맞춘 색인, 백그라운드에서 아직 만드는 중이면 None
+    index = _similar_notes(get_setting("API_BASE_URL", "YOUR_APPS_SCRIPT_URL"))
+    if notes is not None and not index.sync_in_background(notes):
+        return None
+    return index
+
+# 검색/필터/정렬 위젯 값으로 행 번호 계산 (목록과 상세 보기 fragment 가 함께 사용)
+def query_rows(notes):
+    index = get_wrongnote_index(notes)
+    search_query = st.session_state.get('note_search', '').strip()
+    selected_tags = st.session_state.get('note_tags', [])
+    tag_mode = st.session_state.get('note_tag_mode', "AND").lower()
+    sort_key, descending = SORT_OPTIONS[st.session_state.get('note_sort', "최신순")]
+    with timed("wrongnotes.query"):
+        if search_query:
+            ranked = get_search_index(notes).search(search_query)
+            return index, index.search(ranked, selected_tags, tag_mode)
+        return index, index.query(selected_tags, tag_mode, sort_key, descending)
+
+# 현재 페이지의 행 번호 (페이지 위젯 값은 이전 실행에서 session_state 에 들어 있음)
+def page_rows(rows):
+    size = st.session_state.get('note_page_size', PAGE_SIZES[0])
+    pages = max(1, -(-len(rows) // size))
+    page = min(st.session_state.get('note_page', 1), pages)
+    return rows[(page - 1) * size:page * size], page, pages
+
+# 오답 목록 (검색/필터를 바꾸면 이 탭만 다시 실행)
+@fragment
+def render_note_list():
+    with timed("wrongnotes.load"):
+        wrong_notes = api_get("/wrongnotes")
+    
+    if not (wrong_notes and wrong_notes.get('notes')):
+        if not show_loading("/wrongnotes"):
+            st.info("오답 노트가 비어있습니다.")
+        return
+    
+    # 검색 (따옴표: 구문, 끝에 *: 접두어)
+    st.text_input("검색", placeholder='예: glacier inference, "빙하 이동", sedim*', key="note_search")
+    
+    # 필터링
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        # 스킬 태그 필터 (비어 있으면 전체)
+        tags = load_skill_tags()
+        tag_names = [t['name'] for t in tags]
+        st.multiselect("유형 필터", tag_names, placeholder="전체", key="note_tags")
+    
+    with col2:
+        st.radio("태그 조건", ["AND", "OR"], horizontal=True, key="note_tag_mode")
+    
+    with col3:
+        # 정렬
+        st.selectbox("정렬 기준", list(SORT_OPTIONS), key="note_sort")
+    
+    # 색인으로 필터/정렬 (프레임 재생성 없이 행 번호만 계산)
+    index, rows = query_rows(wrong_notes['notes'])
+    if st.session_state.note_search.strip():
+        st.caption(f"검색 결과 {len(rows)}건 (관련도순)")
+    
+    # 테이블 표시 (현재 페이지만)
+    shown, page, pages = page_rows(rows)
+    with timed("wrongnotes.table"):
+        st.dataframe(
+            index.rows(shown, ['date_added', 'question_text', 'skill_tags', 'wrong_count']),
+            use_container_width=True,
+            hide_index=True
+        )
+    
+    # 페이지 이동 (필터로 행 수가 줄면 마지막 페이지로 맞춤)
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        start = (page - 1) * st.session_state.get('note_page_size', PAGE_SIZES[0])
+        st.caption(f"전체 {len(rows)}건 중 {start + 1 if len(shown) else 0}-{start + len(shown)}")
+    with col2:
+        if st.session_state.get('note_page', 1) > pages:
+            st.session_state.note_page = pages
+        st.number_input("페이지", min_value=1, max_value=pages, key="note_page")
+    with col3:
+        st.selectbox("페이지 크기", PAGE_SIZES, key="note_page_size")
+    
+    render_note_detail()
+
+# 상세 보기 (문항을 바꿔도 테이블은 다시 그리지 않음)
+@fragment
+def render_note_detail():
+    wrong_notes = api_get("/wrongnotes") or {}
+    index, rows = query_rows(wrong_notes.get('notes', []))
+    
+    st.subheader("상세 보기")
+    rows = page_rows(rows)[0]
+    if not len(rows):
+        return
+    question_texts = index.frame['question_text']
+    selected_idx = st.selectbox("문항 선택", rows, 
+                               format_func=lambda x: f"{question_texts.iat[x][:50]}...")
+    
+    if selected_idx is not None:
+        note = index.frame.iloc[selected_idx]
+        # 요청/색인에는 원본 dict 의 값을 사용 (프레임 값은 numpy 타입이라 JSON 으로 보낼 수 없음)
+        source = wrong_notes['notes'][selected_idx]
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.write("**문항:**")
+            st.write(note['question_text'])
+            st.write(f"**정답:** {note['correct_answer']}")
+            st.write(f"**내 답:** {note['user_answer']}")
+        
+        with col2:
+            st.write("**해설:**")
+            st.info(note.get('explanation', 'No explanation'))
+            st.write("**메모:**")
+            st.write(note.get('why_wrong', 'No memo'))
+        
+        # 비슷한 문항 중 함께 틀린 것 (문항/지문 TF-IDF 유사도)
+        with timed("wrongnotes.similar"):
+            similar_notes = get_similar_notes(wrong_notes['notes'])
+            similar = similar_notes.similar(note_key(source, selected_idx)) if similar_notes is not None else []
+        similar = [(index.row_of[key], score) for key, score in similar if key in index.row_of]
+        if similar_notes is None:
+            st.caption("비슷한 오답을 찾기 위한 색인을 만드는 중입니다.")
+        elif similar:
+            st.write("**비슷한 문항에서 틀린 오답:**")
+            table = index.rows([row for row, _ in similar], ['question_text', 'skill_tags', 'wrong_count'])
+            st.dataframe(table.assign(유사도=[round(score, 2) for _, score in similar]),
+                         use_container_width=True, hide_index=True)
+        
+        # 편집/삭제
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("편집", key=f"edit_{selected_idx}"):
+                st.session_state.editing_note = note
+        with col2:
+            if st.button("삭제", key=f"delete_{selected_idx}", type="secondary"):
+                result = api_post("/wrongnote/delete", {'note_id': source['note_id']})
+                if result:
+                    get_search_index().remove(source['note_id'])
+                    get_similar_notes().remove(source['note_id'])
+                    st.success("삭제되었습니다.")
+                    st.rerun()
+
+# CSV/TSV/JSONL 대량 가져오기
+@fragment
+def render_bulk_import():
+    st.subheader("📥 대량 가져오기")
+    st.caption("CSV/TSV/JSONL 파일 또는 붙여넣기. 열: question_text, correct_answer (필수), "
+               "passage_text, options (줄바꿈 또는 | 구분), user_answer, explanation, why_wrong, "
+               "skill_tags (; 또는 , 구분)")
+    uploaded = st.file_uploader("파일", type=["csv", "tsv", "jsonl", "ndjson", "txt"])
+    pasted = st.text_area("또는 붙여넣기", height=120, key="bulk_import_paste")
+    allow_new_tags = st.checkbox("등록되지 않은 태그 허용")
+    dry_run = st.checkbox("검사만 하기 (업로드하지 않음)")
+
+    if not st.button("가져오기") or not (uploaded or pasted.strip()):
+        return
+    import io
+
+    from bulk_import import BulkImporter
+
+    if uploaded:
+        source, name, total = uploaded, uploaded.name, uploaded.size
+    else:
+        data = pasted.encode("utf-8")
+        source, name, total = io.BytesIO(data), None, len(data)
+
+    progress = st.progress(0.0, text="준비 중...")
+    def report(stats):
+        progress.progress(min(1.0, stats.bytes_read / max(total, 1)),
+                          text=f"{stats.read}행 읽음 · {stats.uploaded}건 업로드 · "
+                               f"중복 {stats.duplicates} · 오류 {stats.invalid}")
+
+    existing = api_get("/wrongnotes") or {}
+    known_tags = None if allow_new_tags else {t['name'] for t in load_skill_tags()}
+    store, _ = get_local_store()
+    importer = BulkImporter(get_api_client(), store, existing.get('notes', []), known_tags,
+                            on_progress=report, dry_run=dry_run)
+    stats = importer.run(source, name)
+    if not dry_run:
+        invalidate_for_write("/wrongnote/batch")
+
+    summary = (f"{stats.read}행 중 {stats.uploaded}건 {'검사 통과' if dry_run else '업로드'}, "
+               f"중복 {stats.duplicates}건, 오류 {stats.invalid}건")
+    if stats.failed:
+        st.warning(f"{summary}, 실패 {stats.failed}건 (다시 가져오면 실패한 노트만 올립니다)")
+    else:
+        st.success(summary)
+    if stats.errors:
+        st.dataframe([{"행": line_no, "오류": message} for line_no, message in stats.errors],
+                     hide_index=True, use_container_width=True)
+
+# 태그 변경 묶음 적용 (/skill-tags/batch 미지원 백엔드는 태그별 요청, 노트는 갱신되지 않음)
+def apply_tag_diff(diff, tags):
+    client = get_api_client()
+    result = client.post(BATCH_ENDPOINT, diff.payload())
+    invalidate_for_write(BATCH_ENDPOINT)
+    if confirmed(result):
+        st.toast(f"태그 {len(diff.mapping) + len(diff.creates)}건 적용, "
+                 f"노트 {result.data.get('notes_updated', 0)}건 갱신")
+        return True
+    if not unsupported(result):
+        st.error(f"태그 변경 실패: {backend_error(result) or result.message or result.error}")
+        return False
+
+    steps = diff.steps(tags)
+    try:
+        for done, payload in enumerate(steps):
+            result = client.post("/skill-tags", payload)
+            if not confirmed(result):
+                st.error(f"태그 변경 실패 ({done}/{len(steps)}건 적용): "
+                         f"{backend_error(result) or result.message or result.error}")
+                return False
+    finally:
+        invalidate_for_write("/skill-tags")
+    st.toast("태그를 변경했습니다. 이 백엔드는 기존 노트의 태그를 함께 바꾸지 않습니다.")
+    return True
+
+# 태그 관리 (변경 사항을 모아 미리보기 후 한 번에 적용)
+@fragment
+def render_tag_manager():
+    st.subheader("유형 태그 관리")
+    tags = load_skill_tags()
+    names = [t['name'] for t in tags]
+    version = st.session_state.get('tag_editor_version', 0)
+
+    st.caption("새 이름을 다른 태그 이름과 같게 하면 병합됩니다. 변경은 '변경 적용'을 눌러야 반영됩니다.")
+    edited = st.data_editor(
+        [{"태그": name, "새 이름": name, "삭제": False} for name in names],
+        column_config={"태그": st.column_config.TextColumn(disabled=True)},
+        hide_index=True, use_container_width=True, key=f"tag_editor_{version}")
+    new_tags = st.text_input("새 태그 추가 (쉼표로 구분)", key=f"new_tags_{version}")
+
+    diff = TagDiff.from_edits(set(names),
+                              renames={row["태그"]: row["새 이름"] for row in edited},
+                              deletes=[row["태그"] for row in edited if row["삭제"]],
+                              creates=new_tags.split(","))
+    if not diff:
+        return
+
+    # 미리보기 (노트는 바꾸지 않고 태그 역색인으로 영향받는 노트 수만 계산)
+    wrong_notes = api_get("/wrongnotes") or {}
+    rows, total = diff.preview(names, get_wrongnote_index(wrong_notes.get('notes', [])))
+    st.write("**변경 미리보기**")
+    st.dataframe(rows, hide_index=True, use_container_width=True)
+    st.caption(f"영향받는 노트 {total}건")
+
+    if st.button("변경 적용", type="primary") and apply_tag_diff(diff, tags):
+        st.session_state.tag_editor_version = version + 1
+        load_skill_tags()
+        st.rerun()
+
+# 보관본 색인 (고른 달의 파일이 바뀌지 않았으면 재사용)
+@st.cache_resource
+def _archive_index_slot(root):
+    return {}
+
+def get_archive_index(archive, months):
+    parts = archive.partitions("wrongnotes", months)
+    if not parts:
+        return None
+    slot = _archive_index_slot(archive.root)
+    key = tuple((month, id(table)) for month, table in parts)
+    if slot.get('key') != key:
+        table = archive.table("wrongnotes", [month for month, _ in parts])
+        table = table.select([name for name in ARCHIVE_COLUMNS if name in table.column_names])
+        slot['index'] = WrongNoteIndex.from_table(table)
+        slot['key'] = key
+    return slot['index']
+
+# 월별 보관본 (고른 달의 파일만 memory map 으로 읽음)
+@fragment
+def render_archived_notes():
+    archive = get_archive()
+    months = archive.months("wrongnotes")
+    if not months:
+        st.info("보관된 오답 노트가 없습니다. 대시보드에서 스냅샷을 저장하세요.")
+        return
+    
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        selected = st.multiselect("월", months[::-1], default=months[-1:], key="archive_months")
+    with timed("wrongnotes.archive_index"):
+        index = get_archive_index(archive, sorted(selected))
+    if index is None:
+        st.info("월을 선택하세요.")
+        return
+    with col2:
+        tags = st.multiselect("유형 필터", index.tags(), placeholder="전체", key="archive_tags")
+    with col3:
+        sort = st.selectbox("정렬 기준", list(SORT_OPTIONS), key="archive_sort")
+    
+    sort_key, descending = SORT_OPTIONS[sort]
+    rows = index.query(tags, "and", sort_key, descending)
+    st.caption(f"보관본 {index.size}건 중 {len(rows)}건"
+               + (f" (상위 {PAGE_SIZES[-1]}건 표시)" if len(rows) > PAGE_SIZES[-1] else ""))
+    st.dataframe(index.rows(rows[:PAGE_SIZES[-1]], ['date_added', 'question_text', 'skill_tags', 'wrong_count']),
+                 use_container_width=True, hide_index=True)
+
+# 오답 노트 페이지
+def render():
+    st.title("📝 오답 노트")
+    
+    # 탭 생성 (보관 기능을 켠 경우 보관본 탭 추가)
+    archived = get_archive() is not None
+    tab1, tab2, tab3, *tab4 = st.tabs(["오답 목록", "새 오답 추가", "태그 관리"]
+                                      + (["🗄️ 보관본"] if archived else []))
+    
+    with tab1:
+        render_note_list()
+    
+    with tab2:
+        # 새 오답 추가
+        st.subheader("새 오답 붙여넣기")
+        
+        with st.form("add_wrong_note"):
+            passage_text = st.text_area("지문", height=200)
+            question_text = st.text_area("문항", height=100)
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                options = st.text_area("선택지 (줄바꿈으로 구분)", height=100)
+                correct_answer = st.text_input("정답")
+            
+            with col2:
+                user_answer = st.text_input("내 답")
+                
+                # 스킬 태그
+                tags = load_skill_tags()
+                tag_names = [t['name'] for t in tags]
+                selected_tags = st.multiselect("유형 태그", tag_names)
+            
+            explanation = st.text_area("해설", height=100)
+            memo = st.text_area("메모", height=100)
+            
+            submitted = st.form_submit_button("오답 추가")
+            
+            if submitted:
+                # 오답 데이터 준비
+                wrong_note_data = {
+                    'passage_text': passage_text,
+                    'question_text': question_text,
+                    'options': options.split('\n') if options else [],
+                    'correct_answer': correct_answer,
+                    'user_answer': user_answer,
+                    'explanation': explanation,
+                    'why_wrong': memo,
+                    'skill_tags': selected_tags
+                }
+                
+                queue_post("/wrongnote", wrong_note_data)
+                st.success("오답이 추가되었습니다!")
+                st.rerun()
+        
+        st.divider()
+        render_bulk_import()
+    
+    with tab3:
+        render_tag_manager()
+    
+    if archived:
+        with tab4[0]:
+            render_archived_notes()
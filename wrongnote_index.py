@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+
+from note_search import note_key
+
+SORT_KEYS = ("date_added", "wrong_count")
+
+
+class WrongNoteIndex:
+    """오답 노트 목록을 데이터 버전마다 한 번만 색인 (태그 역색인 + 미리 정렬된 순서)"""
+
+    def __init__(self, notes):
+        self.source = notes
+        self.frame = pd.DataFrame(notes)
+        self.size = len(self.frame)
+        # 노트 키(note_id) -> 행 번호 (검색 결과를 행으로 바꿀 때 사용)
+        self.row_of = {note_key(note, row): row for row, note in enumerate(notes)}
+
+        # 태그 -> 행 번호(오름차순 int32 배열)
+        postings = {}
+        if "skill_tags" in self.frame:
+            for row, tags in enumerate(self.frame["skill_tags"]):
+                for tag in tags or ():
+                    postings.setdefault(tag, []).append(row)
+        self.tag_rows = {tag: np.asarray(rows, dtype=np.int32) for tag, rows in postings.items()}
+        self._build_orders(lambda name: self.frame[name] if name in self.frame else None)
+
+    @classmethod
+    def from_table(cls, table):
+        """보관본(pa.Table)에서 바로 색인. 태그 역색인은 list 열을 펼쳐 한 번에 만든다
+
+        전체를 DataFrame 으로 바꾸지 않고 색인에 필요한 열만 읽는다 (frame 은 None).
+        화면에 보일 행은 rows() 가 그때그때 테이블에서 골라 변환한다.
+        """
+        import pyarrow.compute as pc
+
+        index = cls.__new__(cls)
+        index.source = table
+        index.frame = None
+        index.size = table.num_rows
+        if "note_id" in table.column_names:
+            index.row_of = dict(zip(table.column("note_id").to_pylist(), range(index.size)))
+        else:
+            index.row_of = dict(zip(range(index.size), range(index.size)))
+
+        index.tag_rows = {}
+        if "skill_tags" in table.column_names:
+            column = table.column("skill_tags").combine_chunks()
+            tags = pc.list_flatten(column).to_numpy(zero_copy_only=False)
+            rows = pc.list_parent_indices(column).to_numpy().astype(np.int32)
+            if len(tags):
+                # 태그 순 -> 행 순 정렬 후 태그 경계에서 자름
+                order = np.lexsort((rows, tags))
+                names, starts = np.unique(tags[order], return_index=True)
+                for name, part in zip(names, np.split(rows[order], starts[1:])):
+                    index.tag_rows[name] = np.unique(part)
+
+        def column(name):
+            # 필요한 열 하나만 numpy 로 (null 없는 숫자 열은 복사 없이 버퍼를 가리킴)
+            if name not in table.column_names:
+                return None
+            return pd.Series(table.column(name).combine_chunks().to_numpy(zero_copy_only=False))
+        index._build_orders(column)
+        return index
+
+    def _build_orders(self, column):
+        # 정렬 기준별 오름차순 행 순서 (column(name) -> Series 또는 None)
+        self.orders = {}
+        dates = column("date_added")
+        if dates is not None:
+            dates = pd.to_datetime(dates, errors="coerce")
+            self.orders["date_added"] = np.argsort(dates.to_numpy(), kind="stable")
+        counts = column("wrong_count")
+        if counts is not None:
+            counts = pd.to_numeric(counts, errors="coerce").fillna(0)
+            self.orders["wrong_count"] = np.argsort(counts.to_numpy(), kind="stable")
+
+    def tags(self):
+        return sorted(self.tag_rows)
+
+    def filter(self, tags, mode="and"):
+        """태그 조건에 맞는 행 번호 마스크. 태그가 없으면 None (전체)"""
+        if not tags:
+            return None
+        mask = np.zeros(self.size, dtype=bool)
+        if mode == "or":
+            # 노트가 없는 태그는 건너뜀 (빈 튜플로 인덱싱하면 전체 행이 선택됨)
+            for tag in tags:
+                rows = self.tag_rows.get(tag)
+                if rows is not None:
+                    mask[rows] = True
+            return mask
+        # AND: 가장 짧은 posting 부터 교집합
+        postings = sorted((self.tag_rows.get(tag) for tag in tags),
+                          key=lambda rows: -1 if rows is None else len(rows))
+        if postings[0] is None:
+            return mask
+        rows = postings[0]
+        for other in postings[1:]:
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        mask[rows] = True
+        return mask
+
+    def query(self, tags=(), mode="and", sort_by="date_added", descending=True):
+        """필터 + 정렬된 행 번호 배열 (프레임은 복사하지 않음)"""
+        order = self.orders.get(sort_by)
+        if order is None:
+            order = np.arange(self.size)
+        if descending:
+            order = order[::-1]
+        mask = self.filter(tags, mode)
+        return order if mask is None else order[mask[order]]
+
+    def search(self, ranked, tags=(), mode="and"):
+        """검색 결과 [(노트 키, 점수)] 순서를 유지한 채 태그 조건을 적용한 행 번호 배열"""
+        positions = np.fromiter((self.row_of[key] for key, _ in ranked if key in self.row_of),
+                                dtype=np.int64)
+        mask = self.filter(tags, mode)
+        return positions if mask is None else positions[mask[positions]]
+
+    def rows(self, positions, columns=None):
+        if self.frame is None:
+            # 보관본: 고른 행/열만 테이블에서 꺼내 변환
+            import pyarrow as pa
+
+            table = self.source.take(pa.array(np.asarray(positions, dtype=np.int64)))
+            if columns is not None:
+                table = table.select([name for name in columns if name in table.column_names])
+            return table.to_pandas()
+        if columns is None:
+            return self.frame.iloc[positions]
+        return self.frame.iloc[positions, self.frame.columns.get_indexer(columns)]